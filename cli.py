@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+命令行入口文件
+无界面运行解析和翻译，适用于服务器、定时任务和 CI
+
+用法示例：
+    python cli.py parse D:/ComfyUI/custom_nodes/pack1 D:/ComfyUI/custom_nodes/pack2
+    python cli.py translate --root D:/ComfyUI/custom_nodes --global --resume
+    python cli.py all --root D:/ComfyUI/custom_nodes --workers 8 --concurrency 8
+    python cli.py translate --root D:/ComfyUI/custom_nodes --global --dry-run
+
+进度以 JSON Lines 格式输出到标准输出，每行一个事件；日志输出到标准错误。
+退出码：0 全部成功，1 部分失败，2 参数或配置错误，130 被中断。
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+from typing import List
+from core.config_manager import ConfigManager
+from core.parse_cache import ParseCache
+from translation_service.translation_service import TranslationService, DEFAULT_MAX_CONCURRENCY
+from translation_service.translation_memory import TranslationMemory
+from translation_service.job_journal import JobJournal
+from translation_service.token_budget import ModelLimits, RequestPlanner, get_tokenizer
+from translation_service.pipeline import TranslationPipeline, PipelineEvent
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+# 未在命令行和配置文件中提供 API Key 时读取的环境变量
+API_KEY_ENV = "ARK_API_KEY"
+
+
+def print_event(event: PipelineEvent):
+    """以 JSON Lines 格式输出流程事件
+
+    Args:
+        event: 流程事件
+    """
+    record = {"event": event.kind, "level": logging.getLevelName(event.level).lower(), "time": round(event.time, 3)}
+    if event.message:
+        record["message"] = event.message.strip()
+    record.update(event.data)
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+def collect_folders(folders: List[str], roots: List[str]) -> List[str]:
+    """汇总要处理的插件文件夹
+
+    Args:
+        folders: 直接指定的插件文件夹
+        roots: 包含多个插件文件夹的目录（如 custom_nodes），其中每个子目录作为一个插件
+
+    Returns:
+        List[str]: 去重后的插件文件夹绝对路径
+    """
+    result = []
+    for folder in folders:
+        result.append(os.path.abspath(folder))
+    for root in roots:
+        for entry in sorted(os.scandir(root), key=lambda e: e.name):
+            if entry.is_dir() and not entry.name.startswith(('.', '__')):
+                result.append(os.path.abspath(entry.path))
+    return list(dict.fromkeys(result))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """创建命令行参数解析器"""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("folders", nargs="*", help="插件文件夹")
+    common.add_argument("--root", action="append", default=[], help="包含多个插件文件夹的目录，可重复指定")
+    common.add_argument("--global", dest="global_mode", action="store_true", help="全球化翻译模式（俄语、日语、韩语、法语）")
+    common.add_argument("--verbose", action="store_true", help="在标准错误输出详细日志")
+
+    parse_options = argparse.ArgumentParser(add_help=False)
+    parse_options.add_argument("--workers", type=int, default=None, help="解析进程数，默认使用 CPU 核心数")
+    parse_options.add_argument("--ignore", action="append", default=None, help="扫描时忽略的 glob 模式，可重复指定")
+    parse_options.add_argument("--no-cache", action="store_true", help="不使用解析缓存")
+
+    translate_options = argparse.ArgumentParser(add_help=False)
+    translate_options.add_argument("--api-key", help=f"API 密钥，默认读取配置文件或环境变量 {API_KEY_ENV}")
+    translate_options.add_argument("--model-id", help="模型 ID，默认读取配置文件")
+    translate_options.add_argument("--concurrency", type=int, default=None, help="同时进行的翻译请求数")
+    translate_options.add_argument("--batch-tokens", type=int, default=None, help="每批词条的输入 token 上限，默认按提示词长度和并发数自动决定")
+    translate_options.add_argument("--max-retries", type=int, default=None, help="失败或遗漏的词条最多重试的轮数")
+    translate_options.add_argument("--resume", action="store_true", help="从任务日志继续上次未完成的运行")
+    translate_options.add_argument("--journal", default=None, help="任务日志路径")
+    translate_options.add_argument("--no-memory", action="store_true", help="不使用翻译记忆")
+    translate_options.add_argument("--incremental", action="store_true", help="增量翻译，只翻译与已有语言文件相比新增或变化的字段")
+    translate_options.add_argument("--dry-run", action="store_true", help="只估算请求数、token 数和费用，不发送请求")
+
+    parser = argparse.ArgumentParser(prog="cli.py", description="ComfyUI 节点翻译工具命令行")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("parse", parents=[common, parse_options], help="解析节点并生成 nodeDefs.json")
+    commands.add_parser("translate", parents=[common, translate_options], help="翻译已生成的 nodeDefs.json")
+    commands.add_parser("all", parents=[common, parse_options, translate_options], help="解析后立即翻译")
+    return parser
+
+
+def run_parse(pipeline: TranslationPipeline, folders: List[str], global_mode: bool) -> int:
+    """执行解析
+
+    Returns:
+        int: 退出码
+    """
+    errors = pipeline.parse(folders, global_mode)
+    return EXIT_FAILED if errors else EXIT_OK
+
+
+def run_translate(args, config: dict, config_dir: str, pipeline: TranslationPipeline, folders: List[str]) -> int:
+    """执行翻译
+
+    Returns:
+        int: 退出码
+    """
+    options = {key: config[key] for key in ("max_concurrency", "batch_tokens", "max_retries") if key in config}
+    for key, value in (("max_concurrency", args.concurrency), ("batch_tokens", args.batch_tokens), ("max_retries", args.max_retries)):
+        if value is not None:
+            options[key] = value
+    options["limits"] = ModelLimits.from_config(config)
+    options["tokenizer"] = get_tokenizer(config.get("tokenizer"))
+
+    pipeline.incremental = args.incremental or bool(config.get("incremental", False))
+
+    # 命令行默认使用独立的任务日志，避免与同时运行的图形界面互相覆盖
+    pipeline.journal = JobJournal(args.journal or os.path.join(config_dir, "cli_journal.jsonl"))
+    mode = 'global_translation' if args.global_mode else 'chinese_only'
+    pending = pipeline.journal.pending_run()
+    resume = bool(args.resume and pending and pending.get("mode") == mode and pending.get("folders") == folders)
+    if args.resume and not resume:
+        pipeline.log("没有与当前参数一致的未完成运行，重新开始翻译")
+
+    if args.dry_run:
+        planner = RequestPlanner(
+            options["limits"], options["tokenizer"], options.get("batch_tokens"),
+            options.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)
+        )
+        return EXIT_OK if pipeline.estimate(planner, folders, args.global_mode, resume) else EXIT_FAILED
+
+    api_key = args.api_key or config.get("api_key") or os.environ.get(API_KEY_ENV, "")
+    model_id = args.model_id or config.get("model_id", "")
+    if not api_key.strip() or not model_id.strip():
+        pipeline.emit("error", f"缺少 API Key 或 Model ID，请通过参数、配置文件或环境变量 {API_KEY_ENV} 提供")
+        return EXIT_USAGE
+
+    memory = None if args.no_memory else TranslationMemory(os.path.join(config_dir, "translation_memory.db"))
+    service = TranslationService(api_key, model_id, memory=memory, **options)
+    try:
+        completed = pipeline.translate(service, folders, args.global_mode, resume)
+    finally:
+        service.close()
+        if memory is not None:
+            memory.close()
+    return EXIT_OK if completed else EXIT_FAILED
+
+
+def main(argv: List[str] = None) -> int:
+    """命令行入口函数
+
+    Args:
+        argv: 命令行参数，为None时使用 sys.argv
+
+    Returns:
+        int: 退出码
+    """
+    args = build_parser().parse_args(argv)
+
+    # 日志输出到标准错误，标准输出只保留 JSON Lines 事件
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+        stream=sys.stderr
+    )
+
+    config_manager = ConfigManager()
+    config = config_manager.load_config() or {}
+    pipeline = TranslationPipeline(print_event)
+
+    try:
+        folders = collect_folders(args.folders, args.root)
+    except OSError as e:
+        pipeline.emit("error", f"读取目录失败: {str(e)}")
+        return EXIT_USAGE
+    if not folders:
+        pipeline.emit("error", "没有指定任何插件文件夹")
+        return EXIT_USAGE
+
+    try:
+        exit_code = EXIT_OK
+        if args.command in ("parse", "all"):
+            pipeline.ignore_patterns = args.ignore if args.ignore is not None else config.get("ignore_patterns")
+            pipeline.max_workers = args.workers
+            pipeline.parse_cache = None if args.no_cache else ParseCache(config_manager.config_dir)
+            exit_code = run_parse(pipeline, folders, args.global_mode)
+        if args.command in ("translate", "all"):
+            translate_code = run_translate(args, config, config_manager.config_dir, pipeline, folders)
+            exit_code = max(exit_code, translate_code)
+        return exit_code
+    except KeyboardInterrupt:
+        pipeline.stop()
+        pipeline.emit("error", "已中断，再次运行时可使用 --resume 继续")
+        return EXIT_INTERRUPTED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
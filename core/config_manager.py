@@ -31,10 +31,12 @@ def save_config(self, api_key: str, model_id: str) -> None:
             api_key: API 密钥
             model_id: 模型 ID
         """
-        config = {
+        # 保留配置文件中的其他设置项
+        config = self.load_config() or {}
+        config.update({
             "api_key": api_key,
             "model_id": model_id
-        }
+        })
         
         try:
             with open(self.config_file, 'w', encoding='utf-8') as f:
@@ -4,19 +4,21 @@
 """
 
 import os
-import json
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
+from .file_utils import FileUtils
+from .models.node_info import NodeInfo
 
 class FileHandler:
     """文件处理类"""
     
     @staticmethod
-    def scan_plugin_folder(folder_path: str) -> List[str]:
+    def scan_plugin_folder(folder_path: str, ignore_patterns: Optional[List[str]] = None) -> List[str]:
         """扫描插件文件夹中的所有 Python 文件
         
         Args:
             folder_path: 插件文件夹路径
+            ignore_patterns: 忽略的 glob 模式，默认跳过 .git、虚拟环境等目录
             
         Returns:
             List[str]: Python 文件路径列表
@@ -24,35 +26,27 @@ def scan_plugin_folder(folder_path: str) -> List[str]:
         if not os.path.exists(folder_path):
             raise FileNotFoundError(f"文件夹不存在: {folder_path}")
             
-        python_files = []
-        # 遍历文件夹
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    python_files.append(file_path)
-                    logging.info(f"找到Python文件: {file_path}")
-                    
-        return python_files
+        return list(FileUtils.iter_python_files(folder_path, ignore_patterns))
         
     @staticmethod
-    def save_node_info(node_info: Dict, folder_path: str) -> str:
+    def save_node_info(node_info: Dict, folder_path: str, languages: Optional[List[str]] = None) -> str:
         """保存节点信息到 JSON 文件
         
+        清理后的文档只生成一次，直接写入每个语言目录的 nodeDefs.json。
+        
         Args:
-            node_info: 节点信息字典
+            node_info: 节点名到节点信息（NodeInfo 或字典）的映射
             folder_path: 插件文件夹路径
+            languages: 要写入的语言目录，默认只写入 zh
             
         Returns:
-            str: JSON 文件路径
+            str: 第一个语言的 JSON 文件路径
         """
-        # 创建 locales/zh 目录
-        output_dir = os.path.join(folder_path, "locales", "zh")
-        os.makedirs(output_dir, exist_ok=True)
-        
         # 清理数据，移除不需要的字段
         cleaned_data = {}
         for key, value in node_info.items():
+            if isinstance(value, NodeInfo):
+                value = value.to_dict()
             node_data = {}
             # 只保留需要的字段
             if "display_name" in value:
@@ -63,10 +57,13 @@ def save_node_info(node_info: Dict, folder_path: str) -> str:
                 node_data["outputs"] = value["outputs"]
             cleaned_data[key] = node_data
         
-        # 保存 JSON 文件
-        output_file = os.path.join(output_dir, "nodeDefs.json")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(cleaned_data, f, ensure_ascii=False, indent=2)
-            
-        logging.info(f"节点信息已保存到: {output_file}")
-        return output_file 
\ No newline at end of file
+        # 保存 JSON 文件，内容没有变化时不重写
+        output_files = []
+        for lang in languages or ["zh"]:
+            output_file = os.path.join(folder_path, "locales", lang, "nodeDefs.json")
+            if FileUtils.save_json(cleaned_data, output_file):
+                logging.info(f"节点信息已保存到: {output_file}")
+            else:
+                logging.info(f"节点信息没有变化，跳过写入: {output_file}")
+            output_files.append(output_file)
+        return output_files[0]
@@ -5,18 +5,150 @@
 
 import os
 import json
+import uuid
+import fnmatch
 import logging
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Iterator, Tuple
+
+# 默认跳过的目录和文件（glob 模式，匹配名称）
+DEFAULT_IGNORE_PATTERNS = [
+    ".git",
+    ".hg",
+    ".svn",
+    "__pycache__",
+    "venv",
+    ".venv",
+    "node_modules",
+    "site-packages",
+    "dist-packages",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    "*.egg-info",
+]
+
+# 流式写入 JSON 时每次比较和写出的字节块大小
+JSON_BLOCK_SIZE = 64 * 1024
 
 class FileUtils:
     """文件工具类"""
     
     @staticmethod
-    def scan_python_files(folder_path: str) -> List[str]:
+    def iter_python_files(folder_path: str, ignore_patterns: Optional[List[str]] = None, use_gitignore: bool = True) -> Iterator[str]:
+        """使用 os.scandir 遍历目录下的 Python 文件，并剪除被忽略的目录
+        
+        虚拟环境目录（包含 pyvenv.cfg）总是被跳过。每个目录中的 .gitignore
+        规则作用于该目录及其子目录。文件按名称排序输出，结果顺序是确定的。
+        
+        Args:
+            folder_path: 要扫描的文件夹路径
+            ignore_patterns: 忽略的 glob 模式，默认使用 DEFAULT_IGNORE_PATTERNS
+            use_gitignore: 是否读取 .gitignore 规则
+            
+        Yields:
+            str: Python 文件路径
+        """
+        patterns = DEFAULT_IGNORE_PATTERNS if ignore_patterns is None else ignore_patterns
+        # 栈中保存 (目录路径, 该目录生效的 gitignore 规则)
+        stack: List[Tuple[str, List[Tuple[str, str, bool, bool, bool]]]] = [(folder_path, [])]
+        
+        while stack:
+            dir_path, rules = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError as e:
+                logging.warning(f"无法读取目录 {dir_path}: {str(e)}")
+                continue
+                
+            names = {entry.name for entry in entries}
+            if "pyvenv.cfg" in names and dir_path != folder_path:
+                logging.debug(f"跳过虚拟环境目录: {dir_path}")
+                continue
+            if use_gitignore and ".gitignore" in names:
+                rules = rules + FileUtils._load_gitignore(dir_path)
+                
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                    
+                if any(fnmatch.fnmatch(entry.name, pattern) for pattern in patterns):
+                    logging.debug(f"跳过: {entry.path}")
+                    continue
+                if rules and FileUtils._is_git_ignored(entry.path, is_dir, rules):
+                    logging.debug(f"跳过 .gitignore 忽略的路径: {entry.path}")
+                    continue
+                    
+                if is_dir:
+                    subdirs.append((entry.path, rules))
+                elif entry.name.endswith('.py'):
+                    logging.debug(f"找到Python文件: {entry.path}")
+                    yield entry.path
+                    
+            # 逆序入栈，保证子目录按名称顺序处理
+            stack.extend(reversed(subdirs))
+            
+    @staticmethod
+    def _load_gitignore(dir_path: str) -> List[Tuple[str, str, bool, bool, bool]]:
+        """读取目录下的 .gitignore
+        
+        Args:
+            dir_path: .gitignore 所在目录
+            
+        Returns:
+            List[Tuple[str, str, bool, bool, bool]]: (基准目录, 模式, 是否取反, 是否只匹配目录, 是否锚定) 列表
+        """
+        rules = []
+        try:
+            with open(os.path.join(dir_path, ".gitignore"), 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    pattern = line.strip()
+                    if not pattern or pattern.startswith('#'):
+                        continue
+                    negate = pattern.startswith('!')
+                    if negate:
+                        pattern = pattern[1:]
+                    dir_only = pattern.endswith('/')
+                    pattern = pattern.rstrip('/')
+                    # 含斜杠的模式相对于 .gitignore 所在目录匹配，否则匹配任意层级的名称
+                    anchored = '/' in pattern
+                    pattern = pattern.lstrip('/')
+                    if pattern:
+                        rules.append((dir_path, pattern, negate, dir_only, anchored))
+        except OSError as e:
+            logging.debug(f"读取 .gitignore 失败 {dir_path}: {str(e)}")
+        return rules
+        
+    @staticmethod
+    def _is_git_ignored(path: str, is_dir: bool, rules: List[Tuple[str, str, bool, bool, bool]]) -> bool:
+        """判断路径是否被 .gitignore 规则忽略，后出现的规则优先"""
+        ignored = False
+        name = os.path.basename(path)
+        for base_dir, pattern, negate, dir_only, anchored in rules:
+            if dir_only and not is_dir:
+                continue
+            if anchored:
+                rel_path = os.path.relpath(path, base_dir).replace(os.sep, '/')
+                matched = fnmatch.fnmatch(rel_path, pattern)
+            else:
+                matched = fnmatch.fnmatch(name, pattern)
+            if matched:
+                ignored = not negate
+        return ignored
+        
+    @staticmethod
+    def scan_python_files(folder_path: str, ignore_patterns: Optional[List[str]] = None, use_gitignore: bool = True) -> List[str]:
         """扫描目录下的所有 Python 文件
         
         Args:
             folder_path: 要扫描的文件夹路径
+            ignore_patterns: 忽略的 glob 模式，默认使用 DEFAULT_IGNORE_PATTERNS
+            use_gitignore: 是否读取 .gitignore 规则
             
         Returns:
             List[str]: Python 文件路径列表
@@ -27,17 +159,7 @@ def scan_python_files(folder_path: str) -> List[str]:
         if not os.path.isdir(folder_path):
             raise NotADirectoryError(f"路径不是文件夹: {folder_path}")
             
-        python_files = []
-        
-        # 遍历文件夹
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                if file.endswith('.py') or file == '__init__.py':
-                    file_path = os.path.join(root, file)
-                    python_files.append(file_path)
-                    logging.info(f"找到Python文件: {file_path}")
-                    
-        return python_files
+        return list(FileUtils.iter_python_files(folder_path, ignore_patterns, use_gitignore))
         
     @staticmethod
     def ensure_dir(dir_path: str) -> None:
@@ -50,20 +172,104 @@ def ensure_dir(dir_path: str) -> None:
             os.makedirs(dir_path)
             
     @staticmethod
-    def save_json(data: Dict, file_path: str, ensure_ascii: bool = False) -> None:
-        """保存 JSON 文件
+    def save_json(data: Any, file_path: str, ensure_ascii: bool = False, compact: bool = False) -> bool:
+        """流式、原子地保存 JSON 文件
+        
+        编码结果按块写出，不在内存中拼接整个文档。写出前先与已有文件逐块比较，
+        内容完全相同时不做任何写入，避免文件监视器（如 ComfyUI）无谓地重新加载；
+        内容不同时写入同目录下的临时文件，fsync 后用 os.replace 原子替换目标文件，
+        写入中途崩溃也不会留下被截断的文件。
         
         Args:
             data: 要保存的数据
             file_path: 文件路径
             ensure_ascii: 是否确保 ASCII 编码
+            compact: 使用紧凑格式（无缩进和多余空格），适用于只由程序读取的文件
+            
+        Returns:
+            bool: 是否写入了文件，内容没有变化时为 False
         """
-        # 确保目标目录存在
-        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        file_path = os.path.abspath(file_path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        
+        if compact:
+            encoder = json.JSONEncoder(ensure_ascii=ensure_ascii, separators=(',', ':'))
+        else:
+            encoder = json.JSONEncoder(ensure_ascii=ensure_ascii, indent=2)
+        
+        existing = None
+        try:
+            existing = open(file_path, 'rb')
+        except FileNotFoundError:
+            pass
         
-        # 保存文件
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=ensure_ascii, indent=2)
+        temp_path = None
+        temp = None
+        matched = 0
+        try:
+            for block in FileUtils._iter_json_blocks(encoder, data):
+                if temp is None:
+                    # 与已有文件相同的前缀不写出，只记录长度
+                    if existing is not None and existing.read(len(block)) == block:
+                        matched += len(block)
+                        continue
+                    temp_path, temp = FileUtils._open_temp(file_path, existing, matched)
+                temp.write(block)
+            
+            if temp is None:
+                if existing is not None and not existing.read(1):
+                    return False
+                # 新内容是已有文件的前缀，或目标文件不存在
+                temp_path, temp = FileUtils._open_temp(file_path, existing, matched)
+            
+            temp.flush()
+            os.fsync(temp.fileno())
+            temp.close()
+            if existing is not None:
+                existing.close()
+            os.replace(temp_path, file_path)
+            temp_path = None
+            return True
+        finally:
+            if existing is not None:
+                existing.close()
+            if temp is not None:
+                temp.close()
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                    
+    @staticmethod
+    def _iter_json_blocks(encoder: json.JSONEncoder, data: Any) -> Iterator[bytes]:
+        """把 JSON 编码器产生的小片段合并为较大的 UTF-8 字节块"""
+        parts = []
+        size = 0
+        for chunk in encoder.iterencode(data):
+            parts.append(chunk)
+            size += len(chunk)
+            if size >= JSON_BLOCK_SIZE:
+                yield "".join(parts).encode('utf-8')
+                parts = []
+                size = 0
+        if parts:
+            yield "".join(parts).encode('utf-8')
+            
+    @staticmethod
+    def _open_temp(file_path: str, existing, prefix_size: int) -> Tuple[str, Any]:
+        """在目标文件所在目录创建临时文件，并复制已有文件中相同的前缀"""
+        directory, name = os.path.split(file_path)
+        temp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+        temp = open(temp_path, 'xb')
+        if prefix_size:
+            existing.seek(0)
+            remaining = prefix_size
+            while remaining:
+                buffer = existing.read(min(remaining, JSON_BLOCK_SIZE))
+                temp.write(buffer)
+                remaining -= len(buffer)
+        return temp_path, temp
             
     @staticmethod
     def load_json(file_path: str) -> Dict:
@@ -3,55 +3,187 @@
 用于存储和管理节点的基本信息
 """
 
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from sys import intern
+from typing import Any, Dict, Optional, Tuple
+
+# 节点数据中由 NodeInfo 专门保存的键，其余的键（以及这些键中值为 null 的）原样保存在 extra 中
+_NODE_KEYS = ("display_name", "inputs", "outputs", "category", "function")
+
+
+def _intern(value: Any) -> Any:
+    """字符串驻留，同一文本在所有节点中只保留一份"""
+    return intern(value) if type(value) is str else value
+
 
-@dataclass
 class NodeInfo:
-    """节点信息数据类"""
-    name: str
-    title: str
-    category: str = ""
-    function: str = ""
-    inputs: Dict[str, str] = None
-    outputs: Dict[str, str] = None
-    widgets: Dict[str, str] = None
-    
-    def __post_init__(self):
-        """初始化后处理"""
-        self.inputs = self.inputs or {}
-        self.outputs = self.outputs or {}
-        self.widgets = self.widgets or {}
-        
-    def to_dict(self) -> Dict:
-        """转换为字典格式"""
-        return {
-            "name": self.name,
-            "title": self.title,
-            "category": self.category,
-            "function": self.function,
-            "inputs": self.inputs,
-            "outputs": self.outputs,
-            "widgets": self.widgets
-        }
-        
+    """紧凑的节点信息
+
+    用 __slots__ 代替实例字典，输入和输出的键与名称分别保存在元组中，
+    所有字符串都经过驻留：image、model、seed 这类在大量节点中重复出现的名称
+    只保留一份。名称与键相同（尚未翻译）时名称元组直接复用键元组。
+    在内存中保存数万个节点用于比较和翻译时，占用远小于嵌套字典。
+
+    与 nodeDefs.json 中单个节点的数据可以无损互相转换：缺失的部分保存为 None，
+    值为 null 的节点字段保存在 extra 中；输入输出除单独的 name 以外的内容
+    （其他键、值为 null 的 name）保存在 field_extra 中，name 用 None 占位。
+    键的顺序也会保留：节点的键与默认顺序不同时记录在 key_order 中，
+    重写已有文件时内容不会被重新排序。
+    """
+
+    __slots__ = (
+        "display_name", "input_keys", "input_names", "output_keys", "output_names",
+        "category", "function", "extra", "field_extra", "key_order"
+    )
+
+    def __init__(
+        self,
+        display_name: Optional[str] = None,
+        input_keys: Optional[Tuple[str, ...]] = (),
+        input_names: Optional[Tuple[Optional[str], ...]] = None,
+        output_keys: Optional[Tuple[str, ...]] = (),
+        output_names: Optional[Tuple[Optional[str], ...]] = None,
+        category: Any = None,
+        function: Any = None,
+        extra: Optional[Dict[str, Any]] = None,
+        field_extra: Optional[Dict[Tuple[str, str], Dict]] = None,
+        key_order: Optional[Tuple[str, ...]] = None
+    ):
+        """初始化节点信息
+
+        Args:
+            display_name: 显示名称，为 None 时表示没有该字段
+            input_keys: 输入的键，为 None 时表示没有 inputs 字段
+            input_names: 输入的名称，为 None 时与键相同
+            output_keys: 输出的键，为 None 时表示没有 outputs 字段
+            output_names: 输出的名称，为 None 时与键相同
+            category: 分类，为 None 时表示没有该字段
+            function: 执行函数名，为 None 时表示没有该字段
+            extra: 节点的其他字段，以及值为 null 的 display_name 等字段
+            field_extra: (字段类型, 键) 到该输入或输出的原始字段，name 的值以 None 占位，
+                实际的名称保存在 input_names/output_names 中
+            key_order: 节点数据的键顺序，为None时按默认顺序
+        """
+        self.display_name = _intern(display_name)
+        self.input_keys, self.input_names = self._pack(input_keys, input_names)
+        self.output_keys, self.output_names = self._pack(output_keys, output_names)
+        self.category = _intern(category)
+        self.function = _intern(function)
+        self.extra = extra or None
+        self.field_extra = field_extra or None
+        self.key_order = tuple(map(_intern, key_order)) if key_order else None
+
+    @staticmethod
+    def _pack(keys, names) -> Tuple[Optional[Tuple], Optional[Tuple]]:
+        """驻留键和名称，名称与键完全相同时共用同一个元组"""
+        if keys is None:
+            return None, None
+        keys = tuple(map(_intern, keys))
+        if names is None:
+            return keys, keys
+        names = tuple(map(_intern, names))
+        if len(names) != len(keys):
+            raise ValueError("输入或输出的名称与键数量不一致")
+        return keys, keys if names == keys else names
+
     @classmethod
     def from_dict(cls, data: Dict) -> 'NodeInfo':
-        """从字典创建实例"""
+        """从 nodeDefs.json 中单个节点的数据创建实例
+
+        Args:
+            data: 节点数据，如 {"display_name": ..., "inputs": {键: {"name": ...}}, "outputs": {...}}
+
+        Returns:
+            NodeInfo: 节点信息
+        """
+        field_extra = {}
+        sections = {}
+        for section in ("inputs", "outputs"):
+            fields = data.get(section)
+            if fields is None:
+                sections[section] = (None, None)
+                continue
+            names = []
+            for key, value in fields.items():
+                names.append(value.get("name"))
+                if value and (len(value) > 1 or value.get("name") is None):
+                    # 不是单独的非空 name 时保存原有的键和顺序，name 以 None 占位
+                    field_extra[section, key] = {k: (None if k == "name" else v) for k, v in value.items()}
+            sections[section] = (tuple(fields), tuple(names))
+
+        # 值为 null 的字段与缺失的字段区分开，原样保存在 extra 中
+        extra = {key: value for key, value in data.items() if key not in _NODE_KEYS or value is None}
+
+        # 键顺序与 to_dict 的默认顺序相同时不记录
+        keys = tuple(data)
+        default_order = tuple(key for key in _NODE_KEYS if data.get(key) is not None) + tuple(extra)
+
         return cls(
-            name=data.get("name", ""),
-            title=data.get("title", ""),
-            category=data.get("category", ""),
-            function=data.get("function", ""),
-            inputs=data.get("inputs", {}),
-            outputs=data.get("outputs", {}),
-            widgets=data.get("widgets", {})
+            display_name=data.get("display_name"),
+            input_keys=sections["inputs"][0],
+            input_names=sections["inputs"][1],
+            output_keys=sections["outputs"][0],
+            output_names=sections["outputs"][1],
+            category=data.get("category"),
+            function=data.get("function"),
+            extra=extra,
+            field_extra=field_extra,
+            key_order=keys if keys != default_order else None
         )
 
+    def to_dict(self) -> Dict:
+        """转换为 nodeDefs.json 中单个节点的数据格式"""
+        data = {}
+        if self.display_name is not None:
+            data["display_name"] = self.display_name
+        for section, keys, names in (
+            ("inputs", self.input_keys, self.input_names),
+            ("outputs", self.output_keys, self.output_names)
+        ):
+            if keys is not None:
+                data[section] = {key: self._field_dict(section, key, name) for key, name in zip(keys, names)}
+        if self.category is not None:
+            data["category"] = self.category
+        if self.function is not None:
+            data["function"] = self.function
+        if self.extra:
+            data.update(self.extra)
+        if self.key_order:
+            ordered = {key: data.pop(key) for key in self.key_order if key in data}
+            ordered.update(data)
+            data = ordered
+        return data
+
+    def _field_dict(self, section: str, key: str, name: Optional[str]) -> Dict:
+        """生成单个输入或输出的数据，保留原有的键顺序"""
+        extra = self.field_extra.get((section, key)) if self.field_extra else None
+        if not extra:
+            return {} if name is None else {"name": name}
+        value = {} if name is None or "name" in extra else {"name": name}
+        value.update((field_key, name if field_key == "name" else field_value) for field_key, field_value in extra.items())
+        return value
+
+    @property
+    def inputs(self) -> Dict[str, Optional[str]]:
+        """输入键到名称的映射"""
+        return dict(zip(self.input_keys or (), self.input_names or ()))
+
+    @property
+    def outputs(self) -> Dict[str, Optional[str]]:
+        """输出键到名称的映射"""
+        return dict(zip(self.output_keys or (), self.output_names or ()))
+
     def validate(self) -> bool:
         """验证节点信息的完整性
-        
+
         Returns:
             bool: 是否有效
         """
-        return bool(self.name and self.title and self.inputs and self.outputs) 
\ No newline at end of file
+        return bool(self.display_name and self.input_keys and self.output_keys)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, NodeInfo):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"NodeInfo(display_name={self.display_name!r}, inputs={len(self.input_keys or ())}, outputs={len(self.output_keys or ())})"
@@ -1,7 +1,6 @@
 import ast
 import json
 from core.node_parser import NodeParser
-from core.models.node_info import NodeInfo
 
 NODE_DISPLAY_NAME_MAPPINGS = {
     "LayerMask: HumanPartsUltra": "LayerMask: Human Parts Ultra(Advance)"
@@ -4,10 +4,37 @@
 """
 
 import os
-from typing import Dict, List, Tuple
+import re
+import hashlib
+import logging
+from functools import lru_cache
+from dataclasses import dataclass, field as dataclass_field
+from typing import Dict, List, Tuple, Optional, Iterator
 from .models.node_info import NodeInfo
 from .file_utils import FileUtils
 
+# 翻译快照文件名，与 nodeDefs.json 保存在同一个语言目录中
+SNAPSHOT_FILE = ".nodeDefs.source.json"
+# 版本 2 增加了节点指纹索引，版本 1 的快照仍可读取（没有索引）
+SNAPSHOT_VERSION = 2
+
+# 基础名称中视为分隔符的字符
+_SEPARATOR_RE = re.compile(r'[\s:\-_]+')
+
+# 可翻译字段的位置: (节点名, 字段类型, 输入/输出键)，display_name 的键为 None
+Field = Tuple[str, str, Optional[str]]
+
+
+@dataclass
+class IndexDiff:
+    """两个指纹索引的差异"""
+    added: List[str] = dataclass_field(default_factory=list)  # 新增的节点名
+    removed: List[str] = dataclass_field(default_factory=list)  # 删除的节点名
+    renamed: Dict[str, str] = dataclass_field(default_factory=dict)  # 新节点名到旧节点名（名称变化但对应同一节点）
+    moved: Dict[Field, Field] = dataclass_field(default_factory=dict)  # 新字段位置到旧字段位置（文本不变，位置变化）
+    changed: List[Field] = dataclass_field(default_factory=list)  # 位置不变但文本变化的字段
+    relocated: Dict[Field, Field] = dataclass_field(default_factory=dict)  # 所有需要按旧位置查找译文的字段：改名节点中的字段和移动过的字段
+
 class NodeDiffer:
     """节点差异比较器"""
     
@@ -22,45 +49,128 @@ def compare_nodes(old_nodes: Dict[str, NodeInfo], new_nodes: Dict[str, NodeInfo]
         Returns:
             Tuple[Dict[str, NodeInfo], List[str], List[str]]: (新增节点字典, 新增节点名称列表, 删除节点名称列表)
         """
-        added_nodes = {}
-        added_node_names = []
-        removed_node_names = []
+        # 创建旧节点的基础名称集合，基础名称不在其中的新节点认为是新增的
+        old_base_names = {NodeDiffer._get_base_name(name) for name in old_nodes}
+        added_node_names = [name for name in new_nodes if NodeDiffer._get_base_name(name) not in old_base_names]
+        added_nodes = {name: new_nodes[name] for name in added_node_names}
         
-        # 创建旧节点的基础名称集合
-        old_base_names = {NodeDiffer._get_base_name(name) for name in old_nodes.keys()}
-        
-        # 遍历新节点
-        for name, node in new_nodes.items():
-            # 获取新节点的基础名称
-            new_base_name = NodeDiffer._get_base_name(name)
-            
-            # 如果基础名称不在旧节点中，认为是新增的
-            if new_base_name not in old_base_names:
-                added_nodes[name] = node
-                added_node_names.append(name)
-
         # 检查旧节点中是否有不在新节点中的节点
-        for name in old_nodes.keys():
-            if name not in new_nodes:
-                removed_node_names.append(name)
+        removed_node_names = [name for name in old_nodes if name not in new_nodes]
         
         return added_nodes, added_node_names, removed_node_names
         
     @staticmethod
+    @lru_cache(maxsize=65536)
     def _get_base_name(node_name: str) -> str:
         """获取节点的基础名称
         
+        冒号、连字符、下划线和连续空白统一为一个空格，结果会被缓存。
+        
         Args:
             node_name: 完整节点名称
             
         Returns:
             str: 基础名称
         """
-        # 移除所有标点符号和多余空格
-        name = node_name.replace(":", " ").replace("-", " ").replace("_", " ")
-        # 分割成单词并重新组合
-        words = [word.strip() for word in name.split() if word.strip()]
-        return " ".join(words)
+        return _SEPARATOR_RE.sub(" ", node_name).strip()
+        
+    @staticmethod
+    def _hash_text(text: str) -> str:
+        """计算文本的短哈希"""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+        
+    @staticmethod
+    def _field_id(field: Field) -> str:
+        """字段在节点内的标识，例如 display_name、inputs/image"""
+        _, section, key = field
+        return section if section == "display_name" else f"{section}/{key}"
+        
+    @staticmethod
+    def _field_from_id(node_name: str, field_id: str) -> Field:
+        """由节点名和字段标识还原字段位置"""
+        if field_id == "display_name":
+            return node_name, "display_name", None
+        section, _, key = field_id.partition("/")
+        return node_name, section, key
+        
+    @staticmethod
+    def build_index(node_defs: Dict) -> Dict:
+        """生成 nodeDefs 的指纹索引
+        
+        以基础名称的哈希作为节点指纹，记录节点名、各字段文本的哈希，以及与节点名
+        无关的内容签名（所有字段哈希的组合）。比较两个索引时只需要集合运算。
+        
+        Args:
+            node_defs: nodeDefs.json 数据
+            
+        Returns:
+            Dict: 指纹到 {"key", "sig", "fields"} 的映射
+        """
+        fields_by_node: Dict[str, Dict[str, str]] = {}
+        for field, text in NodeDiffer.iter_fields(node_defs):
+            fields_by_node.setdefault(field[0], {})[NodeDiffer._field_id(field)] = NodeDiffer._hash_text(text)
+            
+        index = {}
+        for node_name in node_defs:
+            fields = fields_by_node.get(node_name, {})
+            fingerprint = NodeDiffer._hash_text(NodeDiffer._get_base_name(node_name).casefold())
+            if fingerprint in index:
+                # 基础名称相同的不同节点按完整名称区分
+                fingerprint = NodeDiffer._hash_text("=" + node_name)
+            signature = NodeDiffer._hash_text("|".join(sorted(fields.values())))
+            index[fingerprint] = {"key": node_name, "sig": signature, "fields": fields}
+        return index
+        
+    @staticmethod
+    def diff_index(old_index: Dict, new_index: Dict) -> IndexDiff:
+        """比较两个指纹索引
+        
+        指纹相同的节点视为同一节点（节点名只有分隔符或大小写不同时也能对应）；
+        指纹不同但内容签名相同的新增和删除节点视为改名。对应上的节点中，位置消失
+        的字段如果以相同文本出现在新的位置，视为移动。
+        
+        Args:
+            old_index: 旧的指纹索引
+            new_index: 新的指纹索引
+            
+        Returns:
+            IndexDiff: 差异
+        """
+        diff = IndexDiff()
+        added = new_index.keys() - old_index.keys()
+        removed = old_index.keys() - new_index.keys()
+        matched = [(old_index[fp], new_index[fp]) for fp in new_index.keys() & old_index.keys()]
+        
+        # 内容签名相同的新增、删除节点视为改名
+        removed_by_sig = {old_index[fp]["sig"]: fp for fp in removed}
+        for fp in added:
+            old_fp = removed_by_sig.pop(new_index[fp]["sig"], None)
+            if old_fp is None:
+                diff.added.append(new_index[fp]["key"])
+            else:
+                removed.discard(old_fp)
+                matched.append((old_index[old_fp], new_index[fp]))
+        diff.removed = [old_index[fp]["key"] for fp in removed]
+        
+        for old_entry, new_entry in matched:
+            old_key, new_key = old_entry["key"], new_entry["key"]
+            if old_key != new_key:
+                diff.renamed[new_key] = old_key
+            old_fields, new_fields = old_entry["fields"], new_entry["fields"]
+            # 旧节点中位置已消失的字段，按文本哈希查找
+            vanished = {h: field_id for field_id, h in old_fields.items() if field_id not in new_fields}
+            for field_id, h in new_fields.items():
+                new_field = NodeDiffer._field_from_id(new_key, field_id)
+                old_hash = old_fields.get(field_id)
+                if old_hash is None:
+                    old_id = vanished.get(h)
+                    if old_id is not None:
+                        diff.moved[new_field] = diff.relocated[new_field] = NodeDiffer._field_from_id(old_key, old_id)
+                elif old_hash != h:
+                    diff.changed.append(new_field)
+                elif old_key != new_key:
+                    diff.relocated[new_field] = NodeDiffer._field_from_id(old_key, field_id)
+        return diff
         
     @staticmethod
     def save_added_nodes(added_nodes: Dict[str, NodeInfo], output_path: str) -> str:
@@ -83,4 +193,153 @@ def save_added_nodes(added_nodes: Dict[str, NodeInfo], output_path: str) -> str:
         output_file = os.path.join(output_path, "added_nodes.json")
         FileUtils.save_json(nodes_dict, output_file)
         
-        return output_file 
\ No newline at end of file
+        return output_file 
+
+    @staticmethod
+    def iter_fields(node_defs: Dict) -> Iterator[Tuple[Field, str]]:
+        """遍历 nodeDefs 中所有可翻译的字段
+        
+        Args:
+            node_defs: nodeDefs.json 数据
+            
+        Returns:
+            Iterator[Tuple[Field, str]]: (字段位置, 文本)
+        """
+        for node_name, node_data in node_defs.items():
+            if "display_name" in node_data:
+                yield (node_name, "display_name", None), node_data["display_name"]
+            for section in ("inputs", "outputs"):
+                for key, value in node_data.get(section, {}).items():
+                    if "name" in value:
+                        yield (node_name, section, key), value["name"]
+                        
+    @staticmethod
+    def set_field(node_defs: Dict, field: Field, text: str) -> None:
+        """修改 nodeDefs 中一个字段的文本
+        
+        Args:
+            node_defs: nodeDefs.json 数据，会被原地修改
+            field: 字段位置
+            text: 新的文本
+        """
+        node_name, section, key = field
+        if section == "display_name":
+            node_defs[node_name]["display_name"] = text
+        else:
+            node_defs[node_name][section][key]["name"] = text
+            
+    @staticmethod
+    def diff_fields(new_defs: Dict, existing_defs: Dict, snapshot: Dict, relocated: Optional[Dict[Field, Field]] = None) -> Tuple[Dict[Field, str], List[Field]]:
+        """按字段比较新解析的 nodeDefs 与已有的翻译
+        
+        快照记录了上次翻译时每个字段的原文和译文。原文没有变化的字段复用已有
+        译文：语言文件中仍保留该字段的译文（可能经过人工修改）时优先使用，否则
+        使用快照中的译文。没有快照时（首次使用增量模式），语言文件中与原文不同
+        的字段视为已翻译。其余字段需要重新翻译。
+        
+        Args:
+            new_defs: 新解析的 nodeDefs 数据（原文）
+            existing_defs: 已有的语言文件数据，没有时为空字典
+            snapshot: 上次翻译的快照，没有时为空字典
+            relocated: 新字段位置到旧字段位置的映射（改名的节点和移动的字段），见 diff_index
+            
+        Returns:
+            Tuple[Dict[Field, str], List[Field]]: (可复用的字段译文, 需要翻译的字段列表)
+        """
+        existing = dict(NodeDiffer.iter_fields(existing_defs))
+        relocated = relocated or {}
+        reused = {}
+        pending = []
+        for field, source in NodeDiffer.iter_fields(new_defs):
+            old_field = relocated.get(field, field)
+            current = existing.get(field)
+            if current is None:
+                current = existing.get(old_field)
+            if snapshot:
+                entry = NodeDiffer._snapshot_entry(snapshot, old_field)
+                if entry is not None and entry[0] == source:
+                    reused[field] = current if current is not None and current != source else entry[1]
+                    continue
+            elif current is not None and current != source:
+                reused[field] = current
+                continue
+            pending.append(field)
+        return reused, pending
+        
+    @staticmethod
+    def _snapshot_entry(snapshot: Dict, field: Field) -> Optional[List[str]]:
+        """读取快照中一个字段的 [原文, 译文]"""
+        node_name, section, key = field
+        node_entry = snapshot.get(node_name)
+        if not node_entry:
+            return None
+        if section == "display_name":
+            return node_entry.get("display_name")
+        return node_entry.get(section, {}).get(key)
+        
+    @staticmethod
+    def build_snapshot(source_defs: Dict, translated_defs: Dict) -> Dict:
+        """根据原文和译文生成翻译快照
+        
+        译文与原文相同的字段（未翻译或无需翻译）不记录，下次增量翻译时会重新发送，
+        通常由翻译记忆直接命中。
+        
+        Args:
+            source_defs: 翻译前的 nodeDefs 数据
+            translated_defs: 翻译后的 nodeDefs 数据
+            
+        Returns:
+            Dict: 节点名到各字段 [原文, 译文] 的映射
+        """
+        translated = dict(NodeDiffer.iter_fields(translated_defs))
+        snapshot = {}
+        for field, source in NodeDiffer.iter_fields(source_defs):
+            target = translated.get(field, source)
+            if target == source:
+                continue
+            node_name, section, key = field
+            pair = [source, target]
+            node_entry = snapshot.setdefault(node_name, {})
+            if section == "display_name":
+                node_entry["display_name"] = pair
+            else:
+                node_entry.setdefault(section, {})[key] = pair
+        return snapshot
+        
+    @staticmethod
+    def load_snapshot(lang_dir: str) -> Tuple[Dict, Dict]:
+        """读取语言目录中的翻译快照和原文的指纹索引
+        
+        Args:
+            lang_dir: 语言目录，例如 locales/zh
+            
+        Returns:
+            Tuple[Dict, Dict]: (翻译快照, 指纹索引)，不存在或版本不符时为空字典
+        """
+        snapshot_file = os.path.join(lang_dir, SNAPSHOT_FILE)
+        try:
+            data = FileUtils.load_json(snapshot_file)
+        except FileNotFoundError:
+            return {}, {}
+        except Exception as e:
+            logging.warning(f"读取翻译快照失败 {snapshot_file}: {str(e)}")
+            return {}, {}
+        if data.get("version") not in (1, SNAPSHOT_VERSION):
+            return {}, {}
+        return data.get("fields", {}), data.get("index", {})
+        
+    @staticmethod
+    def save_snapshot(snapshot: Dict, lang_dir: str, index: Optional[Dict] = None) -> str:
+        """保存翻译快照
+        
+        Args:
+            snapshot: 翻译快照
+            lang_dir: 语言目录，例如 locales/zh
+            index: 翻译时原文的指纹索引，下次增量翻译时直接与新的索引比较
+            
+        Returns:
+            str: 快照文件路径
+        """
+        snapshot_file = os.path.join(lang_dir, SNAPSHOT_FILE)
+        FileUtils.save_json({"version": SNAPSHOT_VERSION, "fields": snapshot, "index": index or {}}, snapshot_file, compact=True)
+        return snapshot_file
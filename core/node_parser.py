@@ -6,290 +6,622 @@
 import ast
 import os
 import logging
-from typing import Dict, Optional, Any, List, Tuple, Set
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Optional, Any, List, Tuple, Callable
+from .file_utils import FileUtils
+from .parse_cache import ParseCache
+from .models.node_info import NodeInfo
+
+# 文件数少于该值时不启用进程池，避免进程启动开销大于解析本身
+PARALLEL_MIN_FILES = 8
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """把 Name 或 Attribute 表达式还原为点分名称，如 nodes.BaseNode"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        prefix = _dotted_name(node.value)
+        return f"{prefix}.{node.attr}" if prefix else None
+    return None
+
+
+def _join_module(*parts: str) -> str:
+    """拼接模块名，忽略空的部分"""
+    return ".".join(part for part in parts if part)
+
+
+@dataclass
+class ClassSummary:
+    """类定义的属性摘要
+
+    在一次遍历中从类体中收集，供节点检测、父类信息合并和节点解析复用，
+    避免对同一个类体重复扫描。
+    """
+    name: str
+    bases: List[str] = field(default_factory=list)
+    inputs: Dict[str, Dict] = field(default_factory=dict)
+    outputs_list: List[Dict[str, Dict]] = field(default_factory=list)
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    has_input_types: bool = False
+    has_return_types: bool = False
+    has_category: bool = False
+    has_function: bool = False
+    has_return_names: bool = False
+
+    @classmethod
+    def from_class(cls, class_node: ast.ClassDef) -> 'ClassSummary':
+        """扫描一次类体，生成摘要
+
+        Args:
+            class_node: 类定义的 AST 节点
+
+        Returns:
+            ClassSummary: 类摘要
+        """
+        summary = cls(
+            name=class_node.name,
+            bases=[name for name in map(_dotted_name, class_node.bases) if name]
+        )
+        for item in class_node.body:
+            if isinstance(item, ast.FunctionDef):
+                if item.name == "INPUT_TYPES":
+                    summary.has_input_types = True
+                    input_types = NodeParser._parse_input_types(item)
+                    if input_types:
+                        summary.inputs.update(input_types)
+                elif item.name != "__init__":
+                    if item.name == "FUNCTION":
+                        summary.has_function = True
+                    # 解析其他方法的参数
+                    for param_name in NodeParser._parse_method_parameters(item):
+                        if param_name not in summary.inputs:
+                            summary.inputs[param_name] = {"name": param_name}
+            elif isinstance(item, ast.Assign):
+                for target in item.targets:
+                    if not isinstance(target, ast.Name):
+                        continue
+                    if target.id == "RETURN_TYPES":
+                        summary.has_return_types = True
+                        return_types = NodeParser._extract_value(item.value)
+                        if return_types:
+                            summary.outputs_list.append(NodeParser._build_outputs(return_types))
+                    elif target.id == "CATEGORY":
+                        summary.has_category = True
+                        summary.attrs["category"] = NodeParser._extract_value(item.value)
+                    elif target.id == "FUNCTION":
+                        summary.has_function = True
+                        summary.attrs["function"] = NodeParser._extract_value(item.value)
+                    elif target.id == "RETURN_NAMES":
+                        summary.has_return_names = True
+        return summary
+
+
+class ModuleCollector(ast.NodeVisitor):
+    """模块级信息收集器
+
+    只遍历一次语法树，同时收集 NODE_CLASS_MAPPINGS、NODE_DISPLAY_NAME_MAPPINGS、
+    类定义、继承关系、导入语句以及每个类的属性摘要。
+    """
+
+    def __init__(self):
+        self.node_mappings: Dict[str, str] = {}
+        self.display_mappings: Dict[str, str] = {}
+        self.classes: List[ClassSummary] = []
+        self.class_defs: Dict[str, ClassSummary] = {}
+        self.imports: Dict[str, List] = {}
+        self.star_imports: List[List] = []
+
+    @property
+    def inheritance_map(self) -> Dict[str, List[str]]:
+        """类名到父类名列表的映射"""
+        return {name: summary.bases for name, summary in self.class_defs.items()}
+
+    def visit_Assign(self, node: ast.Assign):
+        for target in node.targets:
+            if not isinstance(target, ast.Name) or not isinstance(node.value, ast.Dict):
+                continue
+            if target.id == "NODE_CLASS_MAPPINGS":
+                for key, value in zip(node.value.keys, node.value.values):
+                    if isinstance(key, ast.Str) and isinstance(value, ast.Name):
+                        self.node_mappings[value.id] = key.s
+            elif target.id == "NODE_DISPLAY_NAME_MAPPINGS":
+                for key, value in zip(node.value.keys, node.value.values):
+                    if isinstance(key, ast.Str) and isinstance(value, ast.Str):
+                        self.display_mappings[key.s] = value.s
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        summary = ClassSummary.from_class(node)
+        self.classes.append(summary)
+        self.class_defs[node.name] = summary
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            if alias.asname:
+                # import a.b as c：c 指向模块 a.b
+                self.imports[alias.asname] = [alias.name, 0, None]
+            else:
+                # import a.b：绑定的是顶层模块 a
+                top = alias.name.partition(".")[0]
+                self.imports[top] = [top, 0, None]
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        for alias in node.names:
+            if alias.name == "*":
+                self.star_imports.append([node.module or "", node.level])
+            else:
+                self.imports[alias.asname or alias.name] = [node.module or "", node.level, alias.name]
+
+
+@dataclass
+class ModuleSummary:
+    """单个模块的解析摘要
+
+    只依赖文件自身的内容，可以在工作进程中生成并写入解析缓存。
+    跨模块的继承和注册关系由 SymbolIndex 在汇总所有模块后统一解析。
+    """
+    path: str
+    classes: List[ClassSummary] = field(default_factory=list)
+    node_mappings: Dict[str, str] = field(default_factory=dict)
+    display_mappings: Dict[str, str] = field(default_factory=dict)
+    # 本地名称 -> [模块名, 相对导入层级, 导入的名称]，import 语句的导入名称为 None
+    imports: Dict[str, List] = field(default_factory=dict)
+    # [模块名, 相对导入层级]
+    star_imports: List[List] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.class_defs: Dict[str, ClassSummary] = {summary.name: summary for summary in self.classes}
+
+    @property
+    def is_package(self) -> bool:
+        """是否是包的 __init__.py"""
+        return os.path.basename(self.path) == "__init__.py"
+
+    @classmethod
+    def from_collector(cls, path: str, collector: ModuleCollector) -> 'ModuleSummary':
+        """根据模块级信息收集器的结果生成摘要"""
+        return cls(
+            path=path,
+            classes=collector.classes,
+            node_mappings=collector.node_mappings,
+            display_mappings=collector.display_mappings,
+            imports=collector.imports,
+            star_imports=collector.star_imports
+        )
+
+    def to_dict(self) -> Dict:
+        """转换为可以写入解析缓存的字典"""
+        return {
+            "classes": [asdict(summary) for summary in self.classes],
+            "node_mappings": self.node_mappings,
+            "display_mappings": self.display_mappings,
+            "imports": self.imports,
+            "star_imports": self.star_imports
+        }
+
+    @classmethod
+    def from_dict(cls, path: str, data: Dict) -> 'ModuleSummary':
+        """从解析缓存的字典还原摘要"""
+        return cls(
+            path=path,
+            classes=[ClassSummary(**summary) for summary in data["classes"]],
+            node_mappings=data["node_mappings"],
+            display_mappings=data["display_mappings"],
+            imports=data["imports"],
+            star_imports=data["star_imports"]
+        )
+
+
+@dataclass
+class ResolvedClass:
+    """合并父类后的类信息"""
+    is_node: bool
+    inputs: Dict[str, Dict] = field(default_factory=dict)
+    outputs: Dict[str, Dict] = field(default_factory=dict)
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+class ClassResolver:
+    """模块内的类解析表
+
+    每个类的节点判定和合并后的输入、输出、分类、函数只计算一次，子类直接复用
+    父类的结果，整个模块的解析开销与类的数量成正比，而不再随继承深度成倍增长。
+    合并顺序与 Python 的属性覆盖一致：子类覆盖父类，靠前的父类覆盖靠后的父类。
+    """
+
+    def __init__(self, class_defs: Dict[str, ClassSummary], lookup: Optional[Callable[[str], Optional[ResolvedClass]]] = None):
+        """初始化解析表
+
+        Args:
+            class_defs: 类名到类摘要的映射
+            lookup: 解析不在本模块中定义的父类（如导入的类），为 None 时忽略这些父类
+        """
+        self.class_defs = class_defs
+        self.lookup = lookup
+        self._resolved: Dict[str, ResolvedClass] = {}
+        self._pending = set()
+
+    def resolve(self, summary: ClassSummary) -> ResolvedClass:
+        """获取类的解析结果
+
+        Args:
+            summary: 类摘要
+
+        Returns:
+            ResolvedClass: 合并父类后的类信息
+        """
+        # 同名类被重新定义时，只有最后一个定义参与继承，其余的单独计算
+        if self.class_defs.get(summary.name) is summary and summary.name not in self._pending:
+            return self.resolve_name(summary.name)
+        return self._build(summary)
+
+    def is_resolved(self, class_name: str) -> bool:
+        """类是否已经解析过"""
+        return class_name in self._resolved
+
+    def resolve_name(self, class_name: str) -> Optional[ResolvedClass]:
+        """按类名获取解析结果，类不在本模块中或出现循环继承时返回 None"""
+        if class_name in self._resolved:
+            return self._resolved[class_name]
+        summary = self.class_defs.get(class_name)
+        if summary is None or class_name in self._pending:
+            return None
+        self._pending.add(class_name)
+        try:
+            resolved = self._build(summary)
+        finally:
+            self._pending.discard(class_name)
+        self._resolved[class_name] = resolved
+        return resolved
+
+    def _resolve_base(self, base: str) -> Optional[ResolvedClass]:
+        """解析一个父类名"""
+        # 父类与正在解析的类同名时（如导入 Base 后定义 class Base(Base)），指向导入的类
+        if base in self.class_defs and base not in self._pending:
+            return self.resolve_name(base)
+        return self.lookup(base) if self.lookup is not None else None
+
+    def _build(self, summary: ClassSummary) -> ResolvedClass:
+        """根据父类的解析结果和类自身的摘要生成解析结果"""
+        parents = [parent for parent in map(self._resolve_base, summary.bases) if parent is not None]
+        resolved = ResolvedClass(
+            is_node=NodeParser._is_comfy_node(summary) or any(parent.is_node for parent in parents)
+        )
+        for parent in reversed(parents):
+            resolved.inputs.update(parent.inputs)
+            resolved.outputs.update(parent.outputs)
+            resolved.attrs.update(parent.attrs)
+
+        # 合并类自身的输入、输出和属性
+        resolved.inputs.update(summary.inputs)
+        if summary.outputs_list:
+            resolved.outputs = summary.outputs_list[-1]
+        resolved.attrs.update(summary.attrs)
+        return resolved
+
+
+class SymbolIndex:
+    """插件级符号索引
+
+    把一个插件文件夹中所有模块的摘要按模块全名（相对插件根目录，如 nodes.base）
+    组织起来，跟随 from .x import Base、import x as y、from x import * 等导入把
+    父类名定位到定义它的模块，并汇总各模块的 NODE_CLASS_MAPPINGS 和
+    NODE_DISPLAY_NAME_MAPPINGS。每个模块的类解析表只创建一次，跨模块的父类
+    同样只解析一次，不需要重新读取或解析任何文件。
+    """
+
+    def __init__(self, root: str, modules: List[ModuleSummary]):
+        """建立索引
+
+        Args:
+            root: 插件根目录，模块全名相对该目录计算
+            modules: 插件中所有模块的摘要
+        """
+        self.package_name = os.path.basename(os.path.normpath(root))
+        self.modules: Dict[str, ModuleSummary] = {}
+        self.module_names: Dict[str, str] = {}
+        self.packages = set()
+        for module in modules:
+            name = self.module_name(root, module.path)
+            self.modules[name] = module
+            self.module_names[module.path] = name
+            # 记录所有上级包名，兼容没有 __init__.py 的命名空间包
+            parts = name.split(".")
+            for depth in range(len(parts)):
+                self.packages.add(".".join(parts[:depth]))
+
+        self._resolvers: Dict[str, ClassResolver] = {}
+        self._located: Dict[Tuple[str, str], Optional[Tuple[str, str]]] = {}
+
+        # 汇总注册名称和显示名称，__init__.py 中注册从子模块导入的类时同样生效
+        self.registered: Dict[Tuple[str, str], str] = {}
+        self.display_mappings: Dict[str, str] = {}
+        for name, module in self.modules.items():
+            self.display_mappings.update(module.display_mappings)
+            for class_ref, node_key in module.node_mappings.items():
+                location = self.locate(name, class_ref)
+                if location is not None:
+                    self.registered[location] = node_key
+
+    @staticmethod
+    def module_name(root: str, file_path: str) -> str:
+        """计算文件相对插件根目录的模块全名，根目录的 __init__.py 为空字符串"""
+        relative = os.path.splitext(os.path.relpath(file_path, root))[0]
+        parts = [part for part in relative.split(os.sep) if part not in ("", ".")]
+        if parts and parts[-1] == "__init__":
+            parts.pop()
+        return ".".join(parts)
+
+    def resolver(self, module_name: str) -> ClassResolver:
+        """获取模块的类解析表，导入的父类通过索引解析"""
+        resolver = self._resolvers.get(module_name)
+        if resolver is None:
+            resolver = ClassResolver(
+                self.modules[module_name].class_defs,
+                lambda ref: self._resolve_location(self._locate_imported(module_name, ref))
+            )
+            self._resolvers[module_name] = resolver
+        return resolver
+
+    def _resolve_location(self, location: Optional[Tuple[str, str]]) -> Optional[ResolvedClass]:
+        """按 (模块全名, 类名) 获取类的解析结果"""
+        if location is None:
+            return None
+        self.prepare(location)
+        module_name, class_name = location
+        return self.resolver(module_name).resolve_name(class_name)
+
+    def prepare(self, location: Tuple[str, str]) -> None:
+        """从最深的祖先类开始依次解析类的继承链
+
+        跨越数百个模块的长继承链如果直接递归解析会超过递归深度限制，
+        先迭代收集尚未解析的祖先类，再由深到浅解析，每一步只需一层递归。
+
+        Args:
+            location: (模块全名, 类名)
+        """
+        stack = [location]
+        order = []
+        seen = set()
+        while stack:
+            module_name, class_name = current = stack.pop()
+            if current in seen or self.resolver(module_name).is_resolved(class_name):
+                continue
+            seen.add(current)
+            order.append(current)
+            for base in self.modules[module_name].class_defs[class_name].bases:
+                # 与类同名的父类指向导入的类，与 ClassResolver 的处理一致
+                if base in self.modules[module_name].class_defs and base != class_name:
+                    stack.append((module_name, base))
+                else:
+                    base_location = self._locate_imported(module_name, base)
+                    if base_location is not None:
+                        stack.append(base_location)
+        for module_name, class_name in reversed(order):
+            self.resolver(module_name).resolve_name(class_name)
+
+    def locate(self, module_name: str, ref: str) -> Optional[Tuple[str, str]]:
+        """在模块的命名空间中查找类定义的位置
+
+        Args:
+            module_name: 模块全名
+            ref: 类名或点分引用，如 Base、nodes.Base
+
+        Returns:
+            Optional[Tuple[str, str]]: (定义类的模块全名, 类名)，找不到或不在插件内时返回 None
+        """
+        key = (module_name, ref)
+        if key in self._located:
+            return self._located[key]
+        # 先占位，循环导入时返回 None
+        self._located[key] = None
+        module = self.modules.get(module_name)
+        if module is None:
+            location = None
+        elif ref in module.class_defs:
+            location = (module_name, ref)
+        else:
+            location = self._locate_imported(module_name, ref)
+        self._located[key] = location
+        return location
+
+    def _locate_imported(self, module_name: str, ref: str) -> Optional[Tuple[str, str]]:
+        """通过模块的导入语句查找类定义的位置"""
+        module = self.modules.get(module_name)
+        if module is None:
+            return None
+        head, _, rest = ref.partition(".")
+
+        target = module.imports.get(head)
+        if target is not None:
+            source, level, name = target
+            base = self._absolute_module(module_name, module, source, level)
+            if base is None:
+                return None
+            if name is None:
+                # import a.b as c 后引用 c.Base
+                return self.locate(base, rest) if rest else None
+            submodule = _join_module(base, name)
+            if submodule in self.modules or submodule in self.packages:
+                # from . import nodes 后引用 nodes.Base
+                return self.locate(submodule, rest) if rest else None
+            return self.locate(base, _join_module(name, rest))
+
+        for source, level in module.star_imports:
+            base = self._absolute_module(module_name, module, source, level)
+            if base is not None:
+                location = self.locate(base, ref)
+                if location is not None:
+                    return location
+
+        # 包内未显式导入的子模块，如 pkg.sub.Base
+        if rest and module.is_package:
+            submodule = _join_module(module_name, head)
+            if submodule in self.modules or submodule in self.packages:
+                return self.locate(submodule, rest)
+        return None
+
+    def _absolute_module(self, module_name: str, module: ModuleSummary, source: str, level: int) -> Optional[str]:
+        """把导入语句中的模块名转换为模块全名，指向插件外部时返回 None"""
+        if level:
+            package = module_name if module.is_package else module_name.rpartition(".")[0]
+            parts = package.split(".") if package else []
+            if level - 1 > len(parts):
+                return None
+            return _join_module(*parts[:len(parts) - (level - 1)], source)
+
+        if source in self.modules or source in self.packages:
+            return source
+        # 以插件包名开头的绝对导入，如 from PackName.nodes import Base
+        parts = source.split(".")
+        for position, part in enumerate(parts):
+            if part == self.package_name:
+                candidate = ".".join(parts[position + 1:])
+                if candidate in self.modules or candidate in self.packages:
+                    return candidate
+        return None
+
+    def registered_name(self, module_name: str, class_name: str) -> Optional[str]:
+        """获取类在 NODE_CLASS_MAPPINGS 中的注册名称，未注册时返回 None"""
+        node_key = self.modules[module_name].node_mappings.get(class_name)
+        if node_key is not None:
+            return node_key
+        return self.registered.get((module_name, class_name))
+
+    def display_name(self, module_name: str, node_key: str) -> str:
+        """获取节点的显示名称，优先使用模块自身的 NODE_DISPLAY_NAME_MAPPINGS"""
+        display_mappings = self.modules[module_name].display_mappings
+        if node_key in display_mappings:
+            return display_mappings[node_key]
+        return self.display_mappings.get(node_key, node_key)
+
 
 class NodeParser:
     """节点解析器"""
     
     @staticmethod
-    def parse_file(file_path: str) -> Dict[str, Dict]:
-        """解析单个 Python 文件中的节点信息"""
-        nodes_info = {}
-        
+    def parse_file(file_path: str) -> Dict[str, NodeInfo]:
+        """解析单个 Python 文件中的节点信息，只解析文件内的继承关系"""
+        module = NodeParser.collect_module(file_path)
+        return NodeParser.resolve_modules(os.path.dirname(os.path.abspath(file_path)), [module])[0]
+
+    @staticmethod
+    def collect_module(file_path: str) -> ModuleSummary:
+        """读取并扫描单个 Python 文件，生成模块摘要
+
+        Args:
+            file_path: Python 文件路径
+
+        Returns:
+            ModuleSummary: 模块摘要，解析失败时为空摘要
+        """
         try:
             # 读取并解析文件
             with open(file_path, 'r', encoding='utf-8') as f:
                 tree = ast.parse(f.read())
                 
-            # 获取文件级别的映射
-            node_mappings = NodeParser._get_node_mappings(tree)
-            display_mappings = NodeParser._get_display_mappings(tree)
-            
-            # 创建类名到父类的映射
-            inheritance_map, class_defs = NodeParser._get_class_inheritance(tree)
-            
-            # 解析每个类定义
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    # 检查是否是 ComfyUI 节点类
-                    if NodeParser._is_comfy_node(node, inheritance_map, class_defs) or node.name in node_mappings:
-                        class_name = node.name
-                        # 使用注册名称作为键
-                        registered_name = NodeParser._get_registered_name(class_name, node_mappings)
-                        # 获取父类信息
-                        parent_info = NodeParser._get_parent_info(node, inheritance_map, class_defs)
-                        node_info = NodeParser._parse_node_class(node, registered_name, display_mappings, parent_info)
-                        if node_info:
-                            nodes_info[registered_name] = node_info
-                            logging.info(f"成功解析节点: {registered_name}")
-                            
+            # 一次遍历收集映射、类定义、继承关系和导入语句
+            collector = ModuleCollector()
+            collector.visit(tree)
+            return ModuleSummary.from_collector(file_path, collector)
         except Exception as e:
             logging.error(f"解析文件失败 {file_path}: {str(e)}")
-            
-        return nodes_info
-        
-    @staticmethod
-    def _get_class_inheritance(tree: ast.AST) -> Dict[str, List[str]]:
-        """获取类的继承关系"""
-        inheritance_map = {}
-        # 先收集所有类定义
-        class_defs = {}
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                class_defs[node.name] = node
-                parent_classes = []
-                for base in node.bases:
-                    if isinstance(base, ast.Name):
-                        parent_classes.append(base.id)
-                inheritance_map[node.name] = parent_classes
-        return inheritance_map, class_defs
+            return ModuleSummary(path=file_path)
 
     @staticmethod
-    def _get_parent_info(class_node: ast.ClassDef, inheritance_map: Dict[str, List[str]], class_defs: Dict[str, ast.ClassDef]) -> Dict:
-        """获取父类的输入输出信息"""
-        parent_info = {
-            "inputs": {},
-            "outputs": {},
-            "category": "",
-            "function": ""
-        }
+    def resolve_modules(root: str, modules: List[ModuleSummary]) -> List[Dict[str, NodeInfo]]:
+        """建立插件的符号索引，解析每个模块中的节点
         
-        def get_parent_data(class_name: str, visited: Set[str]):
-            if class_name in visited:
-                return
-            visited.add(class_name)
+        Args:
+            root: 插件根目录
+            modules: 插件中所有模块的摘要
             
-            # 获取父类列表
-            parent_classes = inheritance_map.get(class_name, [])
-            for parent in parent_classes:
-                if parent in class_defs:
-                    parent_node = class_defs[parent]
-                    # 解析父类的输入类型
-                    for item in parent_node.body:
-                        if isinstance(item, ast.FunctionDef) and item.name == "INPUT_TYPES":
-                            input_types = NodeParser._parse_input_types(item)
-                            if input_types:
-                                parent_info["inputs"].update(input_types)
-                        elif isinstance(item, ast.FunctionDef) and item.name not in ["INPUT_TYPES", "__init__"]:
-                            # 解析父类方法的参数
-                            method_params = NodeParser._parse_method_parameters(item)
-                            for param_name, param_type in method_params.items():
-                                if param_name not in parent_info["inputs"]:
-                                    parent_info["inputs"][param_name] = {"name": param_name}
-                        elif isinstance(item, ast.Assign):
-                            for target in item.targets:
-                                if isinstance(target, ast.Name):
-                                    if target.id == "RETURN_TYPES":
-                                        return_types = NodeParser._extract_value(item.value)
-                                        if return_types:
-                                            outputs = {}
-                                            for rt in return_types:
-                                                # 处理 None 类型的返回值
-                                                if rt is None:
-                                                    name = "none"
-                                                else:
-                                                    name = str(rt).lower()
-                                                outputs[name] = {"name": name}
-                                            parent_info["outputs"].update(outputs)
-                                    elif target.id == "CATEGORY":
-                                        parent_info["category"] = NodeParser._extract_value(item.value)
-                                    elif target.id == "FUNCTION":
-                                        parent_info["function"] = NodeParser._extract_value(item.value)
-                    
-                    # 递归处理父类的父类
-                    get_parent_data(parent, visited)
-                    
-        visited = set()
-        get_parent_data(class_node.name, visited)
-        return parent_info
+        Returns:
+            List[Dict[str, NodeInfo]]: 与 modules 一一对应的节点信息列表
+        """
+        index = SymbolIndex(root, modules)
+        results = []
+        for module in modules:
+            try:
+                results.append(NodeParser._parse_module(index, index.module_names[module.path]))
+            except Exception as e:
+                logging.error(f"解析文件失败 {module.path}: {str(e)}")
+                results.append({})
+        return results
+
+    @staticmethod
+    def _parse_module(index: SymbolIndex, module_name: str) -> Dict[str, NodeInfo]:
+        """解析模块中的节点类"""
+        nodes_info = {}
+        module = index.modules[module_name]
+        resolver = index.resolver(module_name)
+        for summary in module.classes:
+            if module.class_defs[summary.name] is summary:
+                index.prepare((module_name, summary.name))
+            resolved = resolver.resolve(summary)
+            registered_name = index.registered_name(module_name, summary.name)
+            # 检查是否是 ComfyUI 节点类或已在 NODE_CLASS_MAPPINGS 中注册
+            if resolved.is_node or registered_name is not None:
+                # 使用注册名称作为键
+                node_key = registered_name or summary.name
+                node_info = NodeParser._parse_node_class(resolved, index.display_name(module_name, node_key))
+                if node_info:
+                    nodes_info[node_key] = node_info
+                    logging.info(f"成功解析节点: {node_key}")
+        return nodes_info
 
     @staticmethod
-    def _is_comfy_node(class_node: ast.ClassDef, inheritance_map: Dict[str, List[str]], class_defs: Dict[str, ast.ClassDef]) -> bool:
-        """检查是否是 ComfyUI 节点类
+    def _is_comfy_node(summary: ClassSummary) -> bool:
+        """根据类自身的属性检查是否是 ComfyUI 节点类
         
         检测规则（按优先级排序）：
         1. 原始规则：有 INPUT_TYPES 方法或 RETURN_TYPES 属性
-        2. 映射规则：类在 NODE_CLASS_MAPPINGS 中
-        3. 继承规则：父类是节点类
-        4. 组合规则：
+        2. 组合规则：
            - 有 CATEGORY 且有 FUNCTION
-           - 有 RETURN_TYPES 且有 FUNCTION
            - 类名以 Node 结尾且有 CATEGORY 或 FUNCTION
-           - 有 RETURN_NAMES 且有 RETURN_TYPES
-        """
-        # 检查当前类的属性
-        has_input_types = False
-        has_return_types = False
-        has_category = False
-        has_function = False
-        has_return_names = False
-        
-        # 检查类名是否以 Node 结尾
-        is_node_class = class_node.name.endswith('Node')
-        
-        # 检查类的所有属性和方法
-        for item in class_node.body:
-            if isinstance(item, ast.FunctionDef):
-                if item.name == "INPUT_TYPES":
-                    has_input_types = True
-                elif item.name == "FUNCTION":
-                    has_function = True
-            elif isinstance(item, ast.Assign):
-                for target in item.targets:
-                    if isinstance(target, ast.Name):
-                        if target.id == "RETURN_TYPES":
-                            has_return_types = True
-                        elif target.id == "CATEGORY":
-                            has_category = True
-                        elif target.id == "FUNCTION":
-                            has_function = True
-                        elif target.id == "RETURN_NAMES":
-                            has_return_names = True
         
+        映射规则（类在 NODE_CLASS_MAPPINGS 中）在 parse_file 中检查，
+        继承规则（父类是节点类）由 ClassResolver 根据父类的解析结果判断。
+        """
         # 1. 原始规则：保持原有的基本检测逻辑
-        if has_input_types or has_return_types:
+        if summary.has_input_types or summary.has_return_types:
             return True
             
-        # 2. 继承规则：检查父类
-        def check_parent_class(class_name: str, visited: Set[str]) -> bool:
-            if class_name in visited:
-                return False
-            visited.add(class_name)
-            
-            parent_classes = inheritance_map.get(class_name, [])
-            for parent in parent_classes:
-                if parent in class_defs:
-                    parent_node = class_defs[parent]
-                    # 递归检查父类是否满足节点条件
-                    if NodeParser._is_comfy_node(parent_node, inheritance_map, class_defs):
-                        return True
-            return False
-            
-        # 3. 组合规则：检查多个属性组合
-        has_valid_combination = any([
-            has_category and has_function,  # 有类别和功能
-            has_return_types and has_function,  # 有返回类型和功能
-            is_node_class and (has_category or has_function),  # Node类且有类别或功能
-            has_return_names and has_return_types,  # 有返回名称和类型
-            has_category and has_return_types,  # 有类别和返回类型
-            has_input_types and has_function,  # 有输入类型和功能
-        ])
-        
-        # 检查父类的继承关系
-        visited = set()
-        has_valid_parent = check_parent_class(class_node.name, visited)
-        
-        # 返回所有检测结果的组合
-        return any([
-            has_input_types,  # 原始规则1
-            has_return_types,  # 原始规则2
-            has_valid_parent,  # 继承规则
-            has_valid_combination,  # 组合规则
-        ])
-        
-    @staticmethod
-    def _get_node_mappings(tree: ast.AST) -> Dict[str, str]:
-        """获取 NODE_CLASS_MAPPINGS"""
-        mappings = {}
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and target.id == "NODE_CLASS_MAPPINGS":
-                        if isinstance(node.value, ast.Dict):
-                            for key, value in zip(node.value.keys, node.value.values):
-                                if isinstance(key, ast.Str) and isinstance(value, ast.Name):
-                                    mappings[value.id] = key.s
-        return mappings
-        
-    @staticmethod
-    def _get_display_mappings(tree: ast.AST) -> Dict[str, str]:
-        """获取 NODE_DISPLAY_NAME_MAPPINGS"""
-        mappings = {}
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and target.id == "NODE_DISPLAY_NAME_MAPPINGS":
-                        if isinstance(node.value, ast.Dict):
-                            for key, value in zip(node.value.keys, node.value.values):
-                                if isinstance(key, ast.Str) and isinstance(value, ast.Str):
-                                    mappings[key.s] = value.s
-        return mappings
+        # 2. 组合规则：检查多个属性组合（类名以 Node 结尾视为节点类）
+        is_node_class = summary.name.endswith('Node')
+        if summary.has_category and summary.has_function:
+            return True
+        return is_node_class and (summary.has_category or summary.has_function)
         
     @staticmethod
-    def _get_registered_name(class_name: str, mappings: Dict[str, str]) -> str:
-        """获取节点的注册名称"""
-        for cls, name in mappings.items():
-            if cls == class_name:
-                return name
-        return class_name
+    def _parse_node_class(resolved: ResolvedClass, display_name: str) -> Optional[NodeInfo]:
+        """根据类的解析结果生成节点信息"""
+        return NodeInfo(
+            display_name=display_name,
+            input_keys=tuple(resolved.inputs),
+            input_names=tuple(value.get("name") for value in resolved.inputs.values()),
+            output_keys=tuple(resolved.outputs),
+            output_names=tuple(value.get("name") for value in resolved.outputs.values()),
+            category=resolved.attrs.get("category", ""),
+            function=resolved.attrs.get("function")
+        )
         
     @staticmethod
-    def _parse_node_class(class_node: ast.ClassDef, node_key: str, display_mappings: Dict[str, str], parent_info: Dict) -> Optional[Dict]:
-        """解析节点类定义"""
-        node_info = {
-            "display_name": display_mappings.get(node_key, node_key),
-            "inputs": parent_info.get("inputs", {}),
-            "outputs": parent_info.get("outputs", {}),
-            "category": parent_info.get("category", "")
-        }
-        
-        # 解析类属性和方法
-        for item in class_node.body:
-            # 解析输入类型
-            if isinstance(item, ast.FunctionDef):
-                if item.name == "INPUT_TYPES":
-                    input_types = NodeParser._parse_input_types(item)
-                    if input_types:
-                        node_info["inputs"].update(input_types)
-                elif item.name not in ["INPUT_TYPES", "__init__"]:
-                    # 解析其他方法的参数
-                    method_params = NodeParser._parse_method_parameters(item)
-                    for param_name, param_type in method_params.items():
-                        if param_name not in node_info["inputs"]:
-                            node_info["inputs"][param_name] = {"name": param_name}
-                    
-            # 解析类属性
-            elif isinstance(item, ast.Assign):
-                for target in item.targets:
-                    if isinstance(target, ast.Name):
-                        if target.id == "RETURN_TYPES":
-                            return_types = NodeParser._extract_value(item.value)
-                            if return_types:
-                                outputs = {}
-                                for rt in return_types:
-                                    # 处理 None 类型的返回值
-                                    if rt is None:
-                                        name = "none"
-                                    else:
-                                        name = str(rt).lower()
-                                    outputs[name] = {"name": name}
-                                node_info["outputs"] = outputs
-                        elif target.id == "CATEGORY":
-                            node_info["category"] = NodeParser._extract_value(item.value)
-                        elif target.id == "FUNCTION":
-                            node_info["function"] = NodeParser._extract_value(item.value)
-                            
-        return node_info
+    def _build_outputs(return_types) -> Dict[str, Dict]:
+        """根据 RETURN_TYPES 生成输出字典"""
+        outputs = {}
+        for rt in return_types:
+            # 处理 None 类型的返回值
+            if rt is None:
+                name = "none"
+            else:
+                name = str(rt).lower()
+            outputs[name] = {"name": name}
+        return outputs
         
     @staticmethod
     def _parse_input_types(method_node: ast.FunctionDef) -> Dict:
@@ -332,7 +664,7 @@ def _parse_method_parameters(method_node: ast.FunctionDef) -> Dict[str, str]:
             if arg.annotation:
                 if isinstance(arg.annotation, ast.Name):
                     param_type = arg.annotation.id
-                elif isinstance(arg.annotation, ast.Attribute):
+                elif isinstance(arg.annotation, ast.Attribute) and isinstance(arg.annotation.value, ast.Name):
                     param_type = f"{arg.annotation.value.id}.{arg.annotation.attr}"
                 else:
                     param_type = "Any"
@@ -369,23 +701,96 @@ def _extract_value(node: ast.AST) -> Any:
         return None
 
     @staticmethod
-    def parse_folder(folder_path: str) -> Dict[str, Dict]:
-        """解析指定文件夹中的所有 Python 文件
+    def collect_modules(file_paths: List[str], max_workers: Optional[int] = None, cache: Optional[ParseCache] = None) -> List[ModuleSummary]:
+        """使用进程池并行扫描多个 Python 文件，生成模块摘要
+        
+        模块摘要只依赖文件自身的内容，因此可以按文件缓存；跨模块的继承关系
+        由 resolve_modules 在主进程中解析。结果按照 file_paths 的顺序返回。
+        文件数量较少或只有一个工作进程时直接在当前进程中扫描。
         
         Args:
-            folder_path: 要解析的文件夹路径
+            file_paths: Python 文件路径列表
+            max_workers: 最大工作进程数，默认为 CPU 核心数
+            cache: 解析缓存，命中的文件不再重新扫描
             
         Returns:
-            Dict[str, Dict]: 解析出的节点信息字典
+            List[ModuleSummary]: 与 file_paths 一一对应的模块摘要列表
         """
+        results: List[Optional[ModuleSummary]] = [None] * len(file_paths)
+        pending = []
+        for index, file_path in enumerate(file_paths):
+            cached = cache.get(file_path) if cache is not None else None
+            if cached is None:
+                pending.append(index)
+            else:
+                results[index] = ModuleSummary.from_dict(file_path, cached)
+        
+        pending_paths = [file_paths[index] for index in pending]
+        for index, module in zip(pending, NodeParser._collect_pending(pending_paths, max_workers)):
+            results[index] = module
+            if cache is not None:
+                cache.put(file_paths[index], module.to_dict())
+                
+        if cache is not None:
+            logging.info(f"解析缓存命中 {len(file_paths) - len(pending)} 个文件，重新解析 {len(pending)} 个文件")
+        return results
+        
+    @staticmethod
+    def _collect_pending(file_paths: List[str], max_workers: Optional[int]) -> List[ModuleSummary]:
+        """按顺序扫描文件，文件足够多时使用进程池"""
+        workers = max_workers or os.cpu_count() or 1
+        workers = min(workers, len(file_paths))
+        if workers <= 1 or len(file_paths) < PARALLEL_MIN_FILES:
+            return [NodeParser.collect_module(file_path) for file_path in file_paths]
+            
+        try:
+            chunksize = max(1, len(file_paths) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(NodeParser.collect_module, file_paths, chunksize=chunksize))
+        except (BrokenProcessPool, OSError) as e:
+            logging.warning(f"并行解析不可用，改为顺序解析: {str(e)}")
+            return [NodeParser.collect_module(file_path) for file_path in file_paths]
+
+    @staticmethod
+    def parse_files(file_paths: List[str], max_workers: Optional[int] = None, cache: Optional[ParseCache] = None, root: Optional[str] = None) -> List[Dict[str, NodeInfo]]:
+        """并行解析同一个插件中的多个 Python 文件
+        
+        Args:
+            file_paths: Python 文件路径列表
+            max_workers: 最大工作进程数，默认为 CPU 核心数
+            cache: 解析缓存
+            root: 插件根目录，默认为所有文件的公共目录
+            
+        Returns:
+            List[Dict[str, NodeInfo]]: 与 file_paths 一一对应的节点信息列表
+        """
+        if not file_paths:
+            return []
+        modules = NodeParser.collect_modules(file_paths, max_workers, cache)
+        if root is None:
+            root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in file_paths])
+        return NodeParser.resolve_modules(root, modules)
+            
+    @staticmethod
+    def merge_results(results: List[Dict[str, NodeInfo]]) -> Dict[str, NodeInfo]:
+        """按顺序合并多个文件的解析结果，后出现的同名节点覆盖先出现的"""
         nodes_info = {}
+        for file_nodes in results:
+            nodes_info.update(file_nodes)
+        return nodes_info
         
-        # 遍历文件夹中的所有文件
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    file_nodes = NodeParser.parse_file(file_path)
-                    nodes_info.update(file_nodes)  # 合并节点信息
+    @staticmethod
+    def parse_folder(folder_path: str, max_workers: Optional[int] = None, cache: Optional[ParseCache] = None, ignore_patterns: Optional[List[str]] = None) -> Dict[str, NodeInfo]:
+        """解析指定文件夹中的所有 Python 文件
         
-        return nodes_info 
\ No newline at end of file
+        Args:
+            folder_path: 要解析的文件夹路径
+            max_workers: 最大工作进程数，默认为 CPU 核心数
+            cache: 解析缓存
+            ignore_patterns: 忽略的 glob 模式，默认跳过 .git、虚拟环境等目录
+            
+        Returns:
+            Dict[str, NodeInfo]: 解析出的节点信息字典
+        """
+        file_paths = list(FileUtils.iter_python_files(folder_path, ignore_patterns))
+        return NodeParser.merge_results(NodeParser.parse_files(file_paths, max_workers, cache, root=folder_path))
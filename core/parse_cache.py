@@ -0,0 +1,147 @@
+"""
+解析缓存模块
+按文件路径、大小、修改时间和内容哈希缓存单个文件的模块摘要
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from typing import Dict, Optional
+from .file_utils import FileUtils
+
+# 解析逻辑变化时递增，旧缓存会整体失效
+CACHE_VERSION = 2
+
+
+class ParseCache:
+    """解析结果缓存类
+
+    缓存保存在 JSON 文件中，每个条目记录文件大小、修改时间、内容哈希和
+    模块摘要（ModuleSummary.to_dict 的返回值）。大小和修改时间一致时直接命中；
+    不一致时再比较内容哈希，避免 git 检出等只改变修改时间的情况重新解析。
+    只读的命中不会使缓存需要保存，最近使用时间随其他修改或淘汰时一起写入。
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 20000):
+        """初始化解析缓存
+
+        Args:
+            cache_dir: 缓存目录
+            max_entries: 最多保留的条目数，超出时淘汰最久未使用的条目
+        """
+        self.cache_file = os.path.join(cache_dir, "parse_cache.json")
+        self.max_entries = max_entries
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        """从磁盘加载缓存"""
+        if not os.path.exists(self.cache_file):
+            return
+
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data.get("entries", {})
+            else:
+                logging.info("解析缓存版本已变化，丢弃旧缓存")
+        except Exception as e:
+            logging.error(f"加载解析缓存失败: {str(e)}")
+            self.entries = {}
+
+    @staticmethod
+    def _hash_file(file_path: str) -> str:
+        """计算文件内容哈希"""
+        with open(file_path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    def get(self, file_path: str) -> Optional[Dict]:
+        """查找文件的缓存解析结果
+
+        Args:
+            file_path: Python 文件路径
+
+        Returns:
+            Optional[Dict]: 命中时返回模块摘要，否则返回 None
+        """
+        key = os.path.abspath(file_path)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        try:
+            stat = os.stat(key)
+            if entry["size"] != stat.st_size:
+                self.misses += 1
+                return None
+            if entry["mtime"] != stat.st_mtime_ns:
+                # 修改时间变化但内容可能相同
+                if entry["hash"] != self._hash_file(key):
+                    self.misses += 1
+                    return None
+                entry["mtime"] = stat.st_mtime_ns
+                self._dirty = True
+        except OSError:
+            self.misses += 1
+            return None
+
+        # 只在内存中更新使用时间，供本次运行淘汰时参考
+        entry["used"] = time.time()
+        self.hits += 1
+        return entry["module"]
+
+    def put(self, file_path: str, module: Dict) -> None:
+        """写入文件的模块摘要
+
+        Args:
+            file_path: Python 文件路径
+            module: ModuleSummary.to_dict 的返回值
+        """
+        key = os.path.abspath(file_path)
+        try:
+            stat = os.stat(key)
+            self.entries[key] = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+                "hash": self._hash_file(key),
+                "used": time.time(),
+                "module": module
+            }
+            self._dirty = True
+        except OSError as e:
+            logging.debug(f"无法缓存文件 {file_path}: {str(e)}")
+
+    def prune(self) -> None:
+        """淘汰已删除文件的条目，并把条目数限制在 max_entries 以内"""
+        stale = [key for key in self.entries if not os.path.exists(key)]
+        for key in stale:
+            del self.entries[key]
+
+        overflow = len(self.entries) - self.max_entries
+        if overflow > 0:
+            oldest = sorted(self.entries, key=lambda k: self.entries[k].get("used", 0))[:overflow]
+            for key in oldest:
+                del self.entries[key]
+
+        if stale or overflow > 0:
+            self._dirty = True
+
+    def save(self) -> None:
+        """淘汰过期条目后保存缓存"""
+        self.prune()
+        if not self._dirty:
+            return
+
+        try:
+            FileUtils.save_json({"version": CACHE_VERSION, "entries": self.entries}, self.cache_file, compact=True)
+            self._dirty = False
+            logging.info(f"解析缓存已保存: 命中 {self.hits}，未命中 {self.misses}")
+        except Exception as e:
+            logging.error(f"保存解析缓存失败: {str(e)}")
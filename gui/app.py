@@ -10,18 +10,23 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import logging
-from core.file_handler import FileHandler
-from core.node_parser import NodeParser
 from core.config_manager import ConfigManager
+from core.parse_cache import ParseCache
 import json
 from translation_service.translation_service import TranslationService
-import asyncio
+from translation_service.translation_memory import TranslationMemory
+from translation_service.job_journal import JobJournal
+from translation_service.token_budget import ModelLimits, get_tokenizer
+from translation_service.pipeline import TranslationPipeline, PipelineEvent, EventQueue
+from gui.log_panel import LogPanel
 import threading
-import nest_asyncio
-import shutil
 
-# 初始化 nest_asyncio 以支持嵌套事件循环
-nest_asyncio.apply()
+# 界面处理工作线程事件的间隔（毫秒）
+EVENT_POLL_MS = 100
+# 每次最多处理的事件数，大量日志涌入时界面仍能及时响应
+EVENT_BATCH = 500
+# 一次最多弹出的错误条数
+MAX_ERRORS_SHOWN = 5
 
 class App:
     """GUI 应用程序类"""
@@ -30,13 +35,32 @@ def __init__(self, master):
         """初始化应用"""
         self.master = master
         self.folders = []  # 存储选择的文件夹路径
-        self.is_stopped = False  # 翻译停止标志
-        self.loop = asyncio.new_event_loop()  # 创建事件循环
         self.translation_mode = tk.StringVar(value='chinese_only')  # 默认选择中文翻译
+        self.incremental = tk.BooleanVar(value=False)  # 增量翻译，只翻译新增或变化的字段
         
         # 初始化配置管理器
         self.config_manager = ConfigManager()
         
+        # 初始化解析缓存，未修改的文件不再重复解析
+        self.parse_cache = ParseCache(self.config_manager.config_dir)
+        self.ignore_patterns = None  # 扫描时忽略的 glob 模式，None 表示使用默认规则
+        self.translation_options = {}  # 翻译服务的并发数、批次大小、重试次数等可选设置
+        self.translation_service = None  # 长期复用的翻译服务
+        self._service_key = None  # 创建翻译服务时使用的配置
+        self._service_lock = threading.Lock()
+        self.pipeline = None  # 当前运行的翻译流程，翻译线程发出 finished 事件后清空
+        self.events = EventQueue()  # 工作线程发往界面的事件
+        
+        # 初始化翻译记忆，已翻译过的词条不再重复请求
+        self.translation_memory = TranslationMemory(
+            os.path.join(self.config_manager.config_dir, "translation_memory.db")
+        )
+        
+        # 初始化任务日志，中断的翻译可以从已完成的单元继续
+        self.job_journal = JobJournal(
+            os.path.join(self.config_manager.config_dir, "translation_journal.jsonl")
+        )
+        
         # 设置窗口样式
         self.setup_styles()
         
@@ -55,6 +79,9 @@ def __init__(self, master):
         # 加载配置
         self.load_config()
         
+        # 定时处理工作线程发来的事件
+        self.master.after(EVENT_POLL_MS, self._drain_events)
+        
     def setup_window(self):
         """设置主窗口"""
         self.master.title("ComfyUI 节点翻译工具 - By OLDX")
@@ -178,18 +205,9 @@ def setup_log_section(self, parent):
         log_frame.grid_columnconfigure(0, weight=1)
         log_frame.grid_rowconfigure(0, weight=1)
         
-        # 日志文本框
-        self.log_text = tk.Text(
-            log_frame,
-            height=8,
-            font=('微软雅黑', 9),
-            wrap=tk.WORD
-        )
-        scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
-        self.log_text.configure(yscrollcommand=scrollbar.set)
-        
-        self.log_text.grid(row=0, column=0, sticky='nsew', padx=(0, 2))
-        scrollbar.grid(row=0, column=1, sticky='ns')
+        # 有行数上限的日志面板
+        self.log_panel = LogPanel(log_frame)
+        self.log_panel.grid(row=0, column=0, sticky='nsew')
         
     def setup_action_section(self, parent):
         """设置操作区域"""
@@ -201,12 +219,13 @@ def setup_action_section(self, parent):
         btn_frame = ttk.Frame(action_frame)
         btn_frame.grid(row=0, column=1, sticky='e')
         
-        ttk.Button(
+        self.parse_btn = ttk.Button(
             btn_frame,
             text="开始解析",
             command=self.start_parse,
             style='Primary.TButton'
-        ).pack(side=tk.LEFT, padx=5)
+        )
+        self.parse_btn.pack(side=tk.LEFT, padx=5)
         
         self.translate_btn = ttk.Button(
             btn_frame,
@@ -261,14 +280,105 @@ def clear_folders(self):
                 
     def start_parse(self):
         """开始解析节点"""
-        if self.translation_mode.get() == 'global_translation':
-            self._parse_global_translation()
-        else:
-            self._parse_chinese_only()
-
-    def run_translation(self):
-        """在新线程中运行翻译任务"""
-        asyncio.run(self.start_translation())
+        if not self.folders:
+            messagebox.showwarning("警告", "请先添加文件夹！")
+            return
+            
+        self.parse_btn.configure(state='disabled')
+        
+        # 在新线程中运行解析，避免阻塞界面
+        folders = list(self.folders)
+        global_mode = self.translation_mode.get() == 'global_translation'
+        threading.Thread(target=self._run_parse_thread, args=(folders, global_mode), daemon=True).start()
+        
+    def _run_parse_thread(self, folders: list, global_mode: bool):
+        """在新线程中运行解析操作
+        
+        Args:
+            folders: 要解析的文件夹列表
+            global_mode: 是否为全球化翻译模式
+        """
+        try:
+            self._create_pipeline().parse(folders, global_mode)
+            # 所有文件夹解析完成后弹出提示
+            self._post("info", f"成功解析 {len(folders)} 个文件夹！")
+        except Exception as e:
+            self._post("error", f"解析过程出错: {str(e)}")
+        finally:
+            self._post("finished", stage="parse")
+            
+    def _create_pipeline(self, incremental: bool = False) -> TranslationPipeline:
+        """创建使用当前设置的处理流程，流程事件发送到界面的事件队列
+        
+        Args:
+            incremental: 是否增量翻译
+        """
+        return TranslationPipeline(
+            self.events.put, self.parse_cache, self.ignore_patterns, self.job_journal,
+            incremental=incremental
+        )
+        
+    def _post(self, kind: str, message: str = "", **data):
+        """从工作线程向界面发送事件
+        
+        Args:
+            kind: 事件类型
+            message: 事件消息
+            **data: 事件数据
+        """
+        self.events.put(PipelineEvent(kind, message, data))
+            
+    def _post_log(self, message: str):
+        """从工作线程向界面投递日志消息
+        
+        Args:
+            message: 日志消息
+        """
+        self._post("log", message)
+        
+    def _drain_events(self):
+        """在界面线程中批量处理事件
+        
+        每次最多处理 EVENT_BATCH 个事件，日志合并为一次插入；同一任务的多条进度
+        只保留最新一条，同一批次的错误合并为一个提示框。
+        """
+        try:
+            entries = []
+            progress_lines = {}  # (文件夹, 语言) 到进度行在 entries 中的位置
+            errors = []
+            infos = []
+            for event in self.events.drain(EVENT_BATCH):
+                if event.kind == "progress":
+                    key = (event.data.get("folder"), event.data.get("lang"))
+                    if key in progress_lines:
+                        entries[progress_lines[key]] = (event.level, event.message)
+                        continue
+                    progress_lines[key] = len(entries)
+                if event.kind == "info":
+                    infos.append(event.message)
+                    continue
+                if event.message:
+                    entries.append((event.level, event.message))
+                if event.kind == "error":
+                    errors.append(event.message)
+                elif event.kind == "finished":
+                    if event.data.get("stage") == "parse":
+                        self.parse_btn.configure(state='normal')
+                    else:
+                        self.pipeline = None
+                        self._reset_translation_buttons()
+            
+            if entries:
+                self.log_messages(entries)
+            if errors:
+                error_msg = "\n".join(errors[:MAX_ERRORS_SHOWN])
+                if len(errors) > MAX_ERRORS_SHOWN:
+                    error_msg += f"\n……共 {len(errors)} 个错误，详见日志"
+                messagebox.showerror("错误", error_msg)
+            for info in infos:
+                messagebox.showinfo("成功", info)
+        finally:
+            self.master.after(EVENT_POLL_MS, self._drain_events)
 
     def open_results_folder(self):
         """打开检测结果文件夹"""
@@ -296,240 +406,98 @@ def start_translation(self):
             messagebox.showwarning("警告", "请填写 API Key 和 Model ID！")
             return
         
-        self.is_stopped = False
+        # 相同模式、相同文件夹的上次运行未完成时，询问是否继续
+        mode = self.translation_mode.get()
+        global_mode = mode == 'global_translation'
+        resume = False
+        pending = self.job_journal.pending_run()
+        if pending and pending.get("mode") == mode and pending.get("folders") == self.folders:
+            resume = messagebox.askyesno("继续翻译", "检测到上次未完成的翻译任务，是否从中断处继续？\n选择“否”将重新开始。")
+        
+        # 每次运行使用新的处理流程，终止标志只属于本次运行
+        self.pipeline = self._create_pipeline(self.incremental.get())
         self.translate_btn.configure(state='disabled')
         self.stop_btn.configure(state='normal')
         
         # 在新线程中运行翻译操作
-        threading.Thread(target=self._run_translation_thread, daemon=True).start()
+        folders = list(self.folders)
+        threading.Thread(
+            target=self._run_translation_thread,
+            args=(self.pipeline, api_key, model_id, folders, global_mode, resume),
+            daemon=True
+        ).start()
 
-    def _run_translation_thread(self):
-        """在新线程中运行翻译操作"""
+    def _run_translation_thread(self, pipeline: TranslationPipeline, api_key: str, model_id: str, folders: list, global_mode: bool, resume: bool = False):
+        """在新线程中运行翻译操作
+        
+        结束时发送 finished 事件，界面收到后才恢复开始按钮，同一时间只有一次运行。
+        
+        Args:
+            pipeline: 本次运行的处理流程
+            api_key: API 密钥
+            model_id: 模型 ID
+            folders: 要翻译的文件夹列表
+            global_mode: 是否为全球化翻译模式
+            resume: 是否从任务日志继续上次未完成的运行
+        """
         try:
-            api_key = self.api_key_entry.get()
-            model_id = self.model_id_entry.get()
-            
-            # 遍历所有文件夹
-            for folder in self.folders:
-                if self.is_stopped:
-                    self.log_message("翻译任务已终止")
-                    break
-                
-                self.log_message(f"\n开始处理文件夹: {folder}")
-                
-                # 获取中文版本的路径
-                zh_path = os.path.join(folder, "locales", "zh", "nodeDefs.json")
-                if not os.path.exists(zh_path):
-                    self.log_message(f"错误：未找到文件: {zh_path}")
-                    continue
-
-                # 读取原始文件
-                with open(zh_path, 'r', encoding='utf-8') as f:
-                    json_data = json.load(f)
-
-                if self.translation_mode.get() == 'global_translation':
-                    # 全球化翻译模式
-                    self.log_message("\n开始全球化翻译流程...")
-                    
-                    # 第1步：复制文件
-                    shutil.copy(zh_path, os.path.join(folder, "locales", "zh", "ru_nodeDefs.json"))
-                    if self.is_stopped:
-                        self.log_message("翻译任务已终止")
-                        break
-                    shutil.copy(zh_path, os.path.join(folder, "locales", "zh", "ja_nodeDefs.json"))
-                    if self.is_stopped:
-                        self.log_message("翻译任务已终止")
-                        break
-                    shutil.copy(zh_path, os.path.join(folder, "locales", "zh", "ko_nodeDefs.json"))
-                    if self.is_stopped:
-                        self.log_message("翻译任务已终止")
-                        break
-                    shutil.copy(zh_path, os.path.join(folder, "locales", "zh", "fr_nodeDefs.json"))
-                    if self.is_stopped:
-                        self.log_message("翻译任务已终止")
-                        break
-                    self.log_message("已复制 nodeDefs.json 到各语言文件")
-                    
-                    # 第2步：按顺序提交翻译
-                    languages = [
-                        ("zh", "system_prompt_text.txt"),
-                        ("ru", "system_prompt_text_ru.txt"),
-                        ("ja", "system_prompt_text_ja.txt"),
-                        ("ko", "system_prompt_text_ko.txt"),
-                        ("fr", "system_prompt_text_fr.txt")
-                    ]
-                    
-                    for lang, prompt_file in languages:
-                        if self.is_stopped:
-                            self.log_message("翻译任务已终止")
-                            break
-                        try:
-                            # 重新初始化翻译服务
-                            translation_service = TranslationService(api_key, model_id)
-                            self.log_message(f"\n开始 {lang} 翻译...")
-                            
-                            # 重新加载提示词
-                            current_prompt = self.reload_prompt(lang)
-                            if not current_prompt:
-                                self.log_message(f"错误：{lang} 提示词为空，跳过此语言")
-                                continue
-                            
-                            # 打印当前提示词到终端
-                            self.log_message(f"当前 {lang} 提示词内容预览: {current_prompt[:200]}...")
-                            
-                            # 获取对应的文件路径
-                            target_file = "nodeDefs.json" if lang == "zh" else f"{lang}_nodeDefs.json"
-                            target_path = os.path.join(folder, "locales", "zh", target_file)
-                            
-                            # 读取目标文件
-                            with open(target_path, 'r', encoding='utf-8') as f:
-                                target_data = json.load(f)
-                            
-                            # 执行翻译
-                            success, translated_data = asyncio.run(
-                                translation_service.translate(target_data, current_prompt)
-                            )
-                            
-                            if success and translated_data:
-                                # 保存翻译结果
-                                with open(target_path, 'w', encoding='utf-8') as f:
-                                    json.dump(translated_data, f, ensure_ascii=False, indent=2)
-                                self.log_message(f"{lang} 翻译完成，已保存到: {target_path}")
-                            else:
-                                self.log_message(f"{lang} 翻译失败")
-                                
-                        except Exception as e:
-                            self.log_message(f"{lang} 翻译过程中出错: {str(e)}")
-                            continue
-                            
-                    self.log_message("\n全球化翻译完成！")
-                    
-                    # 第3步：将翻译后的文件复制到对应的语言目录
-                    self.log_message("\n开始复制翻译文件到对应语言目录...")
-                    languages = ["ru", "ja", "ko", "fr"]
-                    for lang in languages:
-                        if self.is_stopped:
-                            self.log_message("文件复制任务已终止")
-                            break
-                            
-                        try:
-                            # 源文件和目标文件路径
-                            source_file = os.path.join(folder, "locales", "zh", f"{lang}_nodeDefs.json")
-                            target_dir = os.path.join(folder, "locales", lang)
-                            target_file = os.path.join(target_dir, "nodeDefs.json")
-                            
-                            # 确保目标目录存在
-                            os.makedirs(target_dir, exist_ok=True)
-                            
-                            # 复制文件
-                            shutil.copy2(source_file, target_file)
-                            self.log_message(f"已将 {lang} 的翻译结果复制到: {target_file}")
-                            
-                        except Exception as e:
-                            self.log_message(f"复制 {lang} 翻译文件时出错: {str(e)}")
-                            continue
-                    
-                    self.log_message("\n所有翻译文件复制完成！")
-                    
-                    # 第4步：清理临时翻译文件
-                    self.log_message("\n开始清理临时翻译文件...")
-                    temp_files = ["ru_nodeDefs.json", "ja_nodeDefs.json", "ko_nodeDefs.json", "fr_nodeDefs.json"]
-                    for temp_file in temp_files:
-                        if self.is_stopped:
-                            self.log_message("清理任务已终止")
-                            break
-                            
-                        try:
-                            temp_file_path = os.path.join(folder, "locales", "zh", temp_file)
-                            if os.path.exists(temp_file_path):
-                                os.remove(temp_file_path)
-                                self.log_message(f"已删除临时文件: {temp_file}")
-                        except Exception as e:
-                            self.log_message(f"删除临时文件 {temp_file} 时出错: {str(e)}")
-                            continue
-                    
-                    self.log_message("\n临时文件清理完成！")
-                    
-                else:
-                    # 仅中文翻译模式
-                    try:
-                        self.log_message("\n开始中文翻译...")
-                        current_prompt = self.reload_prompt("zh")
-                        if not current_prompt:
-                            self.log_message("错误：中文提示词为空，终止翻译")
-                            continue
-                            
-                        self.log_message(f"提示词内容预览: {current_prompt[:200]}...")
-                        
-                        # 初始化翻译服务
-                        translation_service = TranslationService(api_key, model_id)
-                        
-                        # 执行翻译
-                        success, translated_data = asyncio.run(
-                            translation_service.translate(json_data, current_prompt)
-                        )
-                        
-                        if success and translated_data:
-                            # 保存翻译结果
-                            with open(zh_path, 'w', encoding='utf-8') as f:
-                                json.dump(translated_data, f, ensure_ascii=False, indent=2)
-                            self.log_message(f"中文翻译完成，已保存到: {zh_path}")
-                        else:
-                            self.log_message("中文翻译失败")
-                            
-                    except Exception as e:
-                        self.log_message(f"中文翻译过程中出错: {str(e)}")
-                
+            translation_service = self._get_translation_service(api_key, model_id)
+            if not pipeline.is_stopped:
+                pipeline.translate(translation_service, folders, global_mode, resume)
         except Exception as e:
-            error_msg = f"翻译过程中发生错误: {str(e)}"
-            self.master.after(0, lambda: self.log_message(error_msg))
-            self.master.after(0, lambda: messagebox.showerror("错误", error_msg))
+            self._post("error", f"翻译过程中发生错误: {str(e)}")
         finally:
-            self.is_stopped = True
-            self.master.after(0, self._reset_translation_buttons)
+            self._post("finished", stage="translate")
 
-    def reload_prompt(self, lang: str) -> str:
-        """加载指定语言的提示词
+    def _get_translation_service(self, api_key: str, model_id: str) -> TranslationService:
+        """获取长期复用的翻译服务
         
-        Args:
-            lang: 语言代码
+        API 配置不变时复用同一个服务及其连接池，配置变化时关闭旧服务并重新创建。
+        只有翻译线程调用此方法。开始按钮在上一次运行的翻译线程发出 finished 事件、
+        界面处理该事件之前一直不可用（终止翻译也不会提前恢复），因此关闭旧服务时
+        不会有运行中的翻译在使用它；API 测试使用独立的临时服务。
         
+        Args:
+            api_key: API 密钥
+            model_id: 模型 ID
+            
         Returns:
-            str: 提示词内容
+            TranslationService: 翻译服务
         """
-        if lang == "zh":
-            import importlib
-            import prompts.system_prompts
-            importlib.reload(prompts.system_prompts)
-            from prompts.system_prompts import SYSTEM_PROMPT
-            self.log_message("已重新加载中文提示词")
-            return SYSTEM_PROMPT
-        else:
-            prompt_file = f"system_prompt_text_{lang}.txt"
-            prompt_path = os.path.join("prompts", prompt_file)
-            try:
-                with open(prompt_path, 'r', encoding='utf-8') as f:
-                    current_prompt = f.read().strip()
-                self.log_message(f"已加载 {lang} 提示词")
-                return current_prompt
-            except Exception as e:
-                self.log_message(f"加载 {lang} 提示词失败: {str(e)}")
-                return ""
+        service_key = (api_key.strip(), model_id, tuple(sorted(self.translation_options.items())))
+        with self._service_lock:
+            if self.translation_service is None or self._service_key != service_key:
+                if self.translation_service is not None:
+                    self.translation_service.close()
+                self.translation_service = TranslationService(
+                    api_key, model_id, memory=self.translation_memory, **self.translation_options
+                )
+                self._service_key = service_key
+            return self.translation_service
 
     def _reset_translation_buttons(self):
         """重置翻译相关按钮状态"""
         self.translate_btn.configure(state='normal')
         self.stop_btn.configure(state='disabled')
 
-    def log_message(self, message: str):
+    def log_message(self, message: str, level: int = logging.INFO):
         """添加日志消息
         
         Args:
             message: 日志消息
+            level: logging 级别
+        """
+        self.log_messages([(level, message)])
+        
+    def log_messages(self, entries: list):
+        """一次添加多条日志消息，只插入和滚动一次
+        
+        Args:
+            entries: (级别, 消息) 列表
         """
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)  # 滚动到最后一行
-        logging.info(message)
+        self.log_panel.append(entries)
+        for level, message in entries:
+            logging.log(level, message)
 
     def save_config(self):
         """保存配置"""
@@ -554,6 +522,17 @@ def load_config(self):
             # 插入配置值
             self.api_key_entry.insert(0, config.get("api_key", "").strip())
             self.model_id_entry.insert(0, config.get("model_id", "").strip())
+            self.ignore_patterns = config.get("ignore_patterns")
+            self.translation_options = {
+                key: config[key] for key in ("max_concurrency", "batch_tokens", "max_retries") if key in config
+            }
+            self.translation_options["limits"] = ModelLimits.from_config(config)
+            self.translation_options["tokenizer"] = get_tokenizer(config.get("tokenizer"))
+            self.incremental.set(bool(config.get("incremental", False)))
+            if "log_max_lines" in config:
+                self.log_panel.set_max_lines(config["log_max_lines"])
+            if config.get("log_file"):
+                self.log_panel.enable_file(os.path.join(self.config_manager.config_dir, "logs", "translator.log"))
             logging.info("已加载配置")
 
     def test_api(self):
@@ -577,28 +556,29 @@ def _run_api_test(self, api_key: str, model_id: str):
             api_key: API 密钥
             model_id: 模型 ID
         """
+        # 使用临时服务，不替换也不关闭翻译中可能正在使用的共享服务
+        translation_service = None
         try:
-            # 初始化翻译服务
-            translation_service = TranslationService(api_key, model_id)
+            translation_service = TranslationService(api_key, model_id, **self.translation_options)
             
             # 准备测试数据
             test_data = {"test": "Who are you?"}
             
             # 执行测试
-            result = self.loop.run_until_complete(translation_service.translate_batch(test_data))
+            success, result = translation_service.run(translation_service.translate_batch(list(test_data.values())))
             
-            if result:
-                self.master.after(0, lambda: self.log_message("API 测试成功！"))
-                self.master.after(0, lambda: self.log_message(f"API 响应: {json.dumps(result, ensure_ascii=False)}"))
-                self.master.after(0, lambda: messagebox.showinfo("成功", "API 连接测试成功！"))
+            if success and result:
+                self._post_log("API 测试成功！")
+                self._post_log(f"API 响应: {json.dumps(result, ensure_ascii=False)}")
+                self._post("info", "API 连接测试成功！")
             else:
-                self.master.after(0, lambda: self.log_message("API 测试失败：未收到有效响应"))
-                self.master.after(0, lambda: messagebox.showerror("错误", "API 测试失败：未收到有效响应"))
+                self._post("error", "API 测试失败：未收到有效响应")
                 
         except Exception as e:
-            error_msg = f"API 测试失败: {str(e)}"
-            self.master.after(0, lambda: self.log_message(error_msg))
-            self.master.after(0, lambda: messagebox.showerror("错误", error_msg))
+            self._post("error", f"API 测试失败: {str(e)}")
+        finally:
+            if translation_service is not None:
+                translation_service.close()
 
     def setup_translation_mode_section(self, parent):
         """设置翻译模式选择区域"""
@@ -609,109 +589,16 @@ def setup_translation_mode_section(self, parent):
         ttk.Radiobutton(mode_frame, text="仅中文翻译", variable=self.translation_mode, value='chinese_only').grid(row=0, column=0, padx=5, sticky='w')
         # 全球化翻译选项
         ttk.Radiobutton(mode_frame, text="全球化翻译", variable=self.translation_mode, value='global_translation').grid(row=0, column=1, padx=5, sticky='w')
-
-    def _parse_global_translation(self):
-        """解析全局翻译"""
-        try:
-            # 1. 首先按照 V1 的逻辑生成 zh/nodeDefs.json
-            self._parse_chinese_only()  # 调用原有的中文解析逻辑
-            
-            # 2. 定义其他语言列表
-            other_languages = ["ru", "ko", "ja", "fr", "en"]
-            
-            # 3. 遍历所有文件夹
-            for folder in self.folders:
-                # 获取中文版本的 nodeDefs.json 路径
-                zh_nodeDefs_path = os.path.join(folder, "locales", "zh", "nodeDefs.json")
-                
-                # 确保中文版本存在
-                if not os.path.exists(zh_nodeDefs_path):
-                    self.log_message(f"错误：未找到中文版本的 nodeDefs.json: {zh_nodeDefs_path}")
-                    continue
-                    
-                # 4. 为其他语言创建目录并复制文件
-                for lang_code in other_languages:
-                    try:
-                        # 创建语言目录
-                        lang_dir = os.path.join(folder, "locales", lang_code)
-                        os.makedirs(lang_dir, exist_ok=True)
-                        
-                        # 复制中文版本到该语言目录
-                        target_path = os.path.join(lang_dir, "nodeDefs.json")
-                        shutil.copy2(zh_nodeDefs_path, target_path)
-                        
-                        self.log_message(f"已创建 {lang_code} 语言文件: {target_path}")
-                    except Exception as e:
-                        self.log_message(f"处理 {lang_code} 语言时出错: {str(e)}")
-            
-            self.log_message("全球化翻译文件生成完成！")
-        except Exception as e:
-            error_msg = f"全球化翻译处理出错: {str(e)}"
-            self.log_message(error_msg)
-            messagebox.showerror("错误", error_msg)
-
-    def _parse_chinese_only(self):
-        """解析中文翻译"""
-        if not self.folders:
-            messagebox.showwarning("警告", "请先添加文件夹！")
-            return
-            
-        total_folders = len(self.folders)
-        for folder in self.folders:
-            try:
-                self.log_message(f"开始解析文件夹: {folder}")
-                
-                # 扫描 Python 文件
-                python_files = FileHandler.scan_plugin_folder(folder)
-                self.log_message(f"找到 {len(python_files)} 个 Python 文件")
-                
-                # 解析每个文件
-                all_nodes = {}
-                for file_path in python_files:
-                    try:
-                        nodes = NodeParser.parse_file(file_path)
-                        if nodes:
-                            all_nodes.update(nodes)
-                    except Exception as e:
-                        self.log_message(f"解析文件失败 {file_path}: {str(e)}")
-                
-                if all_nodes:
-                    # 保存节点信息
-                    output_file = FileHandler.save_node_info(all_nodes, folder)
-                    self.log_message(f"节点信息已保存到: {output_file}")
-                    total_nodes = len(all_nodes)
-                    categories = set(node['category'] for node in all_nodes.values())
-                    self.log_message(f"总共解析到 {total_nodes} 个节点，类别: {', '.join(categories)}")
-                else:
-                    self.log_message("未找到任何节点信息")
-                
-            except Exception as e:
-                error_msg = f"处理文件夹时出错: {str(e)}"
-                self.log_message(f"错误: {error_msg}")
-                messagebox.showerror("错误", error_msg)
-                
-        # 所有文件夹解析完成后弹出提示
-        messagebox.showinfo("成功", f"成功解析 {total_folders} 个文件夹！")
-        
-        # 移除自动开始翻译的部分
-        # threading.Thread(target=self.run_translation).start()
-
-    def _generate_nodeDefs_for_language(self, folder: str, lang_code: str):
-        """为指定语言生成 nodeDefs.json 文件"""
-        node_info = NodeParser.parse_folder(folder)  # 假设有一个方法可以解析文件夹
-        output_file = os.path.join(folder, "locales", lang_code, "nodeDefs.json")
-        
-        # 保存生成的节点信息
-        FileHandler.save_node_info(node_info, output_file)
-        self.log_message(f"{lang_code} 的 nodeDefs.json 已生成: {output_file}")
+        # 增量翻译选项
+        ttk.Checkbutton(mode_frame, text="增量翻译", variable=self.incremental).grid(row=0, column=2, padx=5, sticky='w')
 
     def stop_translation(self):
-        """终止翻译任务"""
-        if not self.is_stopped:
-            self.is_stopped = True  # 设置停止标志
-            self.log_message("正在终止翻译...")
+        """终止翻译任务
+
+        只设置本次运行的终止标志，进行中的请求结束后翻译线程发出 finished 事件，
+        界面收到后才恢复开始按钮。
+        """
+        if self.pipeline is not None and not self.pipeline.is_stopped:
+            self.pipeline.stop()
             self.stop_btn.configure(state='disabled')
-            self.translate_btn.configure(state='normal')
-            
-            # 这里可以添加其他需要在停止时执行的逻辑，例如清理资源等
-            self.log_message("翻译任务已终止")
\ No newline at end of file
+            self.log_message("正在终止翻译，等待进行中的请求结束...")
\ No newline at end of file
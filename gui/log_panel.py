@@ -0,0 +1,155 @@
+"""
+日志面板模块
+行数有上限的日志显示区域，支持按级别过滤和写入滚动日志文件
+"""
+
+import os
+import logging
+import tkinter as tk
+from tkinter import ttk
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import List, Optional, Tuple
+
+# 默认最多保留的日志行数
+DEFAULT_MAX_LINES = 5000
+# 日志文件的单个文件大小上限和保留的备份数
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+
+# 级别过滤选项
+LEVEL_OPTIONS = [
+    ("全部", logging.DEBUG),
+    ("信息", logging.INFO),
+    ("警告", logging.WARNING),
+    ("错误", logging.ERROR),
+]
+
+# 日志条目: (级别, 消息)
+LogEntry = Tuple[int, str]
+
+
+class LogPanel:
+    """日志面板类
+
+    最近的 max_lines 条日志保存在环形缓冲区中，文本框中的行数同样不超过
+    max_lines，超出时从头部删除，长时间运行时内存和插入耗时保持不变。
+    切换级别过滤时从缓冲区重新生成显示内容。
+    """
+
+    def __init__(self, parent, max_lines: int = DEFAULT_MAX_LINES):
+        """初始化日志面板
+
+        Args:
+            parent: 父组件
+            max_lines: 最多保留的日志行数
+        """
+        self.max_lines = max(1, max_lines)
+        self.entries = deque(maxlen=self.max_lines)
+        self.min_level = logging.DEBUG
+        self._file_handler: Optional[RotatingFileHandler] = None
+
+        self.frame = ttk.Frame(parent)
+        self.frame.grid_columnconfigure(0, weight=1)
+        self.frame.grid_rowconfigure(1, weight=1)
+
+        # 级别过滤
+        filter_frame = ttk.Frame(self.frame)
+        filter_frame.grid(row=0, column=0, columnspan=2, sticky='e', pady=(0, 2))
+        ttk.Label(filter_frame, text="级别:").pack(side=tk.LEFT, padx=(0, 5))
+        self.level_var = tk.StringVar(value=LEVEL_OPTIONS[0][0])
+        level_box = ttk.Combobox(
+            filter_frame,
+            textvariable=self.level_var,
+            values=[name for name, _ in LEVEL_OPTIONS],
+            state='readonly',
+            width=6
+        )
+        level_box.pack(side=tk.LEFT)
+        level_box.bind('<<ComboboxSelected>>', self._on_level_changed)
+
+        # 日志文本框
+        self.text = tk.Text(
+            self.frame,
+            height=8,
+            font=('微软雅黑', 9),
+            wrap=tk.WORD
+        )
+        scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.text.yview)
+        self.text.configure(yscrollcommand=scrollbar.set)
+
+        self.text.grid(row=1, column=0, sticky='nsew', padx=(0, 2))
+        scrollbar.grid(row=1, column=1, sticky='ns')
+
+    def grid(self, **kwargs) -> None:
+        """放置面板"""
+        self.frame.grid(**kwargs)
+
+    def append(self, entries: List[LogEntry]) -> None:
+        """批量添加日志，只插入和滚动一次
+
+        Args:
+            entries: (级别, 消息) 列表
+        """
+        self.entries.extend(entries)
+        visible = [message for level, message in entries if level >= self.min_level]
+        if not visible:
+            return
+
+        # 用户向上翻看时不自动滚动到底部
+        follow = self.text.yview()[1] >= 1.0
+        self.text.insert(tk.END, "\n".join(visible[-self.max_lines:]) + "\n")
+        self._trim()
+        if follow:
+            self.text.see(tk.END)
+
+    def _trim(self) -> None:
+        """删除超出上限的最早的行"""
+        line_count = int(self.text.index('end-1c').split('.')[0]) - 1
+        overflow = line_count - self.max_lines
+        if overflow > 0:
+            self.text.delete('1.0', f'{overflow + 1}.0')
+
+    def _on_level_changed(self, event=None) -> None:
+        """切换级别过滤后重新生成显示内容"""
+        self.min_level = dict(LEVEL_OPTIONS).get(self.level_var.get(), logging.DEBUG)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """按当前过滤级别从缓冲区重新生成显示内容"""
+        self.text.delete('1.0', tk.END)
+        visible = [message for level, message in self.entries if level >= self.min_level]
+        if visible:
+            self.text.insert(tk.END, "\n".join(visible) + "\n")
+            self._trim()
+        self.text.see(tk.END)
+
+    def set_max_lines(self, max_lines: int) -> None:
+        """修改日志行数上限
+
+        Args:
+            max_lines: 最多保留的日志行数
+        """
+        self.max_lines = max(1, max_lines)
+        self.entries = deque(self.entries, maxlen=self.max_lines)
+        self.refresh()
+
+    def enable_file(self, log_path: str) -> None:
+        """把日志同时写入滚动日志文件
+
+        文件处理器挂在根日志记录器上，界面日志和各模块的日志都会写入文件。
+
+        Args:
+            log_path: 日志文件路径
+        """
+        if self._file_handler is not None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+        self._file_handler = RotatingFileHandler(
+            log_path, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, encoding='utf-8'
+        )
+        self._file_handler.setFormatter(logging.Formatter(
+            '%(asctime)s [%(levelname)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+        logging.getLogger().addHandler(self._file_handler)
+        logging.info(f"日志同时写入文件: {log_path}")
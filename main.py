@@ -7,6 +7,7 @@
 """
 
 import sys
+import logging
 import tkinter as tk
 from tkinterdnd2 import TkinterDnD, DND_FILES
 from gui.app import App
@@ -15,6 +16,13 @@ def main():
     """
     主程序入口函数
     """
+    # 配置日志
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    
     root = TkinterDnD.Tk()
     root.title("ComfyUI节点翻译工具 - By OLDX")
     app = App(root)
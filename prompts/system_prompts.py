@@ -27,5 +27,37 @@ def load_system_prompt():
         # 返回一个基本的系统提示词作为后备
         return "你是一个专业的 ComfyUI 节点翻译专家。请将提供的节点信息从英文翻译成中文，保持 JSON 格式不变。"
 
+# 各语言对应的提示词文件
+PROMPT_FILES = {
+    "zh": "system_prompt_text.txt",
+    "ru": "system_prompt_text_ru.txt",
+    "ja": "system_prompt_text_ja.txt",
+    "ko": "system_prompt_text_ko.txt",
+    "fr": "system_prompt_text_fr.txt",
+}
+
+def load_language_prompt(lang):
+    """加载指定语言的提示词
+    
+    Args:
+        lang: 语言代码
+        
+    Returns:
+        str: 提示词内容，加载失败时返回空字符串
+    """
+    if lang == "zh":
+        return load_system_prompt()
+        
+    try:
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        prompt_file = os.path.join(current_dir, PROMPT_FILES.get(lang, f"system_prompt_text_{lang}.txt"))
+        
+        with open(prompt_file, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+            
+    except Exception as e:
+        logging.error(f"加载 {lang} 提示词失败: {str(e)}")
+        return ""
+
 # 加载系统提示词
 SYSTEM_PROMPT = load_system_prompt() 
\ No newline at end of file
@@ -0,0 +1,9 @@
+"""
+测试配置
+把项目根目录加入模块搜索路径，测试可以直接导入 core 和 translation_service
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
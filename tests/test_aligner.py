@@ -0,0 +1,57 @@
+"""
+翻译结果对齐的测试
+"""
+
+from translation_service.aligner import align_translations
+
+
+def test_source_containing_arrow():
+    """原文包含箭头时按完整的原文键对齐，不在第一个箭头处拆分"""
+    result = align_translations(
+        ["Latent -> Image", "Latent"],
+        ["Latent -> Image -> 潜空间 -> 图像", "Latent -> 潜空间"]
+    )
+    assert result.translations == {"Latent -> Image": "潜空间 -> 图像", "Latent": "潜空间"}
+    assert result.missing == []
+
+
+def test_translation_containing_arrow():
+    """译文包含箭头时，第一个能匹配原文的拆分之后的内容都是译文"""
+    result = align_translations(["x"], ["x -> 甲 -> 乙"])
+    assert result.translations == {"x": "甲 -> 乙"}
+
+
+def test_reordered_lines():
+    """响应行顺序被打乱时按原文键对齐"""
+    result = align_translations(["image", "mask", "seed"], ["seed -> 种子", "image -> 图像", "mask -> 遮罩"])
+    assert result.translations == {"image": "图像", "mask": "遮罩", "seed": "种子"}
+    assert result.missing == []
+
+
+def test_missing_lines():
+    """被遗漏的词条列入 missing，其余词条仍能对应"""
+    result = align_translations(["image", "mask", "seed"], ["image -> 图像", "seed -> 种子"])
+    assert result.translations == {"image": "图像", "seed": "种子"}
+    assert result.missing == ["mask"]
+
+
+def test_bulleted_lines():
+    """去掉行首的列表符号或编号后匹配"""
+    result = align_translations(["image", "mask"], ["· image -> 图像", "2. mask -> 遮罩"])
+    assert result.translations == {"image": "图像", "mask": "遮罩"}
+
+
+def test_loose_key_and_trailing_punctuation():
+    """忽略大小写和空白差异，去掉模型追加的行尾标点"""
+    result = align_translations(["Load  Image"], ["load image -> 加载图像，"])
+    assert result.translations == {"Load  Image": "加载图像"}
+
+
+def test_positional_fallback():
+    """原文键被翻译时，行数一致则按位置对应"""
+    result = align_translations(["image", "mask"], ["图像 -> 图像", "mask -> 遮罩"])
+    assert result.translations == {"image": "图像", "mask": "遮罩"}
+
+    result = align_translations(["image", "mask", "seed"], ["图像 -> 图像", "mask -> 遮罩"])
+    assert result.missing == ["image", "seed"]
+    assert result.unmatched_lines == ["图像 -> 图像"]
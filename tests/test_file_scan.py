@@ -0,0 +1,78 @@
+"""
+Python 文件扫描和 .gitignore 规则的测试
+"""
+
+import os
+
+from core.file_utils import FileUtils
+
+
+def _make(root, files):
+    for relative, content in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+
+def _scan(root, **kwargs):
+    return [os.path.relpath(path, root).replace(os.sep, "/") for path in FileUtils.iter_python_files(str(root), **kwargs)]
+
+
+def test_default_patterns_and_virtualenv(tmp_path):
+    _make(tmp_path, {
+        "b.py": "",
+        "a.py": "",
+        "notes.txt": "",
+        "pkg/mod.py": "",
+        ".git/hook.py": "",
+        "__pycache__/cached.py": "",
+        "demo.egg-info/setup.py": "",
+        "env/pyvenv.cfg": "",
+        "env/lib/site.py": "",
+    })
+    # 每个目录先输出其中的文件再进入子目录，同级按名称排序
+    assert _scan(tmp_path) == ["a.py", "b.py", "pkg/mod.py"]
+
+
+def test_custom_ignore_globs_replace_defaults(tmp_path):
+    _make(tmp_path, {"node.py": "", "test_node.py": "", "__pycache__/cached.py": ""})
+    assert _scan(tmp_path, ignore_patterns=["test_*"]) == ["node.py", "__pycache__/cached.py"]
+
+
+def test_gitignore_glob_and_negation(tmp_path):
+    _make(tmp_path, {
+        ".gitignore": "# 注释\n*_gen.py\n!keep_gen.py\n",
+        "node.py": "",
+        "auto_gen.py": "",
+        "keep_gen.py": "",
+        "sub/other_gen.py": "",
+    })
+    assert _scan(tmp_path) == ["keep_gen.py", "node.py"]
+    assert "auto_gen.py" in _scan(tmp_path, use_gitignore=False)
+
+
+def test_gitignore_directory_patterns(tmp_path):
+    _make(tmp_path, {
+        ".gitignore": "build/\n!build/keep.py\n/docs/*.py\n",
+        "build.py": "",
+        "build/out.py": "",
+        "build/keep.py": "",
+        "src/build/deep.py": "",
+        "docs/conf.py": "",
+        "src/docs/page.py": "",
+    })
+    # 目录被忽略后其中的文件不能再被取反规则包含，与 git 一致
+    assert _scan(tmp_path) == ["build.py", "src/docs/page.py"]
+
+
+def test_nested_gitignore_applies_to_its_subtree(tmp_path):
+    _make(tmp_path, {
+        ".gitignore": "*_local.py\n",
+        "a_local.py": "",
+        "sub/.gitignore": "!b_local.py\nextra.py\n",
+        "sub/b_local.py": "",
+        "sub/c_local.py": "",
+        "sub/extra.py": "",
+        "extra.py": "",
+    })
+    assert _scan(tmp_path) == ["extra.py", "sub/b_local.py"]
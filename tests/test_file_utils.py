@@ -0,0 +1,69 @@
+"""
+JSON 原子写入的测试
+"""
+
+import os
+import json
+
+from core import file_utils
+from core.file_utils import FileUtils
+
+
+def _temp_files(directory):
+    return [name for name in os.listdir(directory) if name.endswith(".tmp")]
+
+
+def test_creates_file(tmp_path):
+    path = tmp_path / "sub" / "data.json"
+    assert FileUtils.save_json({"a": "图像"}, str(path)) is True
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": "图像"}
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    """内容相同时不写入，文件保持原样"""
+    path = tmp_path / "data.json"
+    FileUtils.save_json({"a": 1, "b": [1, 2]}, str(path))
+    mtime = os.stat(path).st_mtime_ns
+    inode = os.stat(path).st_ino
+
+    assert FileUtils.save_json({"a": 1, "b": [1, 2]}, str(path)) is False
+    assert os.stat(path).st_mtime_ns == mtime
+    assert os.stat(path).st_ino == inode
+    assert _temp_files(tmp_path) == []
+
+
+def test_new_content_is_prefix_of_existing(tmp_path):
+    """新内容是已有文件的前缀（文件变短）时仍然重写"""
+    path = tmp_path / "data.json"
+    path.write_text('"abcdef"', encoding="utf-8")
+    assert FileUtils.save_json("abc", str(path), compact=True) is True
+    assert path.read_text(encoding="utf-8") == '"abc"'
+    assert _temp_files(tmp_path) == []
+
+
+def test_shrink_after_common_prefix(tmp_path):
+    """与已有文件有共同前缀、随后变短时，前缀被复制且不留下旧内容"""
+    path = tmp_path / "data.json"
+    FileUtils.save_json({"a": 1, "b": "x" * 100}, str(path), compact=True)
+    assert FileUtils.save_json({"a": 1}, str(path), compact=True) is True
+    assert path.read_text(encoding="utf-8") == '{"a":1}'
+
+
+def test_existing_is_prefix_of_new_content(tmp_path):
+    """已有文件是新内容的前缀（文件变长）时写入完整内容"""
+    path = tmp_path / "data.json"
+    path.write_text('[1,2', encoding="utf-8")
+    assert FileUtils.save_json([1, 2, 3], str(path), compact=True) is True
+    assert path.read_text(encoding="utf-8") == '[1,2,3]'
+
+
+def test_change_after_many_blocks(tmp_path, monkeypatch):
+    """差异出现在多个块之后时，相同的前缀块被复制到新文件"""
+    monkeypatch.setattr(file_utils, "JSON_BLOCK_SIZE", 16)
+    path = tmp_path / "data.json"
+    data = {f"key{i}": "value" for i in range(50)}
+    FileUtils.save_json(data, str(path))
+    data["key49"] = "changed"
+    assert FileUtils.save_json(data, str(path)) is True
+    assert json.loads(path.read_text(encoding="utf-8")) == data
+    assert _temp_files(tmp_path) == []
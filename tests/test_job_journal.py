@@ -0,0 +1,60 @@
+"""
+任务日志的测试
+"""
+
+from translation_service.job_journal import JobJournal
+
+
+def test_resume_state(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = JobJournal(path)
+    journal.start("global_translation", ["a"])
+    journal.mark_done("a", "job", "zh")
+    journal.record_batch("a", "ru", {"image": "изображение"})
+
+    reopened = JobJournal(path)
+    assert reopened.pending_run()["mode"] == "global_translation"
+    assert reopened.is_done("a", "job", "zh")
+    assert not reopened.is_done("a", "job", "ru")
+    assert reopened.batch_translations("a", "ru") == {"image": "изображение"}
+
+    reopened.finish()
+    assert JobJournal(path).pending_run() is None
+
+
+def test_sees_records_from_other_writers(tmp_path):
+    """另一个实例（进程）追加的记录在读取时可见"""
+    path = str(tmp_path / "journal.jsonl")
+    first = JobJournal(path)
+    second = JobJournal(path)
+    first.start("chinese_only", ["a"])
+    first.mark_done("a", "job", "zh")
+    assert second.is_done("a", "job", "zh")
+    assert second.pending_run()["mode"] == "chinese_only"
+
+
+def test_superseded_run_does_not_pollute_new_run(tmp_path):
+    """新运行开始后，旧运行追加的记录不算作新运行的完成单元"""
+    path = str(tmp_path / "journal.jsonl")
+    old = JobJournal(path)
+    new = JobJournal(path)
+    old.start("chinese_only", ["a"])
+    new.start("global_translation", ["a"])
+    old.mark_done("a", "job", "zh")
+    old.finish()
+    assert not new.is_done("a", "job", "zh")
+    assert new.pending_run()["mode"] == "global_translation"
+
+
+def test_incomplete_line_is_ignored(tmp_path):
+    """崩溃留下的不完整行被忽略，之后追加的记录不受影响"""
+    path = tmp_path / "journal.jsonl"
+    journal = JobJournal(str(path))
+    journal.start("chinese_only", ["a"])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "unit", "un')
+
+    resumed = JobJournal(str(path))
+    assert resumed.resume()["mode"] == "chinese_only"
+    resumed.mark_done("a", "job", "zh")
+    assert JobJournal(str(path)).is_done("a", "job", "zh")
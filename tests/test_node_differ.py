@@ -0,0 +1,120 @@
+"""
+指纹索引、改名和移动检测、增量翻译复用以及翻译快照的测试
+"""
+
+import os
+
+from core import node_differ
+from core.node_differ import NodeDiffer
+
+
+def _node(display_name, inputs=(), outputs=()):
+    return {
+        "display_name": display_name,
+        "inputs": {key: {"name": key} for key in inputs},
+        "outputs": {key: {"name": key} for key in outputs},
+    }
+
+
+SOURCE = {
+    "Load Image": _node("Load Image", ["image", "mask"], ["IMAGE"]),
+    "Save-Image": _node("Save Image", ["images", "filename_prefix"]),
+}
+
+
+def test_index_fingerprint_ignores_separators_and_case():
+    index = NodeDiffer.build_index(SOURCE)
+    assert {entry["key"] for entry in index.values()} == set(SOURCE)
+
+    # 节点名只有分隔符或大小写不同时指纹相同
+    variant = NodeDiffer.build_index({"load_image": SOURCE["Load Image"]})
+    assert variant.keys() <= index.keys()
+    diff = NodeDiffer.diff_index(index, NodeDiffer.build_index({"load_image": SOURCE["Load Image"], "Save-Image": SOURCE["Save-Image"]}))
+    assert diff.renamed == {"load_image": "Load Image"}
+    assert not diff.added and not diff.removed
+
+
+def test_index_keeps_nodes_with_same_base_name_apart():
+    index = NodeDiffer.build_index({"A B": _node("x"), "A-B": _node("y")})
+    assert sorted(entry["key"] for entry in index.values()) == ["A B", "A-B"]
+
+
+def test_diff_detects_added_removed_and_changed():
+    new = dict(SOURCE)
+    del new["Save-Image"]
+    new["Load Image"] = _node("Load Image v2", ["image", "mask"], ["IMAGE"])
+    new["Preview"] = _node("Preview", ["images"])
+    diff = NodeDiffer.diff_index(NodeDiffer.build_index(SOURCE), NodeDiffer.build_index(new))
+    assert diff.added == ["Preview"]
+    assert diff.removed == ["Save-Image"]
+    assert diff.changed == [("Load Image", "display_name", None)]
+
+
+def test_diff_detects_rename_by_content_signature():
+    new = {"Image Loader": SOURCE["Load Image"], "Save-Image": SOURCE["Save-Image"]}
+    diff = NodeDiffer.diff_index(NodeDiffer.build_index(SOURCE), NodeDiffer.build_index(new))
+    assert diff.renamed == {"Image Loader": "Load Image"}
+    assert not diff.added and not diff.removed
+    assert diff.relocated[("Image Loader", "inputs", "mask")] == ("Load Image", "inputs", "mask")
+
+
+def test_diff_detects_moved_field():
+    old = {"Node": _node("Node", inputs=["image"])}
+    new = {"Node": {"display_name": "Node", "inputs": {"pixels": {"name": "image"}}, "outputs": {}}}
+    diff = NodeDiffer.diff_index(NodeDiffer.build_index(old), NodeDiffer.build_index(new))
+    assert diff.moved == {("Node", "inputs", "pixels"): ("Node", "inputs", "image")}
+    assert diff.relocated == diff.moved
+
+
+def test_diff_fields_reuses_unchanged_translations():
+    translated = {
+        "Load Image": {"display_name": "加载图像", "inputs": {"image": {"name": "图像"}, "mask": {"name": "遮罩"}},
+                       "outputs": {"IMAGE": {"name": "图像"}}},
+        "Save-Image": _node("Save Image", ["images", "filename_prefix"]),
+    }
+    snapshot = NodeDiffer.build_snapshot(SOURCE, translated)
+    # 未翻译的字段不记录
+    assert "Save-Image" not in snapshot
+
+    new = {"Load Image": _node("Load Image", ["image", "mask"], ["IMAGE", "MASK"])}
+    existing = {"Load Image": dict(translated["Load Image"], display_name="载入图像")}
+    reused, pending = NodeDiffer.diff_fields(new, existing, snapshot)
+    # 语言文件中人工修改过的译文优先于快照
+    assert reused[("Load Image", "display_name", None)] == "载入图像"
+    assert reused[("Load Image", "inputs", "mask")] == "遮罩"
+    assert pending == [("Load Image", "outputs", "MASK")]
+
+
+def test_diff_fields_follows_relocated_fields():
+    translated = {"Load Image": {"display_name": "加载图像", "inputs": {"image": {"name": "图像"}}, "outputs": {}}}
+    source = {"Load Image": _node("Load Image", ["image"])}
+    snapshot = NodeDiffer.build_snapshot(source, translated)
+    new = {"Image Loader": _node("Load Image", ["image"])}
+    diff = NodeDiffer.diff_index(NodeDiffer.build_index(source), NodeDiffer.build_index(new))
+    reused, pending = NodeDiffer.diff_fields(new, {}, snapshot, diff.relocated)
+    assert reused == {("Image Loader", "display_name", None): "加载图像", ("Image Loader", "inputs", "image"): "图像"}
+    assert pending == []
+
+
+def test_diff_fields_without_snapshot_uses_translated_fields():
+    existing = {"Load Image": {"display_name": "加载图像", "inputs": {"image": {"name": "image"}}}}
+    reused, pending = NodeDiffer.diff_fields({"Load Image": _node("Load Image", ["image"])}, existing, {})
+    assert reused == {("Load Image", "display_name", None): "加载图像"}
+    assert pending == [("Load Image", "inputs", "image")]
+
+
+def test_snapshot_round_trip(tmp_path):
+    translated = {"Load Image": {"display_name": "加载图像", "inputs": {"image": {"name": "图像"}}, "outputs": {}}}
+    source = {"Load Image": _node("Load Image", ["image"])}
+    snapshot = NodeDiffer.build_snapshot(source, translated)
+    index = NodeDiffer.build_index(source)
+
+    path = NodeDiffer.save_snapshot(snapshot, str(tmp_path), index)
+    assert os.path.basename(path) == node_differ.SNAPSHOT_FILE
+    assert NodeDiffer.load_snapshot(str(tmp_path)) == (snapshot, index)
+
+
+def test_load_snapshot_missing_or_unknown_version(tmp_path):
+    assert NodeDiffer.load_snapshot(str(tmp_path)) == ({}, {})
+    (tmp_path / node_differ.SNAPSHOT_FILE).write_text('{"version": 99, "fields": {"a": {}}}', encoding="utf-8")
+    assert NodeDiffer.load_snapshot(str(tmp_path)) == ({}, {})
@@ -0,0 +1,58 @@
+"""
+紧凑节点信息与 nodeDefs.json 数据互相转换的测试
+"""
+
+import json
+
+import pytest
+
+from core.models.node_info import NodeInfo
+
+
+def _round_trip(data):
+    result = NodeInfo.from_dict(data).to_dict()
+    assert result == data
+    # 键顺序也要保持一致，重写文件时内容不会被重新排序
+    assert json.dumps(result) == json.dumps(data)
+    return result
+
+
+@pytest.mark.parametrize("data", [
+    {},
+    {"display_name": "Load Image", "inputs": {"image": {"name": "image"}}, "outputs": {"IMAGE": {"name": "IMAGE"}},
+     "category": "image", "function": "load"},
+    {"display_name": "Node", "inputs": {}, "outputs": {}},
+    {"display_name": "Node", "description": "extra key", "inputs": {"a": {"name": "A"}}},
+])
+def test_round_trip(data):
+    _round_trip(data)
+
+
+def test_round_trip_keeps_explicit_none():
+    _round_trip({"display_name": None, "category": None, "function": None, "outputs": {"o": {"name": None}}})
+    _round_trip({"inputs": None, "outputs": {"o": {}}})
+    _round_trip({"display_name": "Node", "inputs": {"a": {"name": None, "tooltip": "t"}, "b": {"tooltip": "only"}}})
+
+
+def test_round_trip_keeps_key_order():
+    _round_trip({"category": "c", "display_name": "Node", "outputs": {}, "inputs": {"a": {"tooltip": "t", "name": "A"}}})
+    _round_trip({"display_name": None, "inputs": {"a": {"name": "A"}}, "category": "c"})
+
+
+def test_missing_and_null_fields_differ():
+    assert "display_name" not in NodeInfo.from_dict({"category": "c"}).to_dict()
+    assert NodeInfo.from_dict({"display_name": None}).to_dict() == {"display_name": None}
+
+
+def test_names_share_keys_until_translated():
+    node = NodeInfo(display_name="Node", input_keys=("image", "seed"), input_names=("image", "seed"))
+    assert node.input_names is node.input_keys
+    assert node.to_dict() == {"display_name": "Node", "inputs": {"image": {"name": "image"}, "seed": {"name": "seed"}}, "outputs": {}}
+
+    translated = NodeInfo.from_dict({"inputs": {"image": {"name": "图像"}}})
+    assert translated.inputs == {"image": "图像"}
+
+
+def test_mismatched_names_rejected():
+    with pytest.raises(ValueError):
+        NodeInfo(input_keys=("a", "b"), input_names=("A",))
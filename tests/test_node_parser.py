@@ -0,0 +1,95 @@
+"""
+跨模块继承解析的测试
+"""
+
+import textwrap
+
+from core.node_parser import NodeParser, SymbolIndex
+
+
+def _write(root, files):
+    for relative, source in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(source), encoding="utf-8")
+
+
+PACKAGE = {
+    "__init__.py": """
+        from .nodes import Leaf, Other
+        NODE_CLASS_MAPPINGS = {"LeafKey": Leaf, "OtherKey": Other}
+        NODE_DISPLAY_NAME_MAPPINGS = {"LeafKey": "Leaf Display"}
+    """,
+    "lib/__init__.py": """
+        from .base import Base as RootBase
+    """,
+    "lib/base.py": """
+        class Base:
+            CATEGORY = "lib"
+            FUNCTION = "run"
+            RETURN_TYPES = ("IMAGE",)
+            @classmethod
+            def INPUT_TYPES(cls):
+                return {"required": {"image": ("IMAGE",)}}
+    """,
+    "lib/deep/helpers.py": """
+        from ..base import Base
+        class Helper(Base):
+            CATEGORY = "helper"
+    """,
+    "nodes.py": """
+        from .lib import RootBase
+        from . import lib
+        class Leaf(RootBase):
+            CATEGORY = "leaf"
+        class Other(lib.base.Base):
+            pass
+    """,
+}
+
+
+def _index(root):
+    paths = sorted(str(path) for path in root.rglob("*.py"))
+    modules = [NodeParser.collect_module(path) for path in paths]
+    return SymbolIndex(str(root), modules)
+
+
+def test_relative_imports_locate_definitions(tmp_path):
+    root = tmp_path / "pack"
+    _write(root, PACKAGE)
+    index = _index(root)
+
+    # from .base import Base as RootBase（包的 __init__.py）
+    assert index.locate("lib", "RootBase") == ("lib.base", "Base")
+    # from .lib import RootBase 经过 lib/__init__.py 再导入一次
+    assert index.locate("nodes", "RootBase") == ("lib.base", "Base")
+    # from . import lib 后引用 lib.base.Base
+    assert index.locate("nodes", "lib.base.Base") == ("lib.base", "Base")
+    # from ..base import Base（两级相对导入）
+    assert index.locate("lib.deep.helpers", "Base") == ("lib.base", "Base")
+    # 未定义的名称
+    assert index.locate("nodes", "Missing") is None
+
+
+def test_registered_names_across_modules(tmp_path):
+    root = tmp_path / "pack"
+    _write(root, PACKAGE)
+    index = _index(root)
+    assert index.registered_name("nodes", "Leaf") == "LeafKey"
+    assert index.display_name("nodes", "LeafKey") == "Leaf Display"
+
+
+def test_parse_folder_inherits_across_modules(tmp_path):
+    root = tmp_path / "pack"
+    _write(root, PACKAGE)
+    nodes = NodeParser.parse_folder(str(root), max_workers=1)
+
+    leaf = nodes["LeafKey"]
+    assert leaf.display_name == "Leaf Display"
+    assert leaf.inputs == {"image": "image"}
+    assert leaf.outputs == {"image": "image"}
+    assert leaf.category == "leaf"
+    assert leaf.function == "run"
+    assert nodes["OtherKey"].category == "lib"
+    assert nodes["Helper"].category == "helper"
+    assert nodes["Helper"].inputs == {"image": "image"}
@@ -0,0 +1,89 @@
+"""
+解析缓存的测试
+"""
+
+import json
+import os
+
+from core import parse_cache
+from core.parse_cache import ParseCache
+
+MODULE = {"classes": {}, "mappings": {}}
+
+
+def _cached(tmp_path, source="x = 1\n"):
+    path = tmp_path / "mod.py"
+    path.write_text(source, encoding="utf-8")
+    cache = ParseCache(str(tmp_path / "cache"))
+    cache.put(str(path), MODULE)
+    return cache, path
+
+
+def _touch(path, delta_ns=10 ** 9):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + delta_ns))
+
+
+def test_hit_and_miss(tmp_path):
+    cache, path = _cached(tmp_path)
+    assert cache.get(str(path)) == MODULE
+    assert cache.get(str(tmp_path / "other.py")) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_size_change_invalidates(tmp_path):
+    cache, path = _cached(tmp_path)
+    path.write_text("x = 10\n", encoding="utf-8")
+    assert cache.get(str(path)) is None
+
+
+def test_mtime_change_with_same_content_hits(tmp_path):
+    cache, path = _cached(tmp_path)
+    _touch(path)
+    assert cache.get(str(path)) == MODULE
+    assert cache.entries[os.path.abspath(path)]["mtime"] == os.stat(path).st_mtime_ns
+
+
+def test_same_size_different_content_invalidates_by_hash(tmp_path):
+    cache, path = _cached(tmp_path)
+    path.write_text("x = 2\n", encoding="utf-8")
+    _touch(path)
+    assert cache.get(str(path)) is None
+
+
+def test_read_only_hit_does_not_rewrite_cache(tmp_path):
+    cache, path = _cached(tmp_path)
+    cache.save()
+    cache_file = cache.cache_file
+    before = os.stat(cache_file).st_mtime_ns
+
+    reloaded = ParseCache(str(tmp_path / "cache"))
+    assert reloaded.get(str(path)) == MODULE
+    assert not reloaded._dirty
+    reloaded.save()
+    assert os.stat(cache_file).st_mtime_ns == before
+
+
+def test_version_mismatch_discards_entries(tmp_path, monkeypatch):
+    cache, path = _cached(tmp_path)
+    cache.save()
+    with open(cache.cache_file, encoding="utf-8") as f:
+        assert json.load(f)["version"] == parse_cache.CACHE_VERSION
+
+    monkeypatch.setattr(parse_cache, "CACHE_VERSION", parse_cache.CACHE_VERSION + 1)
+    reloaded = ParseCache(str(tmp_path / "cache"))
+    assert reloaded.entries == {}
+    assert reloaded.get(str(path)) is None
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = ParseCache(str(tmp_path / "cache"), max_entries=1)
+    paths = []
+    for name in ("a.py", "b.py"):
+        path = tmp_path / name
+        path.write_text(name, encoding="utf-8")
+        cache.put(str(path), MODULE)
+        paths.append(path)
+    cache.entries[os.path.abspath(paths[0])]["used"] = 0
+    cache.save()
+    assert list(cache.entries) == [os.path.abspath(paths[1])]
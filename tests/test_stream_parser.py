@@ -0,0 +1,21 @@
+"""
+流式行解析的测试
+"""
+
+from translation_service.stream_parser import StreamLineParser
+
+
+def test_lines_split_across_chunks():
+    parser = StreamLineParser()
+    assert parser.feed("image -> 图") == []
+    assert parser.feed("像\nmask -") == ["image -> 图像"]
+    assert parser.feed("> 遮罩\n\n  \nseed") == ["mask -> 遮罩"]
+    assert parser.close() == ["seed"]
+    assert parser.lines == ["image -> 图像", "mask -> 遮罩", "seed"]
+
+
+def test_close_without_pending_line():
+    parser = StreamLineParser()
+    parser.feed("a -> b\n")
+    assert parser.close() == []
+    assert parser.text == "a -> b"
@@ -0,0 +1,88 @@
+"""
+请求规划器的测试
+"""
+
+import pytest
+
+from translation_service import token_budget
+from translation_service.token_budget import (
+    OUTPUT_SAFETY, ModelLimits, RequestPlanner, estimate_tokens, get_tokenizer, register_tokenizer
+)
+
+PROMPT = "请把下面的词条翻译成中文。" * 50
+TERMS = [f"Term number {i} with some words" for i in range(2000)]
+
+
+def _check_caps(plan, limits):
+    for batch in plan.batches:
+        assert batch.output_tokens <= limits.max_output_tokens * OUTPUT_SAFETY
+        assert plan.prompt_tokens + batch.input_tokens + batch.max_tokens <= limits.context_window
+        assert batch.max_tokens >= batch.output_tokens
+
+
+def test_plan_keeps_all_terms_in_order():
+    plan = RequestPlanner(target_batches=4).plan(TERMS, PROMPT, "zh")
+    assert [term for batch in plan.batches for term in batch.terms] == TERMS
+    assert all(len(batch.lines) == len(batch.terms) for batch in plan.batches)
+    assert plan.skipped == []
+
+
+@pytest.mark.parametrize("limits", [
+    ModelLimits(),
+    ModelLimits(context_window=8000, max_output_tokens=4000),
+    ModelLimits(context_window=4000, max_output_tokens=12000),
+])
+def test_plan_respects_output_and_context_caps(limits):
+    plan = RequestPlanner(limits, target_batches=4).plan(TERMS, PROMPT, "ru")
+    assert plan.requests > 1
+    _check_caps(plan, limits)
+
+
+def test_batch_tokens_caps_input():
+    limits = ModelLimits()
+    plan = RequestPlanner(limits, batch_tokens=500).plan(TERMS, PROMPT, "zh")
+    assert all(batch.input_tokens <= 500 for batch in plan.batches)
+    _check_caps(plan, limits)
+
+
+def test_small_input_is_not_split_below_prompt_size():
+    """词条行比提示词短时只发送一个请求，不为并发而重复发送提示词"""
+    plan = RequestPlanner(target_batches=8).plan(TERMS[:20], PROMPT, "zh")
+    assert plan.requests == 1
+
+
+def test_oversized_term_is_skipped():
+    limits = ModelLimits(context_window=2000, max_output_tokens=400)
+    huge = "word " * 300
+    plan = RequestPlanner(limits).plan(["image", huge, "mask"], PROMPT, "zh")
+    assert plan.skipped == [huge]
+    assert [term for batch in plan.batches for term in batch.terms] == ["image", "mask"]
+    _check_caps(plan, limits)
+
+
+def test_prompt_larger_than_context_raises():
+    with pytest.raises(ValueError):
+        RequestPlanner(ModelLimits(context_window=100)).plan(["image"], PROMPT, "zh")
+
+
+def test_cost_and_summary():
+    plan = RequestPlanner(ModelLimits(input_price=1.0, output_price=2.0)).plan(TERMS[:10], PROMPT, "zh")
+    assert plan.cost == pytest.approx((plan.input_tokens + 2 * plan.output_tokens) / 1_000_000)
+    assert "费用" in plan.summary()
+
+
+def test_heuristic_tokenizer():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("image") == 1
+    assert estimate_tokens("图像处理") == 4
+    assert estimate_tokens("Load Image") < estimate_tokens("加载图像处理")
+
+
+def test_pluggable_tokenizer(monkeypatch):
+    monkeypatch.setattr(token_budget, "TOKENIZERS", dict(token_budget.TOKENIZERS))
+    register_tokenizer("chars", len)
+    assert get_tokenizer("chars") is len
+    assert get_tokenizer("os.path:basename").__name__ == "basename"
+    assert get_tokenizer("missing-tokenizer") is estimate_tokens
+    plan = RequestPlanner(tokenizer=len).plan(["image"], "prompt", "zh")
+    assert plan.batches[0].input_tokens == len("image -> image") + 1
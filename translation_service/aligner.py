@@ -0,0 +1,133 @@
+"""
+翻译结果对齐模块
+按 "原文 -> 译文" 行中的原文键匹配译文，而不是按行号对齐
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 模型常在行首加的列表符号或编号，例如 "·"、"-"、"*"、"1."
+_BULLET_RE = re.compile(r'^\s*(?:[·•\-*]+|\d+[.)、])\s*')
+_SPACE_RE = re.compile(r'\s+')
+# 模型常在行尾加的标点
+_TRAILING = ",，;；"
+
+
+@dataclass
+class AlignmentResult:
+    """对齐结果"""
+    translations: Dict[str, str] = field(default_factory=dict)  # 原文到译文的映射
+    missing: List[str] = field(default_factory=list)  # 没有找到译文的原文，按原顺序排列
+    unmatched_lines: List[str] = field(default_factory=list)  # 无法对应到任何原文的响应行
+
+
+def split_line(line: str) -> Optional[Tuple[str, str]]:
+    """把响应行拆分为 (原文键, 译文)
+
+    Args:
+        line: 响应行
+
+    Returns:
+        Optional[Tuple[str, str]]: 不含箭头时返回 None
+    """
+    if '->' not in line:
+        return None
+    key, _, value = line.partition('->')
+    return key.strip(), value.strip()
+
+
+def iter_splits(line: str) -> Iterator[Tuple[str, str]]:
+    """按每个箭头的位置依次拆分响应行
+
+    原文或译文本身可能包含 "->"（如 "Latent -> Image"），第一个箭头不一定是
+    原文和译文的分隔符，由调用方选择原文键能够匹配的拆分方式。
+
+    Args:
+        line: 响应行
+
+    Yields:
+        Tuple[str, str]: (原文键, 译文)，按箭头从左到右的顺序
+    """
+    index = line.find('->')
+    while index >= 0:
+        yield line[:index].strip(), line[index + 2:].strip()
+        index = line.find('->', index + 2)
+
+
+def _loose_key(text: str) -> str:
+    """宽松比较用的键：忽略大小写和空白差异"""
+    return _SPACE_RE.sub(' ', text).strip().casefold()
+
+
+def _clean_value(source: str, value: str) -> str:
+    """去掉模型追加的行尾标点（原文本身以该标点结尾时保留）"""
+    if value and value[-1] in _TRAILING and not source.endswith(value[-1]):
+        return value[:-1].rstrip()
+    return value
+
+
+def align_translations(sources: List[str], lines: List[str]) -> AlignmentResult:
+    """按原文键对齐翻译结果
+
+    匹配顺序：
+    1. 原文键完全一致
+    2. 忽略大小写和空白后一致（处理模型改动大小写或空格的情况）
+    3. 去掉行首的列表符号或编号后再按 1、2 匹配
+    4. 响应行数与原文数相同时，剩余的行按位置对应（处理模型把原文键也翻译了的情况）
+
+    行被遗漏、合并或重排时，其余词条仍能正确对应，没有译文的词条列入 missing。
+
+    Args:
+        sources: 原文列表
+        lines: 模型返回的响应行
+
+    Returns:
+        AlignmentResult: 对齐结果
+    """
+    exact = {source: source for source in sources}
+    loose: Dict[str, str] = {}
+    for source in sources:
+        loose.setdefault(_loose_key(source), source)
+
+    def match(key: str) -> Optional[str]:
+        source = exact.get(key) or loose.get(_loose_key(key))
+        if source is None:
+            # 去掉行首的列表符号或编号后再匹配
+            stripped = _BULLET_RE.sub('', key, count=1)
+            source = exact.get(stripped) or loose.get(_loose_key(stripped))
+        return source
+
+    result = AlignmentResult()
+    pending_lines: List[Tuple[int, str, str]] = []
+    response_lines = [line for line in lines if line.strip()]
+    for index, line in enumerate(response_lines):
+        parsed = split_line(line)
+        if parsed is None:
+            result.unmatched_lines.append(line)
+            continue
+        # 原文包含箭头时使用原文键能够匹配的拆分，从最后一个箭头开始尝试，
+        # "Latent" 和 "Latent -> Image" 同时存在时优先匹配更长的原文
+        source = None
+        for key, value in reversed(list(iter_splits(line))):
+            source = match(key)
+            if source is not None and source not in result.translations:
+                break
+        else:
+            value = parsed[1]
+        if source is not None and source not in result.translations:
+            result.translations[source] = _clean_value(source, value)
+        else:
+            pending_lines.append((index, line, value))
+
+    # 行数一致时，按位置补齐键被改写的行
+    positional = len(response_lines) == len(sources)
+    for index, line, value in pending_lines:
+        source = sources[index] if positional else None
+        if source is not None and source not in result.translations:
+            result.translations[source] = _clean_value(source, value)
+        else:
+            result.unmatched_lines.append(line)
+
+    result.missing = [source for source in sources if source not in result.translations]
+    return result
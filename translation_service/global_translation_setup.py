@@ -4,33 +4,113 @@
 """
 
 import os
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
 from core.file_handler import FileHandler
 from core.node_parser import NodeParser
+from core.parse_cache import ParseCache
+
+# 默认生成的语言目录
+DEFAULT_LANGUAGES = ["zh", "ru", "ko", "ja", "fr", "en"]
+
+
+@dataclass
+class SetupResult:
+    """生成结果"""
+    generated: Dict[str, List[str]] = field(default_factory=dict)  # 文件夹到已生成的 nodeDefs.json 路径列表
+    errors: List[str] = field(default_factory=list)  # 出错的信息，全部成功时为空列表
+
 
 class GlobalTranslationSetup:
-    """全球化翻译设置类"""
-    
-    def __init__(self, folders: list):
+    """全球化翻译设置类
+
+    每个文件夹只解析一次，同一份解析结果直接写入所有语言目录的 nodeDefs.json，
+    目标语言增多时只增加写文件的开销，不会重复解析。解析流程（包括只生成中文的情况）
+    都使用这个类。
+    """
+
+    def __init__(self, folders: list, languages: Optional[List[str]] = None, max_workers: Optional[int] = None, cache: Optional[ParseCache] = None, ignore_patterns: Optional[List[str]] = None, on_log: Optional[Callable[[str, int], None]] = None):
         """初始化全球化翻译设置
-        
+
         Args:
             folders: 文件夹列表
+            languages: 要生成的语言目录，第一个为中文，默认为 zh、ru、ko、ja、fr、en
+            max_workers: 解析进程数，None 表示使用 CPU 核心数
+            cache: 解析缓存
+            ignore_patterns: 扫描时忽略的 glob 模式，None 表示使用默认规则
+            on_log: 日志回调，参数为 (消息, logging 级别)，为None时写入 logging
         """
         self.folders = folders
-        
-    def setup_translation_folders(self):
-        """设置翻译文件夹并生成 nodeDefs.json"""
-        languages = ["zh", "ru", "ko", "ja", "fr", "en"]
-        
+        self.languages = languages or DEFAULT_LANGUAGES
+        self.max_workers = max_workers
+        self.cache = cache
+        self.ignore_patterns = ignore_patterns
+        self.on_log = on_log
+
+    def log(self, message: str, level: int = logging.INFO) -> None:
+        """输出日志"""
+        if self.on_log is not None:
+            self.on_log(message, level)
+        else:
+            logging.log(level, message)
+
+    def setup_translation_folders(self) -> SetupResult:
+        """设置翻译文件夹并生成 nodeDefs.json
+
+        所有文件夹的 Python 文件一次性交给进程池扫描，再按文件夹解析，
+        每个文件夹的解析结果写入全部语言目录。单个文件夹出错时记录错误并继续处理
+        其他文件夹。
+
+        Returns:
+            SetupResult: 已生成的文件和出错的信息
+        """
+        result = SetupResult()
+
+        def fail(error_msg: str):
+            result.errors.append(error_msg)
+            self.log(error_msg, logging.ERROR)
+
+        # 扫描 Python 文件
+        folder_files = []
         for folder in self.folders:
-            for lang in languages:
-                lang_dir = os.path.join(folder, "locales", lang)
-                os.makedirs(lang_dir, exist_ok=True)  # 创建语言目录
-                
-                # 生成 nodeDefs.json
-                nodeDefs_path = os.path.join(lang_dir, "nodeDefs.json")
-                node_info = NodeParser.parse_folder(folder)  # 假设有一个方法可以解析文件夹
-                FileHandler.save_node_info(node_info, lang_dir)
-                print(f"{lang} 语言的 nodeDefs.json 已生成: {nodeDefs_path}")
-        
-        print("所有语言的 nodeDefs.json 文件已生成！") 
\ No newline at end of file
+            try:
+                self.log(f"开始解析文件夹: {folder}")
+                python_files = FileHandler.scan_plugin_folder(folder, self.ignore_patterns)
+                self.log(f"找到 {len(python_files)} 个 Python 文件")
+                folder_files.append((folder, python_files))
+            except Exception as e:
+                fail(f"处理文件夹时出错: {folder}: {str(e)}")
+
+        # 并行扫描所有文件
+        all_files = [file_path for _, python_files in folder_files for file_path in python_files]
+        try:
+            modules = NodeParser.collect_modules(all_files, self.max_workers, self.cache)
+            if self.cache is not None:
+                self.cache.save()
+        except Exception as e:
+            fail(f"解析文件时出错: {str(e)}")
+            return result
+
+        offset = 0
+        for folder, python_files in folder_files:
+            folder_modules = modules[offset:offset + len(python_files)]
+            offset += len(python_files)
+            try:
+                # 按插件建立符号索引，解析跨模块的继承关系
+                node_info = NodeParser.merge_results(NodeParser.resolve_modules(folder, folder_modules))
+                if not node_info:
+                    self.log(f"未找到任何节点信息: {folder}", logging.WARNING)
+                    continue
+
+                output_file = FileHandler.save_node_info(node_info, folder, self.languages)
+                self.log(f"节点信息已保存到: {output_file}")
+                result.generated[folder] = [os.path.join(folder, "locales", lang, "nodeDefs.json") for lang in self.languages]
+                for path in result.generated[folder][1:]:
+                    self.log(f"已创建语言文件: {path}")
+                categories = set(str(node.category) for node in node_info.values())
+                self.log(f"总共解析到 {len(node_info)} 个节点，类别: {', '.join(categories)}")
+            except Exception as e:
+                fail(f"处理文件夹时出错: {folder}: {str(e)}")
+
+        return result
@@ -0,0 +1,259 @@
+"""
+翻译任务日志模块
+记录已完成的 (文件夹, 语言, 批次) 单元，中断后可以从日志继续
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class JobJournal:
+    """翻译任务日志类
+
+    日志是追加写入的 JSON Lines 文件，每完成一个单元追加一行并立即落盘。
+    写入时同时持有线程锁和文件锁；每次读取状态或写入之前，在文件锁内读取其他
+    线程或进程追加的记录，因此多个进程共用同一个日志时能看到彼此完成的单元。
+    读取时忽略进程崩溃留下的不完整行。
+
+    每次运行的 start 记录带有随机的运行 ID，unit 和 finish 记录带有所属运行的 ID。
+    start 会清空日志：另一个进程此时仍在进行的运行被新运行取代，它之后追加的记录
+    属于旧运行，不会被当作新运行的完成单元。同一时间只应有一个进程执行某个日志的
+    运行，其他进程可以读取状态或继续（resume）这个运行。
+
+    记录类型：
+    - start: 一次运行的开始，包含运行 ID、模式和文件夹列表
+    - unit: 完成的单元，unit 为 batch（一批词条）或 job（一种语言）
+    - finish: 运行正常结束
+    """
+
+    def __init__(self, journal_path: str):
+        """初始化任务日志
+
+        Args:
+            journal_path: 日志文件路径
+        """
+        self.journal_path = journal_path
+        self._lock = threading.Lock()
+        self._start: Optional[Dict] = None  # 日志中当前运行的 start 记录
+        self._finished = False
+        self._done: Set[Tuple[str, str, str]] = set()  # 已完成的 (单元类型, 文件夹, 语言)
+        self._batches: Dict[Tuple[str, str], Dict[str, str]] = {}  # (文件夹, 语言) 到已完成批次译文的映射
+        self._offset = 0  # 已读取到的文件位置
+        self._head = b""  # 已读取内容的第一行，用于发现日志被其他进程清空并重新开始
+        self._run: Optional[str] = None  # 本实例正在执行的运行 ID
+        os.makedirs(os.path.dirname(os.path.abspath(journal_path)), exist_ok=True)
+        with self._lock:
+            self._sync()
+
+    def _reset(self) -> None:
+        """清空内存状态"""
+        self._start = None
+        self._finished = False
+        self._done.clear()
+        self._batches.clear()
+        self._offset = 0
+        self._head = b""
+
+    def _sync(self) -> None:
+        """在文件锁内读取其他线程或进程追加的记录（调用方持有线程锁）"""
+        if not os.path.exists(self.journal_path):
+            self._reset()
+            return
+        with self._open_locked() as f:
+            self._refresh(f)
+
+    def _refresh(self, f) -> None:
+        """读取上次读取位置之后新增的完整记录
+
+        日志被清空或被其他进程的新运行重写时，从头重新读取。
+
+        Args:
+            f: 已加锁的日志文件（二进制模式）
+        """
+        size = os.fstat(f.fileno()).st_size
+        if self._offset:
+            f.seek(0)
+            if size < self._offset or f.readline() != self._head:
+                self._reset()
+        if size <= self._offset:
+            return
+        f.seek(self._offset)
+        data = f.read(size - self._offset)
+        # 只处理以换行结尾的完整行，崩溃留下的不完整行在读取时被忽略
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines(keepends=True):
+            if not self._offset and not self._head:
+                self._head = line
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            self._index(record)
+        self._offset += end
+
+    def _index(self, record: Dict) -> None:
+        """把一条记录合并到内存状态，不属于当前运行的记录被忽略"""
+        record_type = record.get("type")
+        if record_type == "start":
+            self._start = record
+            self._finished = False
+            self._done.clear()
+            self._batches.clear()
+            return
+        run = record.get("run")
+        if run is not None and (self._start is None or run != self._start.get("run")):
+            return
+        if record_type == "finish":
+            self._finished = True
+        elif record_type == "unit":
+            folder, lang = record.get("folder", ""), record.get("lang", "")
+            if record.get("unit") == "batch":
+                self._batches.setdefault((folder, lang), {}).update(record.get("translations", {}))
+            else:
+                self._done.add((record.get("unit"), folder, lang))
+
+    @staticmethod
+    def _lock_file(f, lock: bool) -> None:
+        """加锁或解锁日志文件"""
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if lock else fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if lock else msvcrt.LK_UNLCK, 1)
+
+    @contextmanager
+    def _open_locked(self):
+        """打开日志文件并持有文件锁"""
+        with open(self.journal_path, 'a+b') as f:
+            self._lock_file(f, True)
+            try:
+                yield f
+            finally:
+                self._lock_file(f, False)
+
+    def _append(self, record: Dict, truncate: bool = False) -> None:
+        """追加一条记录并落盘
+
+        写入前先读取其他进程追加的记录，写入后本实例的状态与文件一致。
+
+        Args:
+            record: 记录内容
+            truncate: 是否先清空日志（开始新的运行时）
+        """
+        record["time"] = time.time()
+        with self._lock:
+            with self._open_locked() as f:
+                if truncate:
+                    f.truncate(0)
+                    self._reset()
+                else:
+                    self._refresh(f)
+                    if record.get("type") != "start":
+                        record["run"] = self._run or (self._start or {}).get("run")
+                line = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+                size = os.fstat(f.fileno()).st_size
+                if size > self._offset:
+                    # 崩溃留下的不完整行，先补上换行，避免与本条记录连成一行
+                    line = b"\n" + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+                self._refresh(f)
+
+    def pending_run(self) -> Optional[Dict]:
+        """返回未正常结束的运行
+
+        Returns:
+            Optional[Dict]: 未结束运行的 start 记录，没有时返回 None
+        """
+        with self._lock:
+            self._sync()
+            return None if self._finished else self._start
+
+    def start(self, mode: str, folders: List[str]) -> None:
+        """开始新的运行，清空旧日志
+
+        Args:
+            mode: 翻译模式
+            folders: 文件夹列表
+        """
+        self._run = uuid.uuid4().hex
+        self._append({"type": "start", "run": self._run, "pid": os.getpid(), "mode": mode, "folders": list(folders)}, truncate=True)
+
+    def resume(self) -> Optional[Dict]:
+        """继续日志中未结束的运行，之后的记录属于这个运行
+
+        Returns:
+            Optional[Dict]: 继续的运行的 start 记录，没有未结束的运行时返回 None
+        """
+        with self._lock:
+            self._sync()
+            if self._finished or self._start is None:
+                return None
+            self._run = self._start.get("run")
+            return self._start
+
+    def finish(self) -> None:
+        """标记运行正常结束"""
+        self._append({"type": "finish"})
+
+    def is_done(self, folder: str, unit: str, lang: str = "") -> bool:
+        """判断单元是否已经完成
+
+        Args:
+            folder: 文件夹路径
+            unit: 单元类型，如 job
+            lang: 语言代码
+
+        Returns:
+            bool: 是否已完成
+        """
+        with self._lock:
+            self._sync()
+            return (unit, folder, lang) in self._done
+
+    def mark_done(self, folder: str, unit: str, lang: str = "") -> None:
+        """记录单元已完成
+
+        Args:
+            folder: 文件夹路径
+            unit: 单元类型，如 job
+            lang: 语言代码
+        """
+        self._append({"type": "unit", "unit": unit, "folder": folder, "lang": lang})
+
+    def record_batch(self, folder: str, lang: str, translations: Dict[str, str]) -> None:
+        """记录一个已完成批次的翻译结果
+
+        Args:
+            folder: 文件夹路径
+            lang: 语言代码
+            translations: 原文到译文的映射
+        """
+        if translations:
+            self._append({"type": "unit", "unit": "batch", "folder": folder, "lang": lang, "translations": translations})
+
+    def batch_translations(self, folder: str, lang: str) -> Dict[str, str]:
+        """汇总某个文件夹某种语言已完成批次的翻译结果
+
+        Args:
+            folder: 文件夹路径
+            lang: 语言代码
+
+        Returns:
+            Dict[str, str]: 原文到译文的映射
+        """
+        with self._lock:
+            self._sync()
+            return dict(self._batches.get((folder, lang), {}))
@@ -0,0 +1,533 @@
+"""
+处理流程模块
+解析和翻译的完整流程，图形界面和命令行共用
+"""
+
+import os
+import copy
+import time
+import queue
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from core.file_utils import FileUtils
+from core.node_differ import NodeDiffer
+from core.parse_cache import ParseCache
+from translation_service.term_table import TermTable, Location
+from prompts.system_prompts import load_language_prompt
+from translation_service.translation_service import TranslationService
+from translation_service.job_journal import JobJournal
+from translation_service.global_translation_setup import GlobalTranslationSetup
+from translation_service.token_budget import RequestPlanner
+
+# 全球化模式下需要翻译的其他语言
+GLOBAL_LANGUAGES = ["ru", "ja", "ko", "fr"]
+# 全球化模式解析时生成的语言目录
+SKELETON_LANGUAGES = ["ru", "ko", "ja", "fr", "en"]
+
+
+@dataclass
+class PipelineEvent:
+    """流程事件
+
+    kind 取值：
+    - log: 普通日志
+    - error: 需要提示用户的错误
+    - info: 需要提示用户的消息（由界面发送）
+    - progress: 翻译进度，data 包含 folder、lang、done、total
+    - plan: 翻译前的预估，data 包含 jobs、requests、input_tokens、output_tokens、cost、skipped
+    - done: 流程结束，data 包含 stage、success 等汇总信息
+    """
+    kind: str
+    message: str = ""
+    data: Dict = field(default_factory=dict)
+    level: int = logging.INFO  # logging 级别，error 事件为 ERROR
+    time: float = field(default_factory=time.time)
+
+
+@dataclass
+class FolderSource:
+    """一个文件夹的翻译原文
+
+    原文只读取一次，各语言的翻译任务共用原文、指纹索引和词条表，
+    在内存中复制出各自的文档。
+    """
+    data: Dict
+    index: Dict
+    term_table: TermTable
+
+    @classmethod
+    def load(cls, path: str) -> 'FolderSource':
+        """读取 nodeDefs.json 并构建指纹索引和词条表"""
+        data = FileUtils.load_json(path)
+        return cls(data, NodeDiffer.build_index(data), TermTable.from_node_defs(data))
+
+
+@dataclass
+class TranslationJob:
+    """一个文件夹一种语言的翻译任务"""
+    folder: str
+    lang: str
+    prompt: str
+    source: FolderSource
+    target_data: Dict  # 由原文复制出的文档，增量翻译时已写回复用的译文
+    term_table: TermTable  # 需要翻译的词条
+    fields: Optional[List[Location]] = None  # 增量翻译时需要翻译的字段，为None时翻译全部字段
+    resumed: Optional[Dict[str, str]] = None  # 从任务日志恢复的译文
+
+    @property
+    def pending_terms(self) -> List[str]:
+        """还需要请求的词条（不含已恢复的词条）"""
+        if not self.resumed:
+            return self.term_table.terms
+        return [term for term in self.term_table.terms if term not in self.resumed]
+
+
+class EventQueue:
+    """线程安全的事件队列
+
+    工作线程调用 put 发送事件，界面线程定时调用 drain 批量取出，
+    工作线程不直接接触任何界面组件。
+    """
+
+    def __init__(self):
+        """初始化事件队列"""
+        self._queue = queue.SimpleQueue()
+
+    def put(self, event: PipelineEvent) -> None:
+        """发送事件，可以直接作为流程的 on_event 回调
+
+        Args:
+            event: 流程事件
+        """
+        self._queue.put(event)
+
+    def drain(self, max_events: int) -> List[PipelineEvent]:
+        """取出队列中的事件
+
+        Args:
+            max_events: 最多取出的事件数
+
+        Returns:
+            List[PipelineEvent]: 按发送顺序排列的事件
+        """
+        events = []
+        while len(events) < max_events:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+
+class TranslationPipeline:
+    """解析和翻译流程类
+
+    流程通过 on_event 回调报告进度，不依赖任何界面组件，可以在工作线程中运行。
+    """
+
+    def __init__(self, on_event: Optional[Callable[[PipelineEvent], None]] = None, parse_cache: Optional[ParseCache] = None, ignore_patterns: Optional[List[str]] = None, journal: Optional[JobJournal] = None, max_workers: Optional[int] = None, incremental: bool = False):
+        """初始化处理流程
+
+        Args:
+            on_event: 事件回调，为None时写入 logging
+            parse_cache: 解析缓存
+            ignore_patterns: 扫描时忽略的 glob 模式，None 表示使用默认规则
+            journal: 任务日志，为None时不记录也不能继续中断的运行
+            max_workers: 解析进程数，None 表示使用 CPU 核心数
+            incremental: 是否增量翻译，只翻译与已有语言文件相比新增或变化的字段
+        """
+        self.on_event = on_event
+        self.parse_cache = parse_cache
+        self.ignore_patterns = ignore_patterns
+        self.journal = journal
+        self.max_workers = max_workers
+        self.incremental = incremental
+        self._stop_event = threading.Event()  # 本流程的终止标志，只传给本次运行的翻译请求
+
+    @property
+    def is_stopped(self) -> bool:
+        """是否已请求终止"""
+        return self._stop_event.is_set()
+
+    def emit(self, kind: str, message: str = "", level: Optional[int] = None, **data) -> None:
+        """发送事件
+
+        Args:
+            kind: 事件类型
+            message: 事件消息
+            level: logging 级别，为None时 error 事件为 ERROR，其余为 INFO
+            **data: 事件数据
+        """
+        if level is None:
+            level = logging.ERROR if kind == "error" else logging.INFO
+        if self.on_event is not None:
+            self.on_event(PipelineEvent(kind, message, data, level))
+        elif message:
+            logging.log(level, message)
+
+    def log(self, message: str, level: int = logging.INFO) -> None:
+        """发送日志事件"""
+        self.emit("log", message, level)
+
+    def stop(self) -> None:
+        """终止正在进行的翻译
+
+        终止标志属于本流程而不是共用的翻译服务，不会影响使用同一服务的其他运行。
+        """
+        self._stop_event.set()
+
+    def parse(self, folders: List[str], global_mode: bool = False) -> List[str]:
+        """解析文件夹并生成 nodeDefs.json
+
+        Args:
+            folders: 插件文件夹列表
+            global_mode: 是否为全球化翻译模式，是则同时生成其他语言的文件
+
+        Returns:
+            List[str]: 出错的信息，全部成功时为空列表
+        """
+        # 全球化模式下各语言目录的文件由同一次解析结果直接写入
+        languages = ["zh"] + SKELETON_LANGUAGES if global_mode else ["zh"]
+        errors = self._parse_folders(folders, languages)
+        if global_mode:
+            self.log("全球化翻译文件生成完成！")
+        self.emit("done", stage="parse", success=not errors, folders=len(folders), errors=len(errors))
+        return errors
+
+    def _parse_folders(self, folders: List[str], languages: List[str]) -> List[str]:
+        """解析文件夹并写入各语言目录
+
+        Args:
+            folders: 要解析的文件夹列表
+            languages: 写入 nodeDefs.json 的语言目录，第一个为中文
+
+        Returns:
+            List[str]: 出错的信息
+        """
+        def on_log(message: str, level: int):
+            if level >= logging.ERROR:
+                self.emit("error", f"错误: {message}")
+            else:
+                self.log(message, level)
+
+        setup = GlobalTranslationSetup(folders, languages, self.max_workers, self.parse_cache, self.ignore_patterns, on_log)
+        return setup.setup_translation_folders().errors
+
+    def load_prompts(self, languages: List[str]) -> Dict[str, str]:
+        """加载各语言的提示词，提示词为空的语言被跳过
+
+        Args:
+            languages: 语言代码列表
+
+        Returns:
+            Dict[str, str]: 语言到提示词的映射
+        """
+        prompts = {}
+        for lang in languages:
+            current_prompt = load_language_prompt(lang)
+            if not current_prompt:
+                self.log(f"错误：{lang} 提示词为空，跳过此语言", logging.WARNING)
+                continue
+            self.log(f"已加载 {lang} 提示词")
+            self.log(f"当前 {lang} 提示词内容预览: {current_prompt[:200]}...")
+            prompts[lang] = current_prompt
+        return prompts
+
+    def estimate(self, planner: RequestPlanner, folders: List[str], global_mode: bool = False, resume: bool = False) -> Dict:
+        """估算翻译需要的请求数、token 数和费用，不发送任何请求
+
+        Args:
+            planner: 请求规划器
+            folders: 插件文件夹列表
+            global_mode: 是否为全球化翻译模式
+            resume: 是否按任务日志扣除上次运行已完成的部分
+
+        Returns:
+            Dict: 汇总信息，包含 jobs、requests、input_tokens、output_tokens、cost
+        """
+        totals = {}
+        try:
+            prompts = self.load_prompts(["zh"] + GLOBAL_LANGUAGES if global_mode else ["zh"])
+            jobs, _ = self._prepare_jobs(folders, prompts, resume)
+            totals = self._report_plan(planner, jobs)
+        except Exception as e:
+            self.emit("error", f"估算过程中发生错误: {str(e)}")
+        finally:
+            self.emit("done", stage="estimate", success=bool(totals), folders=len(folders))
+        return totals
+
+    def translate(self, service: TranslationService, folders: List[str], global_mode: bool = False, resume: bool = False) -> bool:
+        """翻译所有文件夹
+
+        所有文件夹、所有目标语言的翻译作为独立任务在同一个事件循环中并发执行，
+        共享翻译服务的并发上限。每个文件夹的原文只读取一次，各语言的文档在内存中
+        由原文和共用的词条表生成，直接写入各自的语言目录，不再复制临时文件。
+        开始请求之前先报告预计的请求数、token 数和费用。
+        每个完成的批次和语言都会写入任务日志，继续运行时跳过已完成的单元。
+
+        Args:
+            service: 翻译服务
+            folders: 插件文件夹列表
+            global_mode: 是否为全球化翻译模式
+            resume: 是否从任务日志继续上次未完成的运行
+
+        Returns:
+            bool: 是否全部完成
+        """
+        journal = self.journal
+        completed = False
+        try:
+            if journal is not None:
+                if resume:
+                    journal.resume()
+                    self.log("从任务日志继续上次未完成的翻译")
+                else:
+                    journal.start('global_translation' if global_mode else 'chinese_only', folders)
+
+            # 每次运行只加载一次各语言的提示词
+            prompts = self.load_prompts(["zh"] + GLOBAL_LANGUAGES if global_mode else ["zh"])
+
+            # 第1步：每个文件夹读取一次原文，所有语言共用，并估算请求
+            jobs, loaded = self._prepare_jobs(folders, prompts, True)
+            if jobs and not self.is_stopped:
+                self._report_plan(service.planner, jobs)
+
+            # 第2步：并发提交所有文件夹和语言的翻译
+            failed_folders = set()
+            deferred: Dict[str, Callable[[], None]] = {}
+            if jobs and not self.is_stopped:
+                self.log(f"\n开始翻译，共 {len(jobs)} 个任务...")
+                results = service.run(self._translate_jobs(service, jobs, deferred if global_mode else None))
+                failed_folders = {job.folder for job, success in zip(jobs, results) if not success}
+
+            # 第3步：全球化模式下中文译文会覆盖原文，等该文件夹其他语言全部完成后再写入；
+            # 有语言失败的文件夹保留原文，下次继续时中文从任务日志恢复，不会重复请求
+            for folder, commit in deferred.items():
+                if self.is_stopped or folder in failed_folders:
+                    continue
+                commit()
+                self.log(f"全球化翻译完成: {folder}")
+
+            completed = not self.is_stopped and not failed_folders and loaded == len(folders)
+            if completed:
+                if journal is not None:
+                    journal.finish()
+            elif journal is not None:
+                self.log("部分任务未完成，再次开始翻译时可以从中断处继续", logging.WARNING)
+
+        except Exception as e:
+            self.emit("error", f"翻译过程中发生错误: {str(e)}")
+        finally:
+            memory = service.memory
+            if memory is not None:
+                memory.evict()
+                stats = memory.stats()
+                self.log(f"翻译记忆: 命中 {stats['hits']}，未命中 {stats['misses']}，共 {stats['entries']} 条")
+            self.emit("done", stage="translate", success=completed, folders=len(folders))
+        return completed
+
+    def _prepare_jobs(self, folders: List[str], prompts: Dict[str, str], use_journal: bool) -> Tuple[List[TranslationJob], int]:
+        """读取各文件夹的原文并生成待执行的翻译任务
+
+        Args:
+            folders: 插件文件夹列表
+            prompts: 语言到提示词的映射
+            use_journal: 是否跳过任务日志中已完成的语言并恢复已完成的批次
+
+        Returns:
+            Tuple[List[TranslationJob], int]: (翻译任务列表, 成功读取的文件夹数)
+        """
+        jobs = []
+        loaded = 0
+        for folder in folders:
+            if self.is_stopped:
+                self.log("翻译任务已终止", logging.WARNING)
+                break
+
+            self.log(f"\n开始处理文件夹: {folder}")
+
+            # 获取中文版本的路径
+            zh_path = os.path.join(folder, "locales", "zh", "nodeDefs.json")
+            if not os.path.exists(zh_path):
+                self.log(f"错误：未找到文件: {zh_path}", logging.WARNING)
+                continue
+
+            pending = [lang for lang in prompts if not (use_journal and self._is_done(folder, "job", lang))]
+            for lang in prompts:
+                if lang not in pending:
+                    self.log(f"{lang} 已在上次运行中完成，跳过: {folder}")
+            try:
+                folder_jobs = []
+                if pending:
+                    source = FolderSource.load(zh_path)
+                    for lang in pending:
+                        job = self._prepare_job(folder, lang, prompts[lang], source)
+                        if use_journal and self.journal is not None:
+                            job.resumed = self.journal.batch_translations(folder, lang)
+                        folder_jobs.append(job)
+            except Exception as e:
+                self.log(f"读取翻译原文时出错: {folder}: {str(e)}", logging.WARNING)
+                continue
+            jobs.extend(folder_jobs)
+            loaded += 1
+        return jobs, loaded
+
+    def _prepare_job(self, folder: str, lang: str, prompt: str, source: FolderSource) -> TranslationJob:
+        """由原文生成一种语言的文档，增量翻译时复用已有译文
+
+        Args:
+            folder: 插件文件夹路径
+            lang: 语言代码
+            prompt: 该语言的提示词
+            source: 该文件夹的原文
+
+        Returns:
+            TranslationJob: 翻译任务
+        """
+        # 各语言的文档由共用的原文在内存中生成
+        target_data = copy.deepcopy(source.data)
+        if not self.incremental:
+            return TranslationJob(folder, lang, prompt, source, target_data, source.term_table)
+
+        # 增量翻译：原文没有变化的字段复用已有译文，只发送新增或变化的字段
+        lang_dir = os.path.join(folder, "locales", lang)
+        target_path = os.path.join(lang_dir, "nodeDefs.json")
+        existing_data = FileUtils.load_json(target_path) if os.path.exists(target_path) else {}
+        snapshot, old_index = NodeDiffer.load_snapshot(lang_dir)
+        index_diff = NodeDiffer.diff_index(old_index, source.index)
+        if old_index:
+            self.log(f"{lang} 与上次翻译相比: 新增 {len(index_diff.added)} 个节点，删除 {len(index_diff.removed)} 个，"
+                     f"改名 {len(index_diff.renamed)} 个，移动 {len(index_diff.moved)} 个字段，修改 {len(index_diff.changed)} 个字段")
+        reused, fields = NodeDiffer.diff_fields(target_data, existing_data, snapshot, index_diff.relocated)
+        for loc, text in reused.items():
+            NodeDiffer.set_field(target_data, loc, text)
+        self.log(f"{lang} 增量翻译: 复用 {len(reused)} 个字段，需翻译 {len(fields)} 个字段")
+        # 增量翻译时各语言需要翻译的字段不同，不能共用词条表
+        return TranslationJob(folder, lang, prompt, source, target_data, TermTable.from_node_defs(target_data, fields), fields)
+
+    def _report_plan(self, planner: RequestPlanner, jobs: List[TranslationJob]) -> Dict:
+        """估算各任务的请求并发送汇总的 plan 事件
+
+        翻译记忆命中的词条不会发送，实际的请求数和 token 数可能更少。
+
+        Args:
+            planner: 请求规划器
+            jobs: 翻译任务列表
+
+        Returns:
+            Dict: 汇总信息
+        """
+        totals = {"jobs": len(jobs), "requests": 0, "input_tokens": 0, "output_tokens": 0, "cost": 0.0, "skipped": 0}
+        for job in jobs:
+            plan = planner.plan(job.pending_terms, job.prompt, job.lang)
+            if plan.requests or plan.skipped:
+                self.log(f"{plan.summary()} - {os.path.basename(job.folder)}")
+            totals["requests"] += plan.requests
+            totals["input_tokens"] += plan.input_tokens
+            totals["output_tokens"] += plan.output_tokens
+            totals["cost"] += plan.cost
+            totals["skipped"] += len(plan.skipped)
+        totals["cost"] = round(totals["cost"], 4)
+
+        message = (f"预计 {totals['jobs']} 个任务共 {totals['requests']} 个请求，输入约 {totals['input_tokens']} tokens，"
+                   f"输出约 {totals['output_tokens']} tokens")
+        if totals["cost"]:
+            message += f"，费用约 {totals['cost']:.4f} 元"
+        if totals["skipped"]:
+            message += f"，{totals['skipped']} 个词条过长无法发送"
+        self.emit("plan", message + "（未扣除翻译记忆命中的词条）", **totals)
+        return totals
+
+    def _is_done(self, folder: str, unit: str, lang: str = "") -> bool:
+        """任务日志中该单元是否已完成"""
+        return self.journal is not None and self.journal.is_done(folder, unit, lang)
+
+    def _mark_done(self, folder: str, unit: str, lang: str = "") -> None:
+        """在任务日志中记录单元已完成"""
+        if self.journal is not None:
+            self.journal.mark_done(folder, unit, lang)
+
+    async def _translate_jobs(self, service: TranslationService, jobs: List[TranslationJob], deferred: Optional[dict]) -> list:
+        """并发执行所有 (文件夹, 语言) 翻译任务
+
+        Args:
+            service: 共享的翻译服务
+            jobs: 翻译任务列表
+            deferred: 不为None时，中文译文不立即写入，而是把写入操作按文件夹放入该字典
+
+        Returns:
+            list: 每个任务是否成功
+        """
+        return await asyncio.gather(*(
+            self._translate_job(service, job, deferred if job.lang == "zh" else None)
+            for job in jobs
+        ))
+
+    async def _translate_job(self, service: TranslationService, job: TranslationJob, deferred: Optional[dict] = None) -> bool:
+        """翻译一个文件夹的一种语言
+
+        Args:
+            service: 共享的翻译服务
+            job: 翻译任务
+            deferred: 不为None时不立即写入结果，而是把写入操作放入该字典
+
+        Returns:
+            bool: 是否翻译成功
+        """
+        if self.is_stopped:
+            return False
+
+        folder, lang, source = job.folder, job.lang, job.source
+        try:
+            lang_dir = os.path.join(folder, "locales", lang)
+            target_path = os.path.join(lang_dir, "nodeDefs.json")
+
+            self.log(f"开始 {lang} 翻译: {folder}")
+
+            # 每完成约 10% 的词条报告一次进度
+            def on_progress(done: int, total: int):
+                step = max(1, total // 10)
+                if done % step == 0 or done == total:
+                    self.emit("progress", f"{lang} 翻译进度: {done}/{total} - {os.path.basename(folder)}",
+                              folder=folder, lang=lang, done=done, total=total)
+
+            # 每个完成的批次写入任务日志，上次运行已完成的批次不再请求
+            def on_checkpoint(translations: dict):
+                self.journal.record_batch(folder, lang, translations)
+
+            if job.fields == []:
+                success, translated_data = True, job.target_data
+            else:
+                success, translated_data = await service.translate(
+                    job.target_data, job.prompt, lang, on_progress,
+                    resumed=job.resumed,
+                    checkpoint=on_checkpoint if self.journal is not None else None,
+                    stop_event=self._stop_event,
+                    fields=job.fields,
+                    term_table=job.term_table
+                )
+
+            if success and translated_data:
+                def commit():
+                    # 保存翻译结果，增量模式下记录各字段的原文和译文供下次增量翻译使用
+                    FileUtils.save_json(translated_data, target_path)
+                    if self.incremental:
+                        NodeDiffer.save_snapshot(NodeDiffer.build_snapshot(source.data, translated_data), lang_dir, source.index)
+                    self._mark_done(folder, "job", lang)
+                    self.log(f"{lang} 翻译完成，已保存到: {target_path}")
+
+                if deferred is not None:
+                    deferred[folder] = commit
+                else:
+                    commit()
+                return True
+
+            self.log(f"{lang} 翻译失败: {folder}", logging.WARNING)
+            return False
+
+        except Exception as e:
+            self.log(f"{lang} 翻译过程中出错: {str(e)}", logging.WARNING)
+            return False
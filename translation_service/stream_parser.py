@@ -0,0 +1,65 @@
+"""
+流式解析模块
+在流式响应到达时逐行解析翻译结果
+"""
+
+from typing import List
+
+
+class StreamLineParser:
+    """增量行解析器
+
+    流式响应的片段先放入列表，遇到换行时才拼接成完整的一行，避免对整个
+    响应做字符串累加。每一行完成时立即返回，调用方可以在生成结束前处理
+    已经完成的词条；流中断时 lines 中保留已完成的部分。
+    """
+
+    def __init__(self):
+        """初始化解析器"""
+        self.lines: List[str] = []  # 已完成的非空行
+        self._parts: List[str] = []  # 当前未完成行的片段
+
+    def feed(self, chunk: str) -> List[str]:
+        """输入一个响应片段
+
+        Args:
+            chunk: 流式响应片段
+
+        Returns:
+            List[str]: 本次新完成的行
+        """
+        completed = []
+        start = 0
+        while True:
+            index = chunk.find('\n', start)
+            if index < 0:
+                if start < len(chunk):
+                    self._parts.append(chunk[start:])
+                break
+            self._parts.append(chunk[start:index])
+            line = "".join(self._parts).strip()
+            self._parts = []
+            if line:
+                completed.append(line)
+            start = index + 1
+
+        self.lines.extend(completed)
+        return completed
+
+    def close(self) -> List[str]:
+        """结束输入，返回最后一行（如果有）
+
+        Returns:
+            List[str]: 最后完成的行
+        """
+        line = "".join(self._parts).strip()
+        self._parts = []
+        if not line:
+            return []
+        self.lines.append(line)
+        return [line]
+
+    @property
+    def text(self) -> str:
+        """已完成的所有行"""
+        return "\n".join(self.lines)
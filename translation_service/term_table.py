@@ -0,0 +1,109 @@
+"""
+词条表模块
+对 nodeDefs 中重复出现的词条去重，并记录每个词条出现的位置
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 词条位置: (节点名, 字段类型, 输入/输出键)，display_name 的键为 None
+Location = Tuple[str, str, Optional[str]]
+
+
+class TermTable:
+    """去重词条表
+
+    image、model、seed 等名称会在大量节点中重复出现，翻译请求只需要发送
+    一次。occurrences 记录每个词条的所有出现位置，翻译结果可以据此写回。
+    """
+
+    def __init__(self):
+        """初始化词条表"""
+        self.terms: List[str] = []  # 按首次出现顺序排列的唯一词条
+        self.occurrences: Dict[str, List[Location]] = {}
+
+    @classmethod
+    def from_node_defs(cls, json_data: dict, fields: Optional[Iterable[Location]] = None) -> 'TermTable':
+        """从 nodeDefs 数据构建词条表
+
+        Args:
+            json_data: nodeDefs.json 数据
+            fields: 只收录这些位置的词条，为None时收录全部位置
+
+        Returns:
+            TermTable: 词条表
+        """
+        table = cls()
+        if fields is not None:
+            for node_name, section, key in fields:
+                node_data = json_data[node_name]
+                term = node_data["display_name"] if section == "display_name" else node_data[section][key]["name"]
+                table.add(term, (node_name, section, key))
+            return table
+
+        for node_name, node_data in json_data.items():
+            # 提取 display_name
+            if "display_name" in node_data:
+                table.add(node_data["display_name"], (node_name, "display_name", None))
+
+            # 提取 inputs 和 outputs
+            for section in ("inputs", "outputs"):
+                for key, value in node_data.get(section, {}).items():
+                    if "name" in value:
+                        table.add(value["name"], (node_name, section, key))
+        return table
+
+    def add(self, term: str, location: Location) -> None:
+        """记录一个词条出现的位置
+
+        Args:
+            term: 词条
+            location: 出现位置
+        """
+        locations = self.occurrences.get(term)
+        if locations is None:
+            self.terms.append(term)
+            self.occurrences[term] = [location]
+        else:
+            locations.append(location)
+
+    @property
+    def total_occurrences(self) -> int:
+        """去重前的词条总数"""
+        return sum(len(locations) for locations in self.occurrences.values())
+
+    def to_lines(self, terms: Optional[List[str]] = None) -> List[str]:
+        """生成发送给翻译接口的 "X -> X" 行
+
+        Args:
+            terms: 只生成这些词条的行，为None时使用全部词条
+
+        Returns:
+            List[str]: 词条行列表
+        """
+        return [f"{term} -> {term}" for term in (self.terms if terms is None else terms)]
+
+    def apply(self, json_data: dict, translation_map: Dict[str, str]) -> int:
+        """把翻译结果写回所有出现位置
+
+        Args:
+            json_data: 构建词条表时使用的 nodeDefs 数据，会被原地修改
+            translation_map: 原文到译文的映射
+
+        Returns:
+            int: 写回的位置数量
+        """
+        applied = 0
+        for term, locations in self.occurrences.items():
+            translated = translation_map.get(term)
+            if translated is None:
+                continue
+            for node_name, section, key in locations:
+                if section == "display_name":
+                    json_data[node_name]["display_name"] = translated
+                else:
+                    json_data[node_name][section][key]["name"] = translated
+                applied += 1
+        return applied
+
+    def __len__(self) -> int:
+        return len(self.terms)
@@ -0,0 +1,314 @@
+"""
+token 预算模块
+在请求之前估算输入和输出的 token 数，把词条打包成不超过模型上下文和输出上限的请求
+"""
+
+import re
+import math
+import logging
+import importlib
+from functools import lru_cache
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+# 分词器：文本到 token 数的函数
+Tokenizer = Callable[[str], int]
+
+# 默认的模型上下文长度和单个请求的最大输出 token 数
+DEFAULT_CONTEXT_WINDOW = 32768
+DEFAULT_MAX_OUTPUT_TOKENS = 12000
+# 每条消息的格式开销（角色标记、分隔符）
+MESSAGE_OVERHEAD = 8
+# 每行 "原文 -> 译文" 中箭头、空格和换行的 token 数
+LINE_OVERHEAD = 3
+# 预计输出只使用最大输出的这一比例，为估算误差和模型多输出的内容留出余量
+OUTPUT_SAFETY = 0.85
+
+# 译文与原文 token 数之比（按启发式分词器估算）：英文单词通常是 1 个 token，
+# 译成中日韩文字后按字计数，西里尔字母的单词更长
+OUTPUT_RATIOS = {
+    "zh": 2.0,
+    "ja": 2.5,
+    "ko": 2.0,
+    "ru": 3.0,
+    "fr": 1.5,
+    "en": 1.0,
+}
+DEFAULT_OUTPUT_RATIO = 2.5
+
+# 启发式分词：ASCII 单词、数字、其他字母文字（拉丁扩展、希腊、西里尔）的连续片段、空白，其余字符单独成片
+_PIECE_RE = re.compile(r"[A-Za-z]+|[0-9]+|[À-ɏͰ-ϿЀ-ӿ]+|\s+|.", re.S)
+
+
+@lru_cache(maxsize=65536)
+def estimate_tokens(text: str) -> int:
+    """启发式估算文本的 token 数
+
+    不依赖具体模型的词表：ASCII 单词约 6 个字母一个 token，数字约 3 位一个 token，
+    西里尔等字母文字约 3 个字母一个 token，中日韩文字、标点和其他符号每个字符一个
+    token，空白不单独计数。中文按字计数会略微高估，宁可多拆一个批次也不截断输出。
+
+    Args:
+        text: 文本
+
+    Returns:
+        int: 估算的 token 数，非空文本至少为 1
+    """
+    tokens = 0
+    for piece in _PIECE_RE.findall(text):
+        first = piece[0]
+        if first.isspace():
+            continue
+        if first.isascii() and first.isalpha():
+            tokens += 1 + (len(piece) - 1) // 6
+        elif first.isascii() and first.isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        elif len(piece) > 1:
+            tokens += math.ceil(len(piece) / 3)
+        else:
+            tokens += 1
+    return max(1, tokens) if text else 0
+
+
+def estimate_bytes(text: str) -> int:
+    """按 UTF-8 字节数估算 token 数（约 3 字节一个 token），与语言无关的保守估算"""
+    return max(1, len(text.encode('utf-8')) // 3) if text else 0
+
+
+# 内置的分词器
+TOKENIZERS: Dict[str, Tokenizer] = {
+    "heuristic": estimate_tokens,
+    "bytes": estimate_bytes,
+}
+
+
+def register_tokenizer(name: str, tokenizer: Tokenizer) -> None:
+    """注册分词器，之后可以在配置中按名称选择
+
+    Args:
+        name: 分词器名称
+        tokenizer: 文本到 token 数的函数
+    """
+    TOKENIZERS[name] = tokenizer
+
+
+def get_tokenizer(name: Optional[str] = None) -> Tokenizer:
+    """按名称获取分词器
+
+    除了已注册的名称，还可以是 "模块:函数" 形式的路径，用于接入本地的精确分词器。
+    找不到时记录警告并使用启发式分词器。
+
+    Args:
+        name: 分词器名称或 "模块:函数"，为None时使用启发式分词器
+
+    Returns:
+        Tokenizer: 分词器
+    """
+    if not name:
+        return estimate_tokens
+    if name in TOKENIZERS:
+        return TOKENIZERS[name]
+    if ":" in name:
+        module_name, _, attr = name.partition(":")
+        try:
+            tokenizer = getattr(importlib.import_module(module_name), attr)
+            if callable(tokenizer):
+                return tokenizer
+        except (ImportError, AttributeError) as e:
+            logging.warning(f"加载分词器失败: {name}: {str(e)}")
+    logging.warning(f"未知的分词器: {name}，使用启发式分词器")
+    return estimate_tokens
+
+
+@dataclass
+class ModelLimits:
+    """模型的上下文限制和价格"""
+    context_window: int = DEFAULT_CONTEXT_WINDOW  # 输入和输出的总 token 上限
+    max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS  # 单个请求的最大输出 token 数
+    input_price: float = 0.0  # 每百万输入 token 的价格（元），为0时不估算费用
+    output_price: float = 0.0  # 每百万输出 token 的价格（元）
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'ModelLimits':
+        """从配置中读取，缺少的键使用默认值
+
+        Args:
+            config: 配置字典，可包含 context_window、max_output_tokens、input_price、output_price
+
+        Returns:
+            ModelLimits: 模型限制
+        """
+        defaults = cls()
+        return cls(
+            context_window=int(config.get("context_window") or defaults.context_window),
+            max_output_tokens=int(config.get("max_output_tokens") or defaults.max_output_tokens),
+            input_price=float(config.get("input_price") or 0.0),
+            output_price=float(config.get("output_price") or 0.0)
+        )
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        """估算费用（元）"""
+        return (input_tokens * self.input_price + output_tokens * self.output_price) / 1_000_000
+
+
+@dataclass
+class PlannedBatch:
+    """一个计划中的请求"""
+    terms: List[str]  # 该请求的原文
+    lines: List[str]  # 发送的 "原文 -> 原文" 行
+    input_tokens: int  # 词条行的输入 token 数（不含提示词）
+    output_tokens: int  # 预计输出的 token 数
+    max_tokens: int = 0  # 请求的 max_tokens
+
+
+@dataclass
+class RequestPlan:
+    """一种语言的请求计划"""
+    lang: str
+    prompt_tokens: int  # 每个请求重复发送的提示词 token 数（含消息开销）
+    batches: List[PlannedBatch] = field(default_factory=list)
+    limits: ModelLimits = field(default_factory=ModelLimits)
+    skipped: List[str] = field(default_factory=list)  # 单独一个词条就超出上限、无法发送的原文
+
+    @property
+    def requests(self) -> int:
+        """请求数"""
+        return len(self.batches)
+
+    @property
+    def input_tokens(self) -> int:
+        """预计的输入 token 总数，每个请求都包含一份提示词"""
+        return sum(batch.input_tokens for batch in self.batches) + self.prompt_tokens * len(self.batches)
+
+    @property
+    def output_tokens(self) -> int:
+        """预计的输出 token 总数"""
+        return sum(batch.output_tokens for batch in self.batches)
+
+    @property
+    def cost(self) -> float:
+        """预计的费用（元），未配置价格时为0"""
+        return self.limits.cost(self.input_tokens, self.output_tokens)
+
+    def summary(self) -> str:
+        """计划的简要说明"""
+        text = (f"{self.lang} 预计 {self.requests} 个请求，输入约 {self.input_tokens} tokens"
+                f"（提示词每次 {self.prompt_tokens}），输出约 {self.output_tokens} tokens")
+        if self.cost:
+            text += f"，费用约 {self.cost:.4f} 元"
+        if self.skipped:
+            text += f"，{len(self.skipped)} 个词条过长无法发送"
+        return text
+
+
+class RequestPlanner:
+    """请求规划器
+
+    按分词器估算每个词条行的输入和译文的输出 token 数，把词条依次装入请求：
+    每个请求的预计输出不超过最大输出的 OUTPUT_SAFETY 倍，提示词、词条行和
+    max_tokens 之和不超过上下文长度。
+
+    没有指定 batch_tokens 时自动决定批次大小：提示词在每个请求中都要重复发送，
+    批次的词条行至少与提示词一样长才拆分，词条较多时拆成 target_batches 个请求
+    以利用并发。指定 batch_tokens 时它是每批词条行输入 token 数的上限。
+    """
+
+    def __init__(self, limits: Optional[ModelLimits] = None, tokenizer: Optional[Tokenizer] = None, batch_tokens: Optional[int] = None, target_batches: int = 1):
+        """初始化请求规划器
+
+        Args:
+            limits: 模型限制，为None时使用默认值
+            tokenizer: 分词器，为None时使用启发式分词器
+            batch_tokens: 每批词条行的输入 token 上限，为None时自动决定
+            target_batches: 自动决定批次大小时希望拆分的请求数，通常为并发数
+        """
+        self.limits = limits or ModelLimits()
+        self.tokenizer = tokenizer or estimate_tokens
+        self.batch_tokens = max(1, batch_tokens) if batch_tokens else None
+        self.target_batches = max(1, target_batches)
+
+    def output_ratio(self, lang: str) -> float:
+        """译文与原文的 token 数之比"""
+        return OUTPUT_RATIOS.get(lang, DEFAULT_OUTPUT_RATIO)
+
+    def plan(self, terms: List[str], system_prompt: str, lang: str) -> RequestPlan:
+        """把词条打包成请求
+
+        Args:
+            terms: 待翻译的原文列表
+            system_prompt: 系统提示词
+            lang: 目标语言代码
+
+        Returns:
+            RequestPlan: 请求计划，词条顺序与输入一致；单独一个词条的预计输出超过
+                最大输出，或加上提示词超过上下文长度时，该词条列入 skipped，不会发送
+        """
+        prompt_tokens = self.tokenizer(system_prompt or "") + MESSAGE_OVERHEAD * 2
+        plan = RequestPlan(lang, prompt_tokens, limits=self.limits)
+        if not terms:
+            return plan
+
+        # 硬性上限：预计输出留出余量，输入加上输出不超过上下文
+        output_cap = max(1, int(self.limits.max_output_tokens * OUTPUT_SAFETY))
+        context_cap = self.limits.context_window - prompt_tokens
+        if context_cap <= 0:
+            raise ValueError(f"提示词约 {prompt_tokens} tokens，超过了模型的上下文长度 {self.limits.context_window}")
+
+        ratio = self.output_ratio(lang)
+        fitting = []
+        lines = []
+        costs = []
+        for term in terms:
+            line = f"{term} -> {term}"
+            term_tokens = self.tokenizer(term)
+            input_tokens = self.tokenizer(line) + 1
+            output_tokens = term_tokens + math.ceil(term_tokens * ratio) + LINE_OVERHEAD
+            if output_tokens > output_cap or input_tokens + output_tokens > context_cap:
+                plan.skipped.append(term)
+                continue
+            fitting.append(term)
+            lines.append(line)
+            costs.append((input_tokens, output_tokens))
+        if plan.skipped:
+            logging.warning(f"{len(plan.skipped)} 个词条单独发送也会超出模型的上下文或输出上限，不会发送: {[term[:50] for term in plan.skipped[:5]]}")
+        terms = fitting
+        if not terms:
+            return plan
+
+        # 目标大小：按预计输出把词条平均分到各请求
+        total_input = sum(input_tokens for input_tokens, _ in costs)
+        total_output = sum(output_tokens for _, output_tokens in costs)
+        if self.batch_tokens:
+            input_target = self.batch_tokens
+            output_target = output_cap
+        else:
+            input_target = context_cap
+            splits = min(self.target_batches, max(1, total_input // prompt_tokens))
+            splits = max(splits, math.ceil(total_output / output_cap), math.ceil((total_input + total_output) / context_cap))
+            # 多留一行的余量，避免按行装入时在末尾多出一个很小的批次
+            output_target = min(output_cap, math.ceil(total_output / splits) + max(output_tokens for _, output_tokens in costs))
+
+        start = 0
+        batch_input = batch_output = 0
+        for index, (input_tokens, output_tokens) in enumerate(costs):
+            if index > start and (
+                batch_input + input_tokens > input_target
+                or batch_output + output_tokens > output_target
+                or batch_input + input_tokens + batch_output + output_tokens > context_cap
+            ):
+                plan.batches.append(self._batch(terms[start:index], lines[start:index], batch_input, batch_output, prompt_tokens))
+                start = index
+                batch_input = batch_output = 0
+            batch_input += input_tokens
+            batch_output += output_tokens
+        plan.batches.append(self._batch(terms[start:], lines[start:], batch_input, batch_output, prompt_tokens))
+        return plan
+
+    def _batch(self, terms: List[str], lines: List[str], input_tokens: int, output_tokens: int, prompt_tokens: int) -> PlannedBatch:
+        """生成一个请求，max_tokens 取最大输出和上下文剩余空间中较小的一个
+
+        装入批次时已保证提示词、词条行和预计输出之和不超过上下文，剩余空间
+        总是不小于预计输出。
+        """
+        available = self.limits.context_window - prompt_tokens - input_tokens
+        return PlannedBatch(terms, lines, input_tokens, output_tokens, min(self.limits.max_output_tokens, available))
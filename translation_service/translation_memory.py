@@ -0,0 +1,154 @@
+"""
+翻译记忆模块
+在本地 SQLite 数据库中保存已翻译的词条，跨插件、跨运行复用
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, List
+
+# 单条 SQL 中 IN 参数的最大数量，低于 SQLite 默认的 999 个变量限制
+_QUERY_CHUNK = 500
+
+
+class TranslationMemory:
+    """翻译记忆类
+
+    以 (原文, 目标语言, 提示词哈希, 模型 ID) 为键保存译文。提示词或模型变化时
+    旧的译文不会被命中。超过条目上限时按最近使用时间淘汰，超过保存天数的
+    条目在 evict 时删除。
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 200000, max_age_days: int = 180):
+        """初始化翻译记忆
+
+        Args:
+            db_path: SQLite 数据库路径
+            max_entries: 最多保留的条目数
+            max_age_days: 条目未被使用时的最长保存天数
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS translations (
+                source TEXT NOT NULL,
+                lang TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                target TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (source, lang, prompt_hash, model_id)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON translations (last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def hash_prompt(prompt: str) -> str:
+        """计算系统提示词的哈希"""
+        return hashlib.sha1((prompt or "").encode('utf-8')).hexdigest()[:16]
+
+    def lookup(self, sources: List[str], lang: str, prompt_hash: str, model_id: str) -> Dict[str, str]:
+        """批量查找已翻译的词条
+
+        Args:
+            sources: 原文列表
+            lang: 目标语言
+            prompt_hash: 系统提示词哈希
+            model_id: 模型 ID
+
+        Returns:
+            Dict[str, str]: 命中的原文到译文的映射
+        """
+        found = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(sources), _QUERY_CHUNK):
+                chunk = sources[start:start + _QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT source, target FROM translations "
+                    f"WHERE lang = ? AND prompt_hash = ? AND model_id = ? AND source IN ({placeholders})",
+                    [lang, prompt_hash, model_id, *chunk]
+                ).fetchall()
+                found.update(rows)
+
+            if found:
+                self._conn.executemany(
+                    "UPDATE translations SET last_used = ? "
+                    "WHERE source = ? AND lang = ? AND prompt_hash = ? AND model_id = ?",
+                    [(now, source, lang, prompt_hash, model_id) for source in found]
+                )
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(sources) - len(found)
+        return found
+
+    def store(self, translations: Dict[str, str], lang: str, prompt_hash: str, model_id: str) -> None:
+        """保存翻译结果
+
+        Args:
+            translations: 原文到译文的映射
+            lang: 目标语言
+            prompt_hash: 系统提示词哈希
+            model_id: 模型 ID
+        """
+        if not translations:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations "
+                "(source, lang, prompt_hash, model_id, target, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(source, lang, prompt_hash, model_id, target, now, now) for source, target in translations.items()]
+            )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        """删除过期条目，并按最近使用时间淘汰超出上限的条目
+
+        Returns:
+            int: 删除的条目数
+        """
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM translations WHERE last_used < ?", (cutoff,)).rowcount
+            count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                removed += self._conn.execute(
+                    "DELETE FROM translations WHERE rowid IN "
+                    "(SELECT rowid FROM translations ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,)
+                ).rowcount
+            self._conn.commit()
+
+        if removed:
+            logging.info(f"翻译记忆已淘汰 {removed} 个条目")
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """返回命中统计"""
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": total}
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
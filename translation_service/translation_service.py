@@ -3,208 +3,363 @@
 处理与火山引擎 API 的所有交互
 """
 
-import os
-import json
 import logging
-import sys
+import asyncio
+import random
+import threading
+from dataclasses import dataclass, field
 from typing import List, Callable, Optional, Tuple, Dict
+import httpx
 from prompts.system_prompts import SYSTEM_PROMPT
-from openai import OpenAI
+from translation_service.term_table import TermTable, Location
+from translation_service.translation_memory import TranslationMemory
+from translation_service.stream_parser import StreamLineParser
+from translation_service.aligner import align_translations, AlignmentResult
+from translation_service.token_budget import ModelLimits, PlannedBatch, RequestPlanner, Tokenizer
+from openai import AsyncOpenAI
+
+# 默认同时进行的请求数
+DEFAULT_MAX_CONCURRENCY = 4
+# 单个请求的读取超时（秒），流式响应较长时需要足够的时间
+HTTP_TIMEOUT = 600.0
+# 默认最大重试次数
+DEFAULT_MAX_RETRIES = 3
+# 重试退避的基础时长和上限（秒）
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+
+@dataclass
+class BatchResult:
+    """单个批次的请求结果"""
+    success: bool
+    lines: List[str] = field(default_factory=list)  # 已完成的响应行，请求中断时为已完成的部分
+    error: str = ""
+    retryable: bool = True  # 是否值得重试（限流、超时、服务端错误）
+    retry_after: Optional[float] = None  # 服务端要求的等待时间（秒）
 
 class TranslationService:
     """翻译服务类"""
     
-    def __init__(self, api_key: str, model_id: str):
-        """初始化翻译服务"""
+    def __init__(self, api_key: str, model_id: str, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, batch_tokens: Optional[int] = None, memory: Optional[TranslationMemory] = None, max_retries: int = DEFAULT_MAX_RETRIES, limits: Optional[ModelLimits] = None, tokenizer: Optional[Tokenizer] = None):
+        """初始化翻译服务
+        
+        Args:
+            api_key: API 密钥
+            model_id: 模型 ID
+            max_concurrency: 同时进行的翻译请求数
+            batch_tokens: 每批词条的输入 token 上限，为None时由请求规划器按提示词长度和并发数决定
+            memory: 翻译记忆，命中的词条不再请求接口
+            max_retries: 失败或遗漏的词条最多重试的轮数
+            limits: 模型的上下文长度、最大输出和价格，为None时使用默认值
+            tokenizer: 估算 token 数的分词器，为None时使用启发式分词器
+        """
         self.api_key = api_key.strip()  # 清理 API Key
         self.model_id = model_id
         self.base_url = "https://ark.cn-beijing.volces.com/api/v3"
-        self.is_stopped = False
-        self.temp_translation_file = "temp_translations.json"
         self.translation_map = {}
+        self.max_concurrency = max(1, max_concurrency)
+        self.planner = RequestPlanner(limits, tokenizer, batch_tokens, self.max_concurrency)
+        self.memory = memory
+        self.max_retries = max(0, max_retries)
+        self._semaphore = None  # 所有 translate 调用共享的并发限制
+        self._semaphore_loop = None
         
-        # 初始化 OpenAI 客户端
-        self.client = OpenAI(
-            base_url=self.base_url,
-            api_key=self.api_key
-        )
+        self._loop = None  # 服务专用的后台事件循环
+        self._loop_thread = None
         
-        # 配置日志
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s [%(levelname)s] %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
+        # 异步客户端使用长连接池，在服务的整个生命周期内复用
+        self.async_client = AsyncOpenAI(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            max_retries=0,  # 由 translate 的重试调度统一处理
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency * 2,
+                    max_keepalive_connections=self.max_concurrency
+                ),
+                timeout=httpx.Timeout(HTTP_TIMEOUT, connect=10.0)
+            )
         )
         
-        print("\n正在加载系统提示词...")
         # 检查系统提示词
         self.system_prompt = SYSTEM_PROMPT
         if not self.system_prompt:
-            print("\033[91m系统提示词加载失败！\033[0m")  # 红色文字
             logging.error("系统提示词加载失败")
-        else:
-            print("\033[92m系统提示词加载成功！\033[0m")  # 绿色文字
-            logging.info("系统提示词加载成功")
-        print()  # 添加空行
         
-        print("系统提示词:", json.dumps(self.system_prompt, ensure_ascii=False, indent=2))
+    def run(self, coro):
+        """在服务的后台事件循环中执行协程并等待结果
         
-    def save_temp_translations(self, data: dict) -> None:
-        """保存临时翻译结果
+        连接池与事件循环绑定，所有请求都在同一个循环中执行，
+        多次运行之间可以复用已建立的连接。
         
         Args:
-            data: 翻译结果数据
+            coro: 要执行的协程
+            
+        Returns:
+            协程的返回值
         """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, name="translation-loop", daemon=True)
+            self._loop_thread.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+        
+    def close(self) -> None:
+        """关闭连接池和后台事件循环"""
+        if self._loop is None:
+            return
         try:
-            with open(self.temp_translation_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            logging.info(f"临时翻译结果已保存到: {self.temp_translation_file}")
+            self.run(self.async_client.close())
         except Exception as e:
-            logging.error(f"保存临时翻译结果失败: {str(e)}")
-
-    def create_translation_map(self, json_data: dict) -> dict:
-        """从临时翻译文件创建映射字典"""
-        try:
-            with open(self.temp_translation_file, 'r', encoding='utf-8') as f:
-                temp_data = json.load(f)
-            
-            translation_map = {}
-            # 遍历所有节点
-            for node_data in temp_data.values():
-                # 处理 display_name
-                if "display_name" in node_data:
-                    display_name = node_data["display_name"]
-                    # 提取映射关系（这里需要根据实际情况调整提取逻辑）
-                    if "(" in display_name:
-                        base_name = display_name.split("(")[0].strip()
-                        translation_map[base_name.split(": ")[-1]] = base_name.split(": ")[-1]
-                
-                # 处理 inputs
-                if "inputs" in node_data:
-                    for input_data in node_data["inputs"].values():
-                        if "name" in input_data:
-                            translation_map[input_data["name"]] = input_data["name"]
-                
-                # 处理 outputs
-                if "outputs" in node_data:
-                    for output_data in node_data["outputs"].values():
-                        if "name" in output_data:
-                            translation_map[output_data["name"]] = output_data["name"]
-            
-            logging.info(f"已创建映射字典，包含 {len(translation_map)} 个映射关系")
-            return translation_map
-            
-        except Exception as e:
-            logging.error(f"创建映射字典失败: {str(e)}")
-            return {}
-
-    def extract_terms(self, json_data: dict) -> List[str]:
-        """提取需要翻译的词条"""
-        terms = []
+            logging.error(f"关闭翻译客户端失败: {str(e)}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout=5)
+        self._loop = None
+        self._loop_thread = None
         
-        for node_name, node_data in json_data.items():
-            # 提取 display_name
-            if "display_name" in node_data:
-                display_name = node_data['display_name']
-                terms.append(f"{display_name} -> {display_name}")
-            
-            # 提取 inputs
-            if "inputs" in node_data:
-                for input_key, input_value in node_data["inputs"].items():
-                    if "name" in input_value:
-                        name = input_value["name"]
-                        terms.append(f"{name} -> {name}")
-            
-            # 提取 outputs
-            if "outputs" in node_data:
-                for output_key, output_value in node_data["outputs"].items():
-                    if "name" in output_value:
-                        name = output_value["name"]
-                        terms.append(f"{name} -> {name}")
-        
-        return terms
+    def extract_terms(self, json_data: dict) -> List[str]:
+        """提取需要翻译的词条，重复的词条只保留一次"""
+        return TermTable.from_node_defs(json_data).to_lines()
 
     def parse_translation(self, original_text: str, translated_text: str) -> Dict[str, str]:
-        """解析翻译结果"""
-        translation_map = {}
-        
-        # 分割原文和译文
-        original_lines = original_text.strip().split('\n')
-        translated_lines = translated_text.strip().split('\n')
-        
-        # 创建映射
-        for orig, trans in zip(original_lines, translated_lines):
-            if '->' in orig and '->' in trans:
-                orig_key = orig.split('->')[0].strip()  # 使用箭头前的值作为key
-                trans_value = trans.split('->')[1].strip()
-                translation_map[orig_key] = trans_value
-        
-        return translation_map
+        """解析翻译结果，按原文键对齐译文"""
+        sources = []
+        for line in original_text.strip().split('\n'):
+            if '->' not in line:
+                continue
+            # 原文行为 "X -> X"，原文本身可能包含箭头，取前一半作为key
+            half = (len(line) - 4) // 2
+            if line[half:half + 4] == " -> " and line[:half] == line[half + 4:]:
+                sources.append(line[:half].strip())
+            else:
+                sources.append(line.split('->')[0].strip())
+        return align_translations(sources, translated_text.strip().split('\n')).translations
 
-    def apply_translations(self, json_data: dict, translation_map: Dict[str, str]) -> dict:
-        """应用翻译结果"""
-        result = json_data.copy()
+    def apply_translations(self, json_data: dict, translation_map: Dict[str, str], term_table: Optional[TermTable] = None) -> dict:
+        """应用翻译结果
         
-        for node_name, node_data in result.items():
-            # 翻译 display_name
-            if "display_name" in node_data:
-                orig = node_data["display_name"]
-                node_data["display_name"] = translation_map.get(orig, orig)
-            
-            # 翻译 inputs
-            if "inputs" in node_data:
-                for input_data in node_data["inputs"].values():
-                    if "name" in input_data:
-                        orig = input_data["name"]
-                        input_data["name"] = translation_map.get(orig, orig)
+        Args:
+            json_data: 要翻译的JSON数据
+            translation_map: 原文到译文的映射
+            term_table: 由 json_data 构建的词条表，为None时重新构建
             
-            # 翻译 outputs
-            if "outputs" in node_data:
-                for output_data in node_data["outputs"].values():
-                    if "name" in output_data:
-                        orig = output_data["name"]
-                        output_data["name"] = translation_map.get(orig, orig)
+        Returns:
+            dict: 翻译后的数据
+        """
+        result = json_data.copy()
+        if term_table is None:
+            term_table = TermTable.from_node_defs(result)
         
+        # 按词条出现位置写回译文
+        term_table.apply(result, translation_map)
         return result
 
-    async def translate(self, json_data: dict, system_prompt: str = None) -> Tuple[bool, dict]:
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """获取当前事件循环上共享的并发信号量
+        
+        同一个服务并发翻译多个文件夹和语言时，所有请求共享 max_concurrency 上限。
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def translate(self, json_data: dict, system_prompt: str = None, lang: str = "zh", progress_callback: Optional[Callable[[int, int], None]] = None, resumed: Optional[Dict[str, str]] = None, checkpoint: Optional[Callable[[Dict[str, str]], None]] = None, fields: Optional[List[Location]] = None, term_table: Optional[TermTable] = None, stop_event: Optional[threading.Event] = None) -> Tuple[bool, dict]:
         """翻译完整的JSON数据
         
+        先使用恢复的译文并查询翻译记忆，只有剩余的词条才会请求接口。待请求的词条
+        按 token 预算拆分为多个批次，以 max_concurrency 为上限并发请求，各批次的
+        结果合并为一个翻译映射。
+        
         Args:
             json_data: 要翻译的JSON数据
             system_prompt: 系统提示词，如果为None则使用默认提示词
+            lang: 目标语言代码，用作翻译记忆的键
+            progress_callback: 进度回调，每完成一个词条调用一次，参数为 (已完成数, 总数)
+            resumed: 从任务日志恢复的原文到译文的映射，这些词条不再请求
+            checkpoint: 每个批次完成时调用，参数为该批次的译文映射，用于写入任务日志
+            fields: 只翻译这些位置的字段（增量翻译），为None时翻译全部字段
+            term_table: 预先构建的词条表，结构相同的多个文档（如全球化模式下的各语言）
+                可以共用；为None时从 json_data 和 fields 构建
+            stop_event: 调用方的终止标志，设置后不再发送新的请求；服务被多次运行共用，
+                终止只影响传入该标志的运行
             
         Returns:
             Tuple[bool, dict]: (是否成功, 翻译结果)
         """
         try:
-            # 提取需要翻译的词条
-            terms = self.extract_terms(json_data)
-            if not terms:
+            # 提取需要翻译的词条，重复的词条只发送一次
+            if term_table is None:
+                term_table = TermTable.from_node_defs(json_data, fields)
+            if not term_table.terms:
                 return False, {"error": "没有找到需要翻译的内容"}
             
-            logging.info(f"共提取到 {len(terms)} 个待翻译词条")
+            logging.info(f"共提取到 {len(term_table)} 个待翻译词条（去重前 {term_table.total_occurrences} 个）")
+            
+            # 使用恢复的译文，再查询翻译记忆
+            translation_map = {term: resumed[term] for term in term_table.terms if term in resumed} if resumed else {}
+            pending_terms = [term for term in term_table.terms if term not in translation_map]
+            if translation_map:
+                logging.info(f"从任务日志恢复 {len(translation_map)} 个词条")
+            current_prompt = system_prompt if system_prompt else self.system_prompt
+            prompt_hash = TranslationMemory.hash_prompt(current_prompt)
+            if self.memory is not None and pending_terms:
+                found = self.memory.lookup(pending_terms, lang, prompt_hash, self.model_id)
+                translation_map.update(found)
+                pending_terms = [term for term in pending_terms if term not in found]
+                logging.info(f"翻译记忆命中 {len(found)} 个词条，需请求 {len(pending_terms)} 个词条")
+            
+            # 单独发送也会超出模型上限的词条保留原文，不再请求和重试
+            oversized = self.planner.plan(pending_terms, current_prompt, lang).skipped
+            if oversized:
+                skipped = set(oversized)
+                pending_terms = [term for term in pending_terms if term not in skipped]
+            
+            total = len(pending_terms)
+            done = 0
             
-            # 直接翻译所有词条
-            success, result = await self.translate_batch(terms, system_prompt)
-            if success:
-                # 解析翻译结果
-                translation_map = self.parse_translation('\n'.join(terms), result)
+            def on_line(line: str):
+                nonlocal done
+                if '->' not in line:
+                    return
+                done += 1
+                if progress_callback is not None:
+                    progress_callback(min(done, total), total)
+            
+            # 每轮只发送仍没有译文的词条：请求失败的批次按指数退避加随机抖动重试，
+            # 模型遗漏的词条立即补发
+            remaining = pending_terms
+            failures: List[BatchResult] = []
+            for attempt in range(self.max_retries + 1):
+                if not remaining or self._is_set(stop_event):
+                    break
+                if attempt > 0:
+                    if failures:
+                        delay = self._backoff_delay(attempt, failures)
+                        logging.warning(f"第 {attempt} 次重试 {len(remaining)} 个词条，{delay:.1f} 秒后开始")
+                        await asyncio.sleep(delay)
+                    else:
+                        logging.warning(f"模型遗漏了 {len(remaining)} 个词条，仅补发这些词条: {remaining[:20]}")
                 
-                # 应用翻译结果
-                translated_data = self.apply_translations(json_data, translation_map)
-                logging.info("翻译成功完成")
-                return True, translated_data
-            else:
-                error_msg = f"翻译失败: {result}"
+                result, failures = await self._translate_terms(remaining, current_prompt, lang, prompt_hash, on_line, checkpoint, stop_event)
+                translation_map.update(result.translations)
+                remaining = result.missing
+                if any(not failure.retryable for failure in failures):
+                    break
+            
+            if failures:
+                error_msg = f"翻译失败: {len(failures)} 个批次出错，{len(remaining)} 个词条未翻译: {failures[0].error}"
                 logging.error(error_msg)
                 return False, {"error": error_msg}
+            if self._is_set(stop_event) and remaining:
+                error_msg = f"翻译已终止: {len(remaining)} 个词条未翻译"
+                logging.warning(error_msg)
+                return False, {"error": error_msg}
+            if remaining:
+                logging.warning(f"仍有 {len(remaining)} 个词条没有译文，保留原文: {remaining[:20]}")
+            
+            # 应用翻译结果
+            translated_data = self.apply_translations(json_data, translation_map, term_table)
+            logging.info("翻译成功完成")
+            return True, translated_data
             
         except Exception as e:
             error_msg = f"翻译过程发生错误: {str(e)}"
             logging.error(error_msg)
             return False, {"error": error_msg}
 
+    @staticmethod
+    def _is_set(stop_event: Optional[threading.Event]) -> bool:
+        """终止标志是否已设置"""
+        return stop_event is not None and stop_event.is_set()
+
+    @staticmethod
+    def _backoff_delay(attempt: int, failures: List[BatchResult]) -> float:
+        """计算重试前的等待时间
+        
+        指数退避加全随机抖动，服务端通过 Retry-After 要求更长等待时以服务端为准。
+        
+        Args:
+            attempt: 第几次重试（从 1 开始）
+            failures: 上一轮失败的批次
+            
+        Returns:
+            float: 等待秒数
+        """
+        delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+        retry_after = max((failure.retry_after or 0 for failure in failures), default=0)
+        return max(delay, retry_after)
+
+    @staticmethod
+    def _parse_retry_after(error: Exception) -> Optional[float]:
+        """从限流响应头中读取需要等待的秒数"""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000
+            if headers.get("retry-after"):
+                return float(headers["retry-after"])
+        except (TypeError, ValueError):
+            pass
+        return None
+
+    async def _translate_terms(self, terms: List[str], system_prompt: str, lang: str, prompt_hash: str, on_line: Callable[[str], None], checkpoint: Optional[Callable[[Dict[str, str]], None]] = None, stop_event: Optional[threading.Event] = None) -> Tuple[AlignmentResult, List[BatchResult]]:
+        """按批次并发翻译词条，并按原文键对齐结果
+        
+        每个批次完成时立即对齐，并写入翻译记忆和任务日志；中断批次中已完成的行
+        同样会被保存。
+        
+        Args:
+            terms: 待翻译的原文列表
+            system_prompt: 系统提示词
+            lang: 目标语言代码
+            prompt_hash: 系统提示词哈希
+            on_line: 每完成一行时的回调
+            checkpoint: 每个批次完成时的回调，参数为该批次的译文映射
+            stop_event: 终止标志，设置后尚未开始的批次不再请求
+            
+        Returns:
+            Tuple[AlignmentResult, List[BatchResult]]: (合并后的对齐结果, 出错的批次)
+        """
+        # 按模型的上下文和输出上限把词条打包成请求
+        plan = self.planner.plan(terms, system_prompt, lang)
+        logging.info(f"{plan.summary()}，最多 {self.max_concurrency} 个并发请求")
+        
+        semaphore = self._get_semaphore()
+        
+        async def run_batch(batch: PlannedBatch) -> Tuple[AlignmentResult, BatchResult]:
+            async with semaphore:
+                if self._is_set(stop_event):
+                    batch_result = BatchResult(False, error="翻译已终止", retryable=False)
+                else:
+                    batch_result = await self.stream_batch(batch.lines, system_prompt, on_line, batch.max_tokens)
+            aligned = align_translations(batch.terms, batch_result.lines)
+            if self.memory is not None:
+                self.memory.store(aligned.translations, lang, prompt_hash, self.model_id)
+            if checkpoint is not None and aligned.translations:
+                checkpoint(aligned.translations)
+            return aligned, batch_result
+        
+        results = await asyncio.gather(*(run_batch(batch) for batch in plan.batches))
+        
+        merged = AlignmentResult()
+        failures = []
+        for aligned, batch_result in results:
+            merged.translations.update(aligned.translations)
+            merged.unmatched_lines.extend(aligned.unmatched_lines)
+            if not batch_result.success:
+                failures.append(batch_result)
+        
+        merged.missing = [term for term in terms if term not in merged.translations]
+        if merged.unmatched_lines:
+            logging.debug(f"无法对应的响应行: {merged.unmatched_lines[:20]}")
+        return merged, failures
+
     async def translate_batch(self, terms: List[str], system_prompt: str = None) -> Tuple[bool, str]:
         """翻译一批词条
         
@@ -215,182 +370,60 @@ async def translate_batch(self, terms: List[str], system_prompt: str = None) ->
         Returns:
             Tuple[bool, str]: (是否成功, 翻译结果)
         """
+        result = await self.stream_batch(terms, system_prompt)
+        if result.success:
+            return True, "\n".join(result.lines)
+        return False, result.error
+
+    async def stream_batch(self, terms: List[str], system_prompt: str = None, on_line: Optional[Callable[[str], None]] = None, max_tokens: Optional[int] = None) -> BatchResult:
+        """流式翻译一批词条，每收到完整的一行就立即解析
+        
+        Args:
+            terms: 待翻译的词条列表
+            system_prompt: 系统提示词，如果为None则使用默认提示词
+            on_line: 每完成一行时的回调
+            max_tokens: 最大输出 token 数，为None时使用模型的最大输出
+            
+        Returns:
+            BatchResult: 批次结果，请求中断时已完成的行仍会返回
+        """
+        parser = StreamLineParser()
+        
+        def emit(lines: List[str]):
+            if on_line is not None:
+                for line in lines:
+                    on_line(line)
+        
         try:
             # 确定使用的系统提示词
             current_prompt = system_prompt if system_prompt else self.system_prompt
             
-            # 打印当前使用的系统提示词
-            print("\n当前使用的系统提示词:")
-            print("-" * 50)
-            print(current_prompt)
-            print("-" * 50)
-            
             # 创建流式请求
-            stream = self.client.chat.completions.create(
+            stream = await self.async_client.chat.completions.create(
                 model=self.model_id,
                 messages=[
                     {"role": "system", "content": current_prompt},
                     {"role": "user", "content": "\n".join(terms)}
                 ],
                 temperature=0.8,
-                max_tokens=12000,
+                max_tokens=max_tokens or self.planner.limits.max_output_tokens,
                 stream=True
             )
             
-            # 收集响应
-            full_response = ""
-            print("\n开始接收翻译响应...\n")
-            
-            for chunk in stream:
+            # 逐行解析响应
+            async for chunk in stream:
                 if chunk.choices and chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
-                    full_response += content
-                    print(content, end="", flush=True)
+                    emit(parser.feed(chunk.choices[0].delta.content))
+            emit(parser.close())
             
-            print("\n\n翻译响应接收完成\n")
+            logging.info(f"批次翻译响应接收完成，共 {len(terms)} 个词条")
             
-            return True, full_response.strip()
+            return BatchResult(True, parser.lines)
             
         except Exception as e:
             error_msg = f"翻译请求失败: {str(e)}"
-            logging.error(error_msg)
-            return False, error_msg
-
-    def extract_translatable_parts(self, original_data: dict) -> str:
-        """提取需要翻译的部分并保存到临时文件"""
-        translatable_parts = []
-        
-        for node_name, node_data in original_data.items():
-            # 提取 display_name
-            if "display_name" in node_data:
-                translatable_parts.append(node_data["display_name"])
-                
-            # 提取 inputs
-            if "inputs" in node_data:
-                for input_key, input_value in node_data["inputs"].items():
-                    if "name" in input_value:
-                        translatable_parts.append(input_value["name"])
-
-            # 提取 outputs
-            if "outputs" in node_data:
-                for output_key, output_value in node_data["outputs"].items():
-                    if "name" in output_value:
-                        translatable_parts.append(output_value["name"])
-
-        # 去重
-        translatable_parts = list(set(translatable_parts))
-        
-        # 保存到临时文件
-        temp_file_path = "temp_translatable_parts.txt"
-        with open(temp_file_path, 'w', encoding='utf-8') as f:
-            for term in translatable_parts:
-                f.write(f"· {term}\n")
-            
-        logging.info(f"提取的可翻译部分已保存到: {temp_file_path}")
-        logging.info(f"提取的可翻译部分: \n" + "\n".join([f"·{term}" for term in translatable_parts]))
-        return temp_file_path 
-
-    def extract_translatable_content(self, nodeDefs_path: str) -> None:
-        """从 nodeDefs.json 中提取需要翻译的内容并保存为 daifanyi.json
-        
-        Args:
-            nodeDefs_path: nodeDefs.json 的路径
-        """
-        try:
-            with open(nodeDefs_path, 'r', encoding='utf-8') as f:
-                node_data = json.load(f)
-            
-            terms = set()  # 使用集合去重
-            for node_name, node_info in node_data.items():
-                # 提取 display_name
-                if "display_name" in node_info:
-                    display_name = node_info['display_name']
-                    terms.add(f"{display_name} -> {display_name}")
-                
-                # 提取 inputs 中的 name
-                if "inputs" in node_info:
-                    for input_value in node_info['inputs'].values():
-                        if "name" in input_value:
-                            name = input_value['name']
-                            terms.add(f"{name} -> {name}")
-                
-                # 提取 outputs 中的 name
-                if "outputs" in node_info:
-                    for output_value in node_info['outputs'].values():
-                        if "name" in output_value:
-                            name = output_value['name']
-                            terms.add(f"{name} -> {name}")
-            
-            # 转换为列表并排序，确保输出顺序一致
-            terms_list = sorted(list(terms))
-            
-            # 保存为 daifanyi.json
-            with open("daifanyi.json", 'w', encoding='utf-8') as f:
-                json.dump(terms_list, f, ensure_ascii=False, indent=2)
-            
-            logging.info(f"已提取 {len(terms_list)} 个待翻译词条并保存为 daifanyi.json")
-            
-        except Exception as e:
-            logging.error(f"提取内容时出错: {str(e)}")
-            raise
-
-    def apply_translations_to_nodeDefs(self, nodeDefs_path: str) -> None:
-        """将翻译结果应用到 nodeDefs.json
-        
-        Args:
-            nodeDefs_path: nodeDefs.json 的路径
-        """
-        try:
-            # 读取原始 nodeDefs.json
-            with open(nodeDefs_path, 'r', encoding='utf-8') as f:
-                node_data = json.load(f)
-            
-            # 读取翻译结果
-            with open("yifanyi.json", 'r', encoding='utf-8') as f:
-                translations = json.load(f)
-            
-            # 创建映射字典
-            translation_map = {}
-            for line in translations:
-                if "->" in line:
-                    original, translated = line.split("->")
-                    translation_map[original.strip()] = translated.strip()
-            
-            # 应用翻译
-            for node_name, node_info in node_data.items():
-                # 更新 display_name
-                if "display_name" in node_info:
-                    orig = node_info["display_name"]
-                    if orig in translation_map:
-                        node_info["display_name"] = translation_map[orig]
-                
-                # 更新 inputs
-                if "inputs" in node_info:
-                    for input_value in node_info["inputs"].values():
-                        if "name" in input_value:
-                            orig = input_value["name"]
-                            if orig in translation_map:
-                                input_value["name"] = translation_map[orig]
-                
-                # 更新 outputs
-                if "outputs" in node_info:
-                    for output_value in node_info["outputs"].values():
-                        if "name" in output_value:
-                            orig = output_value["name"]
-                            if orig in translation_map:
-                                output_value["name"] = translation_map[orig]
-            
-            # 保存更新后的 nodeDefs.json
-            with open(nodeDefs_path, 'w', encoding='utf-8') as f:
-                json.dump(node_data, f, ensure_ascii=False, indent=2)
-            
-            logging.info("已将翻译结果应用到 nodeDefs.json")
-            
-        except Exception as e:
-            logging.error(f"应用翻译结果时出错: {str(e)}")
-            raise
-
-if __name__ == '__main__':
-    # 直接调用提取翻译内容的功能
-    service = TranslationService(api_key='your_api_key', model_id='your_model_id')  # 替换为实际的 API Key 和模型 ID
-    service.extract_translatable_content('nodeDefs.json')
\ No newline at end of file
+            logging.error(f"{error_msg}（已完成 {len(parser.lines)} 行）")
+            # 400/401/403/404 等客户端错误重试也不会成功
+            status_code = getattr(e, "status_code", None)
+            retryable = status_code is None or status_code in (408, 409, 429) or status_code >= 500
+            return BatchResult(False, parser.lines, error_msg, retryable, self._parse_retry_after(e))